@@ -0,0 +1,178 @@
+"""Admission control in front of the shared recognizer.
+
+Every recognition request passes ``AdmissionController.admit(user)``:
+
+* a token bucket per user (``rate`` requests per second, bursts of up to
+  ``burst``) turns away a user who clicks faster than that, without
+  touching the shared queue. Other kinds of traffic get their own per-user
+  bucket from ``budgets`` (name -> (rate, burst)), e.g. live camera frames,
+  and ``admit(user, budget="live")`` draws from it;
+* at most ``max_concurrent`` admitted requests run at once, process-wide;
+* the rest wait in a bounded FIFO queue. A request is shed instead when the
+  queue is full, when the expected wait (from the recent service time) is
+  already past ``max_wait``, or when it has waited ``max_wait`` seconds.
+  ``wait=False`` sheds at once instead of queueing, for work such as a
+  video frame that is worthless by the time a slot frees up.
+
+Turned-away requests raise ``RateLimited`` or ``Overloaded``, both carrying
+``retry_after`` in seconds for a "busy, retry in N s" message. A shed
+request gets its token back, so overload does not count against the user.
+``stats()`` has the accepted/queued/shed/rate-limited counters for the
+metrics endpoint.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+
+class Rejected(RuntimeError):
+    """A request that was not admitted; ``retry_after`` is in seconds"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimited(Rejected):
+    """The user is over their request rate"""
+
+
+class Overloaded(Rejected):
+    """The request was shed because the recognizer is saturated"""
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now):
+        """Take a token; returns 0.0, or the seconds until one is available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1.0)
+
+
+class AdmissionController:
+    """Per-user rate limits, a global concurrency cap and a deadline-bounded wait queue"""
+
+    def __init__(self, rate=0.5, burst=5, max_concurrent=8, max_queue=32, max_wait=5.0, max_users=10000,
+                 budgets=None, clock=time.monotonic):
+        if max_concurrent < 1 or rate <= 0 or any(budget_rate <= 0 for budget_rate, _ in (budgets or {}).values()):
+            raise ValueError("max_concurrent and rates must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.budgets = {None: (rate, burst), **(budgets or {})}
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.max_users = max_users
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # (user, budget) -> TokenBucket
+        self._waiters = deque()        # Events of queued requests, oldest first
+        self._running = 0
+        self._service_time = 0.0       # moving average of admitted requests, seconds
+        self.accepted = 0
+        self.queued = 0
+        self.shed = 0
+        self.rate_limited = 0
+        self.completed = 0
+
+    @contextmanager
+    def admit(self, user, budget=None, wait=True):
+        """Hold a slot for the body of the ``with``, or raise ``Rejected``"""
+        self.acquire(user, budget, wait)
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.release(self._clock() - start)
+
+    def acquire(self, user, budget=None, wait=True):
+        with self._lock:
+            bucket = self._bucket(user, budget)
+            delay = bucket.take(self._clock())
+            if delay:
+                self.rate_limited += 1
+                raise RateLimited(f"{user} is over {bucket.rate:g} requests/s", delay)
+            if self._running < self.max_concurrent and not self._waiters:
+                self._running += 1
+                self.accepted += 1
+                return
+            expected = self._expected_wait(len(self._waiters) + 1)
+            if not wait:
+                self.shed += 1
+                bucket.refund()
+                raise Overloaded("recognizer is saturated", max(expected, self._service_time))
+            if len(self._waiters) >= self.max_queue or expected > self.max_wait:
+                self.shed += 1
+                bucket.refund()
+                raise Overloaded("recognition queue is full", max(1.0, expected))
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+            self.queued += 1
+
+        waiter.wait(self.max_wait)
+        with self._lock:
+            # A slot handed over right at the deadline still counts
+            if waiter.is_set():
+                self.accepted += 1
+                return
+            self._waiters.remove(waiter)
+            self.shed += 1
+            bucket = self._buckets.get((user, budget))
+            if bucket is not None:
+                bucket.refund()
+            raise Overloaded("waited too long for the recognizer", max(1.0, self._expected_wait(len(self._waiters))))
+
+    def release(self, elapsed):
+        with self._lock:
+            self.completed += 1
+            self._service_time = elapsed if not self._service_time else 0.8 * self._service_time + 0.2 * elapsed
+            if self._waiters:
+                # The slot passes straight to the oldest waiter
+                self._waiters.popleft().set()
+            else:
+                self._running -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "accepted": self.accepted,
+                "queued": self.queued,
+                "shed": self.shed,
+                "rate_limited": self.rate_limited,
+                "completed": self.completed,
+                "running": self._running,
+                "waiting": len(self._waiters),
+                "service_ms": round(self._service_time * 1000, 3),
+                "users": len({user for user, _ in self._buckets}),
+            }
+
+    def _bucket(self, user, budget):
+        key = (user, budget)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate, burst = self.budgets[budget]
+            bucket = self._buckets[key] = TokenBucket(rate, burst, self._clock())
+            while len(self._buckets) > self.max_users:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def _expected_wait(self, position):
+        return position * self._service_time / self.max_concurrent
@@ -0,0 +1,210 @@
+"""Learning-event log with incrementally maintained rollups.
+
+Every event (lesson viewed, sign completed, translation run, session
+start/end) is appended to the ``events`` table and folded, as it arrives,
+into two rollups:
+
+* ``daily_stats``: per user and day, counts per kind plus study seconds,
+* ``user_stats``: per user, totals and the current/best streak of
+  consecutive active days, updated from the day of each event.
+
+Pages read the precomputed ``user_stats`` values (cached in memory per
+user, and read again after ``max_age`` seconds so events recorded by other
+app processes show up) and never scan raw events. The rollups are updated
+with atomic increments in SQL, never by writing back a cached copy. Study time is the gap between
+consecutive events of a browser session, capped at ``idle_gap`` so a tab
+left open does not count.
+
+``backfill`` rebuilds both rollups from the raw log with vectorized pandas
+operations (pandas is imported only then, not by the app), for a new
+rollup column or after events were imported:
+
+    python analytics.py backfill --db signaura.db
+"""
+
+import argparse
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from storage import SQL_ALL_EVENTS
+
+LESSON_VIEWED = "lesson_viewed"
+SIGN_COMPLETED = "sign_completed"
+TRANSLATION = "translation"
+SESSION_START = "session_start"
+SESSION_END = "session_end"
+
+# Event kind -> daily_stats counter
+COUNTERS = {
+    LESSON_VIEWED: "lessons_viewed",
+    SIGN_COMPLETED: "signs_completed",
+    TRANSLATION: "translations",
+    SESSION_START: "sessions",
+}
+
+IDLE_GAP = 300.0
+
+
+def empty_stats():
+    return {"last_day": None, "current_streak": 0, "best_streak": 0, "sessions": 0, "study_seconds": 0.0}
+
+
+def format_duration(seconds):
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    return f"{minutes // 60}h {minutes % 60}m"
+
+
+class EventLog:
+    """Appends events and keeps each user's rollups up to date"""
+
+    def __init__(self, store, idle_gap=IDLE_GAP, max_users=1000, max_sessions=10000, max_age=None):
+        self.store = store
+        self.idle_gap = idle_gap
+        self.max_users = max_users
+        self.max_sessions = max_sessions
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._stats = OrderedDict()      # username -> (loaded at, user_stats dict)
+        self._last_seen = OrderedDict()  # session -> time of its last event
+
+    def record(self, username, session, kind, category=None, sign=None, at=None):
+        at = time.time() if at is None else at
+        day = date.fromtimestamp(at).toordinal()
+        stats = self._user(username)
+        with self._lock:
+            last = self._last_seen.pop(session, None)
+            study = min(at - last, self.idle_gap) if last is not None and kind != SESSION_START else 0.0
+            if kind != SESSION_END:
+                self._last_seen[session] = at
+                while len(self._last_seen) > self.max_sessions:
+                    self._last_seen.popitem(last=False)
+
+            if stats["last_day"] is None or day > stats["last_day"] + 1:
+                stats["current_streak"] = 1
+            elif day == stats["last_day"] + 1:
+                stats["current_streak"] += 1
+            stats["last_day"] = max(day, stats["last_day"] or day)
+            stats["best_streak"] = max(stats["best_streak"], stats["current_streak"])
+            if kind == SESSION_START:
+                stats["sessions"] += 1
+            stats["study_seconds"] += study
+
+        counters = {name: int(COUNTERS.get(kind) == name) for name in COUNTERS.values()}
+        self.store.append_event(username, session, kind, category, sign, at, day)
+        self.store.add_daily_stats(username, day, study_seconds=study, **counters)
+        self.store.add_user_stats(username, day, sessions=int(kind == SESSION_START), study_seconds=study)
+
+    def stats(self, username, today=None):
+        """Precomputed totals and streaks; the current streak is 0 once a day was missed"""
+        stats = dict(self._user(username))
+        today = date.today().toordinal() if today is None else today
+        if stats["last_day"] is None or stats["last_day"] < today - 1:
+            stats["current_streak"] = 0
+        return stats
+
+    def forget(self, username):
+        with self._lock:
+            self._stats.pop(username, None)
+
+    def _user(self, username):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._stats.get(username)
+            if entry is not None and (self.max_age is None or now - entry[0] < self.max_age):
+                self._stats.move_to_end(username)
+                return entry[1]
+        # This process's queued events first, so the reload includes them
+        self.store.flush()
+        loaded = self.store.load_user_stats(username) or empty_stats()
+        with self._lock:
+            entry = self._stats.get(username)
+            if entry is None or entry[0] < now:
+                entry = self._stats[username] = (now, loaded)
+            self._stats.move_to_end(username)
+            while len(self._stats) > self.max_users:
+                self._stats.popitem(last=False)
+            return entry[1]
+
+
+def rollups(events, idle_gap=IDLE_GAP):
+    """(daily, users) DataFrames computed from a DataFrame of raw events"""
+    import pandas as pd
+
+    # Integer codes instead of strings keep the sorts and group-bys vectorized
+    events = events.assign(
+        username=events["username"].astype("category"),
+        session=events["session"].astype("category").cat.codes,
+        kind=events["kind"].astype("category"),
+    ).sort_values(["session", "created_at"])
+    gap = events["created_at"].diff().where(events["session"] == events["session"].shift())
+    study = gap.where(events["kind"] != SESSION_START).clip(upper=idle_gap).fillna(0.0)
+
+    keys = [events["username"], events["day"]]
+    counts = events.groupby(keys + [events["kind"]], observed=True).size().unstack(fill_value=0)
+    daily = pd.DataFrame(index=counts.index)
+    for kind, column in COUNTERS.items():
+        daily[column] = counts[kind] if kind in counts else 0
+    daily["study_seconds"] = study.groupby(keys, observed=True).sum()
+    daily = daily.reset_index()
+    daily["username"] = daily["username"].astype(str)
+
+    # Streaks: runs of consecutive active days per user
+    days = daily[["username", "day"]].sort_values(["username", "day"])
+    new_run = (days["day"].diff() != 1) | (days["username"] != days["username"].shift())
+    run_lengths = days.groupby([days["username"], new_run.cumsum()])["day"].agg(["size", "max"])
+    run_lengths = run_lengths.reset_index(level=1, drop=True)
+    users = pd.DataFrame({
+        "last_day": run_lengths.groupby(level=0)["max"].max(),
+        "best_streak": run_lengths.groupby(level=0)["size"].max(),
+    })
+    last_runs = run_lengths[run_lengths["max"] == users["last_day"].reindex(run_lengths.index).to_numpy()]
+    users["current_streak"] = last_runs["size"]
+    totals = daily.groupby("username")[["sessions", "study_seconds"]].sum()
+    users = users.join(totals).reset_index()
+    return daily, users
+
+
+def backfill(store, idle_gap=IDLE_GAP):
+    """Rebuild daily_stats and user_stats from the raw events; returns the number of events read"""
+    import pandas as pd
+
+    store.flush()
+    with store.connection() as conn:
+        events = pd.read_sql_query(SQL_ALL_EVENTS, conn)
+    if events.empty:
+        store.replace_rollups([], [])
+        return 0
+    daily, users = rollups(events, idle_gap)
+    daily_columns = ["username", "day", *COUNTERS.values(), "study_seconds"]
+    user_columns = ["username", *empty_stats()]
+    # tolist() yields plain Python values, which sqlite3 binds directly
+    store.replace_rollups(
+        zip(*(daily[column].tolist() for column in daily_columns)),
+        zip(*(users[column].tolist() for column in user_columns)),
+    )
+    return len(events)
+
+
+def main(argv=None):
+    from storage import Store
+
+    parser = argparse.ArgumentParser(description="Learning-event rollup jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser("backfill", help="rebuild daily and per-user rollups from the raw event log")
+    rebuild.add_argument("--db", default="signaura.db")
+    rebuild.add_argument("--idle-gap", type=float, default=IDLE_GAP)
+    args = parser.parse_args(argv)
+
+    store = Store(args.db)
+    start = time.perf_counter()
+    count = backfill(store, args.idle_gap)
+    print(f"rebuilt rollups from {count:,} events in {time.perf_counter() - start:.2f}s")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
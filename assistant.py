@@ -0,0 +1,121 @@
+"""Intent engine for the AI Learning Assistant.
+
+Compiled once per dictionary version:
+
+* a sign-lookup pattern ("how do I sign X", "what's the sign for X", ...)
+  whose X is resolved against the sign dictionary,
+* one alternation regex over every intent keyword, so a message is scanned
+  once no matter how many intents exist,
+* an LRU response cache keyed on the normalised message. Replies that depend
+  on the user (their progress) are cached as templates and filled per call.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+Intent = namedtuple("Intent", ["name", "keywords", "response"])
+
+# Checked in this order when several keywords appear in one message
+INTENTS = [
+    Intent("greeting", ("hello",),
+           "To sign 'hello', wave your hand with your palm facing outward, similar to a regular wave! "
+           "You can practice this in the Words section of our learning module."),
+    Intent("alphabet", ("alphabet", "letters"),
+           "The sign language alphabet uses different hand shapes for each letter. You can learn all 26 letters "
+           "in our Alphabets learning section. Would you like me to show you a specific letter?"),
+    Intent("progress", ("progress",),
+           "Great question! Here's your progress: Letters: {alphabets} completed, Numbers: {numbers} completed, "
+           "Words: {words} completed. Keep up the good work!"),
+    Intent("numbers", ("number",),
+           "Numbers in sign language are formed using specific finger configurations. Numbers 1-5 use your fingers "
+           "naturally, while 6-9 have special hand positions. Check out our Numbers learning section!"),
+    Intent("phrases", ("phrase",),
+           "Some common phrases include 'Hello', 'Thank you', 'Please', and 'Nice to meet you'. You can find these "
+           "in our Words section or use the Text-to-Sign translator!"),
+]
+
+FALLBACK = ("I'm here to help you learn sign language! You can ask me about letters, numbers, words, or your "
+            "learning progress. You can also use our learning modules and translator tools.")
+
+SIGN_LOOKUP = re.compile(
+    r"(?:how\s+(?:do|can|would|should)\s+(?:i|you|we)\s+sign"
+    r"|how\s+to\s+sign"
+    r"|what(?:'s|\s+is)\s+the\s+sign\s+for"
+    r"|sign\s+for"
+    r"|show\s+me\s+(?:the\s+sign\s+for|how\s+to\s+sign))"
+    r"\s+(?:the\s+)?(?:(?P<kind>letter|number|word)\s+)?['\"]?(?P<term>[\w' ]+?)['\"]?\s*[?.!]*$"
+)
+
+CATEGORY_FOR_KIND = {"letter": "alphabets", "number": "numbers", "word": "words"}
+SECTION_NAMES = {"alphabets": "Alphabets", "numbers": "Numbers", "words": "Words"}
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+class IntentEngine:
+    """Maps a chat message to a reply without re-scanning the dictionary"""
+
+    def __init__(self, dictionary, cache_size=1024):
+        self._signs = {}
+        for category, signs in dictionary.items():
+            for sign, data in signs.items():
+                self._signs.setdefault((category, sign.lower()), (sign, data))
+                self._signs.setdefault((None, sign.lower()), (category, sign, data))
+
+        self._intents = {intent.name: intent for intent in INTENTS}
+        self._priority = {}
+        alternatives = []
+        for priority, intent in enumerate(INTENTS):
+            for keyword in intent.keywords:
+                self._priority[keyword] = (priority, intent.name)
+                alternatives.append(re.escape(keyword))
+        # Keywords match as word prefixes: "number" also catches "numbers"
+        self._keywords = re.compile(r"\b(" + "|".join(sorted(alternatives, key=len, reverse=True)) + r")")
+
+        self._classify = lru_cache(maxsize=cache_size)(self._classify_uncached)
+
+    def respond(self, text, progress=None):
+        """Reply to a message; ``progress`` maps category to completed count"""
+        name, reply = self._classify(normalize(text))
+        if name == "progress":
+            counts = progress or {}
+            return reply.format(alphabets=counts.get("alphabets", 0), numbers=counts.get("numbers", 0),
+                                words=counts.get("words", 0))
+        return reply
+
+    def cache_info(self):
+        return self._classify.cache_info()
+
+    def lookup(self, term, kind=None):
+        """Resolve a sign name, optionally restricted to letter/number/word"""
+        term = term.strip().lower()
+        category = CATEGORY_FOR_KIND.get(kind)
+        if category is not None:
+            hit = self._signs.get((category, term))
+            return (category,) + hit if hit else None
+        return self._signs.get((None, term))
+
+    def _classify_uncached(self, text):
+        match = SIGN_LOOKUP.search(text)
+        if match:
+            hit = self.lookup(match.group("term"), match.group("kind"))
+            if hit is not None:
+                category, sign, data = hit
+                tip = self._intents["greeting"].response if sign.lower() == "hello" else None
+                return "sign", tip or (
+                    f"Here's how to sign '{sign}': {data.get('description', '')}. "
+                    f"You can practice it in the {SECTION_NAMES.get(category, category.title())} section "
+                    f"or look it up in the Dictionary."
+                )
+
+        best = None
+        for keyword in self._keywords.findall(text):
+            candidate = self._priority[keyword]
+            if best is None or candidate < best:
+                best = candidate
+        if best is None:
+            return "fallback", FALLBACK
+        return best[1], self._intents[best[1]].response
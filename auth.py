@@ -0,0 +1,145 @@
+"""Password hashing and signed session tokens for login.
+
+Passwords are stored as scrypt hashes. Hashing is deliberately expensive, so
+it never runs on the Streamlit script thread: ``Authenticator`` sends it to a
+small, bounded executor and caps how many logins can be in flight at once.
+Extra logins are turned away quickly instead of queueing behind a surge.
+
+A successful login returns an HMAC-signed session token. Later reruns only
+check the token's signature and expiry, which costs microseconds, and never
+touch the password hash again.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# scrypt cost: ~16 MiB and a few tens of ms per hash on a typical server core
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+
+
+class LoginBusy(RuntimeError):
+    """Raised when too many logins are already being verified"""
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def hash_password(password, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    """Return an encoded ``scrypt$n$r$p$salt$hash`` string"""
+    salt = os.urandom(SALT_BYTES)
+    digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=2 * 128 * r * (n + p + 2))
+    return f"scrypt${n}${r}${p}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def verify_password(password, encoded):
+    """Constant-time check of a password against an encoded hash"""
+    try:
+        scheme, n, r, p, salt, expected = encoded.split("$")
+        n, r, p = int(n), int(r), int(p)
+    except ValueError:
+        return False
+    if scheme != "scrypt":
+        return False
+    expected = _b64decode(expected)
+    digest = hashlib.scrypt(password.encode("utf-8"), salt=_b64decode(salt), n=n, r=r, p=p,
+                            maxmem=2 * 128 * r * (n + p + 2), dklen=len(expected))
+    return hmac.compare_digest(digest, expected)
+
+
+class TokenSigner:
+    """Issues and checks ``username.expiry.signature`` session tokens"""
+
+    def __init__(self, secret, ttl=12 * 3600):
+        self._secret = secret if isinstance(secret, bytes) else secret.encode("utf-8")
+        self.ttl = ttl
+
+    def issue(self, username, now=None):
+        expires = int((now or time.time()) + self.ttl)
+        payload = f"{_b64encode(username.encode('utf-8'))}.{expires}"
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, token, now=None):
+        """Return the username for a valid, unexpired token, else None"""
+        if not token:
+            return None
+        try:
+            user_part, expires, signature = token.split(".")
+            expires = int(expires)
+        except ValueError:
+            return None
+        if not hmac.compare_digest(signature, self._sign(f"{user_part}.{expires}")):
+            return None
+        if expires < (now or time.time()):
+            return None
+        return _b64decode(user_part).decode("utf-8")
+
+    def fingerprint(self, value):
+        """Keyed hash of a value such as a browser cookie, safe to store next to a token"""
+        return self._sign(f"fingerprint:{value}")
+
+    def _sign(self, payload):
+        return _b64encode(hmac.new(self._secret, payload.encode("utf-8"), hashlib.sha256).digest())
+
+
+class Authenticator:
+    """Login and registration with off-thread hashing and bounded concurrency"""
+
+    def __init__(self, store, secret=None, workers=2, max_in_flight=8, wait_timeout=2.0, token_ttl=12 * 3600):
+        self.store = store
+        self.tokens = TokenSigner(secret or secrets.token_bytes(32), ttl=token_ttl)
+        self.wait_timeout = wait_timeout
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="signaura-auth")
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        # Hashed once so unknown usernames cost the same as wrong passwords
+        self._dummy_hash = hash_password(secrets.token_urlsafe(16))
+
+    def login(self, username, password):
+        """Return a session token, or None if the credentials are wrong"""
+        user = self.store.get_user(username) if username else None
+        if user is not None and not user["password_hash"] and user["password"]:
+            # Account created before hashing: check the legacy value once, then upgrade it
+            if not hmac.compare_digest(user["password"].encode("utf-8"), password.encode("utf-8")):
+                return None
+            self.store.set_password_hash(username, self._run(hash_password, password))
+            return self.tokens.issue(username)
+
+        encoded = user["password_hash"] if user is not None else self._dummy_hash
+        if self._run(verify_password, password, encoded) and user is not None:
+            return self.tokens.issue(username)
+        return None
+
+    def register(self, username, email, password):
+        """Create an account; returns False if the username is taken"""
+        return self.store.create_user(username, email, self._run(hash_password, password))
+
+    def issue_token(self, username):
+        return self.tokens.issue(username)
+
+    def check_token(self, token):
+        """Username for a valid session token, or None"""
+        return self.tokens.verify(token)
+
+    def fingerprint(self, value):
+        return self.tokens.fingerprint(value)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise LoginBusy("Too many logins in progress")
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
@@ -0,0 +1,122 @@
+"""Load test: recognition latency of well-behaved users next to one abusive client.
+
+--users client threads each play a user clicking "Analyze Sign" about once
+every --interval seconds, while --flood threads share a single abusive
+user who resubmits as soon as the server answers (--retry-ms after a
+refusal). The same load runs twice
+against the micro-batched inference service with the dummy model: once
+straight into the service, once through ``AdmissionController``, and
+prints latency percentiles of the well-behaved users' successful requests
+plus the controller's counters.
+
+Usage: python benchmarks/bench_admission.py [--users 40] [--flood 128] [--duration 15]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from admission import AdmissionController, Rejected
+from inference import DummySignModel, InferenceQueueFull, InferenceService
+
+
+def percentile(values, pct):
+    return float(np.percentile(values, pct)) * 1000 if values else 0.0
+
+
+def run(args, admission):
+    model = DummySignModel([f"sign{i}" for i in range(100)], hidden=args.hidden)
+    service = InferenceService(model, max_batch_size=args.batch_size, max_delay_ms=10, workers=args.workers,
+                               max_queue=256)
+    controller = AdmissionController(rate=args.rate, burst=args.burst, max_concurrent=args.batch_size * args.workers,
+                                     max_queue=32, max_wait=args.max_wait) if admission else None
+    image = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies = []
+    counts = {"ok": 0, "rejected": 0, "flood_ok": 0, "flood_rejected": 0}
+
+    def request(user):
+        if controller is None:
+            return service.predict(image, timeout=60)
+        with controller.admit(user):
+            return service.predict(image, timeout=60)
+
+    def polite(user):
+        rng = random.Random(user)
+        time.sleep(rng.uniform(0, args.interval))
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                request(user)
+            except (Rejected, InferenceQueueFull):
+                with lock:
+                    counts["rejected"] += 1
+            else:
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+                    counts["ok"] += 1
+            stop.wait(max(0.0, rng.uniform(0.5, 1.5) * args.interval - (time.perf_counter() - start)))
+
+    def flood():
+        while not stop.is_set():
+            try:
+                request("abuser")
+            except (Rejected, InferenceQueueFull):
+                with lock:
+                    counts["flood_rejected"] += 1
+                # Resubmitting right away costs the client one rerun round trip
+                time.sleep(args.retry_ms / 1000)
+            else:
+                with lock:
+                    counts["flood_ok"] += 1
+
+    threads = [threading.Thread(target=polite, args=(f"user{i}",)) for i in range(args.users)]
+    threads += [threading.Thread(target=flood) for _ in range(args.flood)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    service.close()
+
+    name = "with admission control" if admission else "no admission control"
+    print(f"{name:<24}{percentile(latencies, 50):>9.1f}{percentile(latencies, 99):>9.1f}"
+          f"{max(latencies, default=0) * 1000:>9.1f}{counts['ok']:>7}{counts['rejected']:>9}"
+          f"{counts['flood_ok']:>10}{counts['flood_rejected']:>15}")
+    return controller
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between a user's requests")
+    parser.add_argument("--flood", type=int, default=128, help="threads of the abusive client")
+    parser.add_argument("--retry-ms", type=float, default=50.0, help="abusive client's delay after a refusal")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--hidden", type=int, default=1024, help="hidden width of the dummy model")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=0.5)
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--max-wait", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"users={args.users} interval={args.interval}s flood threads={args.flood} duration={args.duration}s")
+    print(f"{'':<24}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'ok':>7}{'refused':>9}"
+          f"{'flood ok':>10}{'flood refused':>15}")
+    run(args, admission=False)
+    controller = run(args, admission=True)
+    print("admission counters:", controller.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark the pandas backfill of the learning-event rollups.
+
+Writes --events synthetic events for --users users into a temporary
+database, then times ``analytics.backfill`` (read the raw log, compute the
+daily and per-user rollups, swap them in) and the per-event cost of
+``EventLog.record``, the path every page click takes.
+
+Usage: python benchmarks/bench_analytics.py [--events 2000000] [--users 5000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from analytics import LESSON_VIEWED, SESSION_START, SIGN_COMPLETED, TRANSLATION, EventLog, backfill
+from storage import SQL_APPEND_EVENT, Store
+
+KINDS = np.array([SESSION_START, LESSON_VIEWED, LESSON_VIEWED, SIGN_COMPLETED, TRANSLATION])
+
+
+def synthetic_events(events, users, seed=0):
+    """Rows for SQL_APPEND_EVENT: users with sessions spread over a year"""
+    rng = np.random.default_rng(seed)
+    user = rng.integers(0, users, events)
+    session = user * 100 + rng.integers(0, 100, events)
+    created_at = 1.7e9 + rng.uniform(0, 365 * 86400, events)
+    kind = KINDS[rng.integers(0, len(KINDS), events)]
+    day = (created_at // 86400).astype(np.int64) + 719163
+    for u, s, k, at, d in zip(user.tolist(), session.tolist(), kind.tolist(), created_at.tolist(), day.tolist()):
+        yield (f"user{u}", f"session{s}", k, None, None, at, d)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Store(os.path.join(tmp, "bench.db"))
+        start = time.perf_counter()
+        with store.connection() as conn:
+            conn.execute("BEGIN")
+            conn.executemany(SQL_APPEND_EVENT, synthetic_events(args.events, args.users))
+            conn.execute("COMMIT")
+        print(f"wrote {args.events:,} events for {args.users:,} users in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        backfill(store)
+        elapsed = time.perf_counter() - start
+        print(f"backfill                 {elapsed:8.2f} s   ({args.events / elapsed:,.0f} events/s)")
+
+        log = EventLog(store)
+        start = time.perf_counter()
+        for i in range(args.records):
+            log.record(f"user{i % 100}", f"live{i % 100}", LESSON_VIEWED)
+        elapsed = time.perf_counter() - start
+        print(f"EventLog.record          {elapsed / args.records * 1e6:8.1f} us per event")
+
+        start = time.perf_counter()
+        for i in range(args.records):
+            log.stats(f"user{i % 100}")
+        elapsed = time.perf_counter() - start
+        print(f"EventLog.stats           {elapsed / args.records * 1e6:8.1f} us per read")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
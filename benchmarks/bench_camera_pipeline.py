@@ -0,0 +1,52 @@
+"""Run the live-camera pipeline offline and report stage latency and drops.
+
+Uses a synthetic frame generator by default, or a local video file with
+--video. Recognition goes through the same InferenceService as the app.
+
+Usage: python benchmarks/bench_camera_pipeline.py [--frames 300] [--video clip.mp4]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera_pipeline import MotionGate, StreamingRecognizer, SyntheticFrameSource, VideoFileFrameSource
+from inference import DummySignModel, InferenceService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--video", help="local video file instead of synthetic frames")
+    parser.add_argument("--skin", type=float, default=0.0, help="minimum skin-pixel fraction for the gate")
+    args = parser.parse_args()
+
+    if args.video:
+        source = VideoFileFrameSource(args.video, realtime=True, max_frames=args.frames)
+    else:
+        source = SyntheticFrameSource(frames=args.frames, fps=args.fps, realtime=True)
+
+    service = InferenceService(DummySignModel([f"sign_{i}" for i in range(100)]))
+    pipeline = StreamingRecognizer(source, service.predict, gate=MotionGate(min_skin_fraction=args.skin))
+
+    start = time.perf_counter()
+    pipeline.start()
+    pipeline.join()
+    elapsed = time.perf_counter() - start
+    service.close()
+
+    if pipeline.error is not None:
+        raise pipeline.error
+    report = pipeline.report()
+    report["elapsed_s"] = round(elapsed, 3)
+    report["latest"] = pipeline.latest()._asdict() if pipeline.latest() else None
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
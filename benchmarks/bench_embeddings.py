@@ -0,0 +1,80 @@
+"""Benchmark top-k cosine search over the reference-embedding index.
+
+Writes --signs synthetic signs with --samples reference vectors each twice,
+once as an exact index and once clustered (IVF), then reports open time
+(memory-mapping), batched search latency, and how often the IVF search
+finds the exact top-1 and top-k signs. Queries are noisy copies of random references, like images of
+known signs.
+
+Usage: python benchmarks/bench_embeddings.py [--signs 30000] [--samples 4] [--dim 256]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from embedding_index import EmbeddingIndex, normalize, write_index
+
+
+def timed_search(index, queries, batch, k, exact=False):
+    results = []
+    start = time.perf_counter()
+    for i in range(0, len(queries), batch):
+        results.extend(index.search(queries[i:i + batch], k, exact=exact))
+    return results, (time.perf_counter() - start) / (len(queries) / batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signs", type=int, default=30000)
+    parser.add_argument("--samples", type=int, default=4)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=512)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--nprobe", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((args.signs, args.dim)).astype(np.float32)
+    row_classes = np.repeat(np.arange(args.signs), args.samples)
+    vectors = normalize(centres[row_classes] + 0.3 * rng.standard_normal((len(row_classes), args.dim)))
+    classes = [("words", f"sign{i}") for i in range(args.signs)]
+    picks = rng.integers(0, len(vectors), args.queries)
+    queries = normalize(vectors[picks] + rng.standard_normal((args.queries, args.dim)) / np.sqrt(args.dim))
+    print(f"{len(vectors):,} vectors x {args.dim} ({vectors.nbytes / 2**20:.0f} MiB), "
+          f"{args.queries} queries in batches of {args.batch}, k={args.k}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"exact": os.path.join(tmp, "exact.emb"), "ivf": os.path.join(tmp, "ivf.emb")}
+        for name, path in paths.items():
+            start = time.perf_counter()
+            write_index(path, classes, vectors, row_classes, "bench", "bench",
+                        ivf_threshold=len(vectors) + 1 if name == "exact" else 0)
+            print(f"write {name:<6}{time.perf_counter() - start:10.2f} s")
+
+        start = time.perf_counter()
+        exact_index = EmbeddingIndex(paths["exact"])
+        ivf_index = EmbeddingIndex(paths["ivf"], nprobe=args.nprobe)
+        print(f"open both    {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+        truth, exact_ms = timed_search(exact_index, queries, args.batch, args.k)
+        found, ivf_ms = timed_search(ivf_index, queries, args.batch, args.k)
+        hits = sum(len({c for c, _ in a} & {c for c, _ in b}) for a, b in zip(truth, found))
+        same_top = sum(a[0][0] == b[0][0] for a, b in zip(truth, found))
+        correct = sum(matches[0][0] == row_classes[pick] for matches, pick in zip(truth, picks))
+        print(f"exact search {exact_ms * 1000:7.2f} ms per batch   top-1 accuracy {correct / args.queries:.3f}")
+        print(f"ivf search   {ivf_ms * 1000:7.2f} ms per batch   "
+              f"top-1 as exact {same_top / args.queries:.3f}   recall@{args.k} {hits / (args.k * args.queries):.3f}   "
+              f"({len(ivf_index.centroids)} lists, nprobe={args.nprobe})")
+        del exact_index, ivf_index
+
+
+if __name__ == "__main__":
+    main()
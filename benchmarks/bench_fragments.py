@@ -0,0 +1,180 @@
+"""Rerun time and websocket bytes per click, measured against a live server.
+
+Starts ``streamlit run`` headless on a free port, connects to its websocket
+the way a browser does, logs in with "Demo Login", and then clicks a few
+representative buttons --clicks times each:
+
+* the "Got it!" button of the alphabet lesson,
+* a quick-help question in the chat panel,
+* a quick phrase in the Text-to-Sign panel,
+* a sidebar navigation button.
+
+For every click it records the time until the server reports the script
+(or fragment) run finished, the number of runs it caused, the bytes of
+ForwardMsg frames received and the number of elements sent. Point --app at
+the signaura.py of another checkout to compare before and after a change.
+
+Usage: python benchmarks/bench_fragments.py [--app path/to/signaura.py] [--clicks 20]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from websockets.sync.client import connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FINISHED = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY)
+
+# (name, page to open first, key of the button to click)
+SCENARIOS = [
+    ("Learning: Got it!", "nav_Learning", "alphabet_next"),
+    ("Chat: quick help", "nav_Chatbot", "quick_Common phrases"),
+    ("Translator: quick phrase", "nav_Translator", "phrase_Hello"),
+    ("Sidebar: navigate", "nav_Dashboard", "nav_Profile"),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Session:
+    """Minimal browser stand-in speaking Streamlit's websocket protocol"""
+
+    def __init__(self, ws, query_string=""):
+        self.ws = ws
+        self.query_string = query_string  # follows st.query_params changes, like the address bar
+        self.buttons = {}  # widget key or label -> (widget id, fragment id)
+        self.markdown = []  # bodies of the markdown elements sent by the last run
+
+    def rerun(self, trigger=None, fragment_id=""):
+        """Send a rerun request and read until the run finishes; returns (seconds, runs, bytes, elements)"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query_string
+        msg.rerun_script.page_script_hash = ""
+        if trigger is not None:
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = trigger
+            state.trigger_value = True
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+
+        start = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        runs = received = elements = 0
+        self.markdown = []
+        while True:
+            frame = self.ws.recv(timeout=60)
+            received += len(frame)
+            forward = ForwardMsg()
+            forward.ParseFromString(frame)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.HasField("new_element"):
+                elements += 1
+                self._remember_widget(forward.delta)
+                if forward.delta.new_element.WhichOneof("type") == "markdown":
+                    self.markdown.append(forward.delta.new_element.markdown.body)
+            elif kind == "page_info_changed":
+                self.query_string = forward.page_info_changed.query_string
+            elif kind == "script_finished":
+                runs += 1
+                if forward.script_finished in FINISHED:
+                    return time.perf_counter() - start, runs, received, elements
+
+    def click(self, key):
+        widget_id, fragment_id = self.buttons[key]
+        return self.rerun(widget_id, fragment_id)
+
+    def _remember_widget(self, delta):
+        element = delta.new_element
+        if element.WhichOneof("type") != "button":
+            return
+        button = element.button
+        entry = (button.id, delta.fragment_id)
+        self.buttons[button.label] = entry
+        # User keys are embedded at the end of the generated widget id
+        key = button.id.rsplit("-", 1)[-1]
+        self.buttons[key] = entry
+
+
+def wait_for_server(port, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("streamlit exited before it started listening")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("streamlit did not start in time")
+
+
+def run_scenarios(session, args):
+    print(f"app={os.path.relpath(os.path.abspath(args.app))} clicks={args.clicks}")
+    print(f"{'scenario':<28}{'p50 ms':>9}{'mean ms':>9}{'runs':>6}{'KiB/click':>11}{'elements':>10}")
+    for name, page, key in SCENARIOS:
+        session.click(page)
+        timings, runs, sizes, elements = [], 0, 0, 0
+        for _ in range(args.clicks):
+            elapsed, click_runs, received, sent = session.click(key)
+            timings.append(elapsed)
+            runs += click_runs
+            sizes += received
+            elements += sent
+            if key.startswith("nav_"):
+                # Go back so every click is a real page change
+                session.click(page)
+        timings.sort()
+        print(f"{name:<28}{timings[len(timings) // 2] * 1000:>9.1f}{sum(timings) / len(timings) * 1000:>9.1f}"
+              f"{runs / args.clicks:>6.1f}{sizes / args.clicks / 1024:>11.1f}{elements / args.clicks:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "signaura.py"))
+    parser.add_argument("--clicks", type=int, default=20)
+    args = parser.parse_args()
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env.update({
+            "SIGNAURA_DB": os.path.join(tmp, "bench.db"),
+            "SIGNAURA_SECRET_KEY": "bench-secret",
+            "SIGNAURA_MEDIA_URL": "http://127.0.0.1:9",
+            "SIGNAURA_MEDIA_ROOT": os.path.join(tmp, "media"),
+        })
+        process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", os.path.abspath(args.app),
+             "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+             "--server.enableXsrfProtection", "false", "--server.fileWatcherType", "none",
+             "--browser.gatherUsageStats", "false"],
+            cwd=os.path.dirname(os.path.abspath(args.app)), env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_server(port, process)
+            with connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_size=None) as ws:
+                session = Session(ws)
+                session.rerun()
+                session.click("Demo Login")
+                run_scenarios(session, args)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
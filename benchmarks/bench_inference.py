@@ -0,0 +1,70 @@
+"""Benchmark the micro-batched inference service with the CPU-only dummy model.
+
+Each client thread plays one Streamlit session submitting an image and
+waiting on its own future. The sweep covers several batch sizes and delays.
+
+Usage: python benchmarks/bench_inference.py [--clients 32] [--requests 50]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from inference import DummySignModel, InferenceService
+
+
+def percentile(values, pct):
+    return float(np.percentile(values, pct)) * 1000 if values else 0.0
+
+
+def run(model, clients, requests, batch_size, delay_ms, workers):
+    service = InferenceService(model, max_batch_size=batch_size, max_delay_ms=delay_ms,
+                               workers=workers, max_queue=clients * 2)
+    image = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        local = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            service.predict(image)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stats = service.stats()
+    service.close()
+    return len(latencies) / elapsed, percentile(latencies, 50), percentile(latencies, 99), stats["mean_batch_size"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--labels", type=int, default=1000)
+    args = parser.parse_args()
+
+    model = DummySignModel([f"sign_{i}" for i in range(args.labels)])
+    print(f"{'batch':>5} {'delay ms':>8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>10}")
+    for batch_size, delay_ms in [(1, 0), (4, 2), (8, 5), (16, 10), (32, 20)]:
+        throughput, p50, p99, mean_batch = run(model, args.clients, args.requests, batch_size, delay_ms, args.workers)
+        print(f"{batch_size:>5} {delay_ms:>8} {throughput:>9.1f} {p50:>8.2f} {p99:>8.2f} {mean_batch:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark logins per second under concurrency, and session-token checks.
+
+Creates a throwaway database with --users accounts, then has --clients
+threads log in as fast as they can for --seconds. Logins turned away by the
+concurrency limit are counted separately.
+
+Usage: python benchmarks/bench_login.py [--clients 16] [--workers 2] [--seconds 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import Authenticator, LoginBusy, hash_password
+from storage import Store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Store(os.path.join(tmp, "bench.db"))
+        for i in range(args.users):
+            store.create_user(f"user{i}", "", hash_password(f"password{i}"))
+        auth = Authenticator(store, secret=b"bench", workers=args.workers,
+                             max_in_flight=args.max_in_flight, wait_timeout=1.0)
+
+        counts = {"ok": 0, "busy": 0, "failed": 0}
+        latencies = []
+        lock = threading.Lock()
+        stop = time.monotonic() + args.seconds
+
+        def client(n):
+            i = n
+            while time.monotonic() < stop:
+                user = i % args.users
+                start = time.perf_counter()
+                try:
+                    token = auth.login(f"user{user}", f"password{user}")
+                    outcome = "ok" if token else "failed"
+                except LoginBusy:
+                    outcome = "busy"
+                elapsed = time.perf_counter() - start
+                with lock:
+                    counts[outcome] += 1
+                    if outcome == "ok":
+                        latencies.append(elapsed)
+                i += 1
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(args.clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+        print(f"clients={args.clients} workers={args.workers} max_in_flight={args.max_in_flight}")
+        print(f"logins/s: {counts['ok'] / elapsed:.1f}  busy: {counts['busy']}  failed: {counts['failed']}")
+        print(f"login latency p50 {p50:.1f} ms  p99 {p99:.1f} ms")
+
+        token = auth.issue_token("user0")
+        n = 100_000
+        start = time.perf_counter()
+        for _ in range(n):
+            auth.check_token(token)
+        per_check = (time.perf_counter() - start) / n * 1e6
+        print(f"session token check: {per_check:.2f} us")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Throughput of concurrent range requests against the local media server.
+
+Writes --clips random files per rendition into a temporary media root,
+starts the server, and has --clients keep-alive connections fetch random
+byte ranges (the way a video element seeks and buffers) for --seconds.
+
+Usage: python benchmarks/bench_media_server.py [--clients 16] [--range-kb 512]
+"""
+
+import argparse
+import http.client
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from media_server import RENDITIONS, make_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--clips", type=int, default=20)
+    parser.add_argument("--clip-mb", type=float, default=4.0)
+    parser.add_argument("--range-kb", type=int, default=512)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        clip_size = int(args.clip_mb * 1024 * 1024)
+        for rendition in RENDITIONS:
+            os.makedirs(os.path.join(root, rendition))
+            for i in range(args.clips):
+                with open(os.path.join(root, rendition, f"clip_{i}.mp4"), "wb") as f:
+                    f.write(os.urandom(clip_size))
+
+        server = make_server(root, port=0)
+        port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        totals = {"requests": 0, "bytes": 0, "errors": 0}
+        latencies = []
+        lock = threading.Lock()
+        stop = time.monotonic() + args.seconds
+        span = args.range_kb * 1024
+
+        def client(seed):
+            rng = random.Random(seed)
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            requests = received = errors = 0
+            local = []
+            while time.monotonic() < stop:
+                clip = f"clip_{rng.randrange(args.clips)}.mp4"
+                quality = rng.choice(list(RENDITIONS) + ["auto"])
+                start = rng.randrange(0, clip_size - span)
+                began = time.perf_counter()
+                conn.request("GET", f"/media/{clip}?q={quality}", headers={"Range": f"bytes={start}-{start + span - 1}"})
+                response = conn.getresponse()
+                body = response.read()
+                local.append(time.perf_counter() - began)
+                if response.status != 206 or len(body) != span:
+                    errors += 1
+                requests += 1
+                received += len(body)
+            conn.close()
+            with lock:
+                totals["requests"] += requests
+                totals["bytes"] += received
+                totals["errors"] += errors
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(args.clients)]
+        began = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+        server.shutdown()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"clients={args.clients} range={args.range_kb} KiB")
+    print(f"{totals['requests'] / elapsed:.0f} req/s, {totals['bytes'] / elapsed / 1e6:.1f} MB/s, errors={totals['errors']}")
+    print(f"latency p50 {p50:.2f} ms  p99 {p99:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Rerun latency, element count and peak memory for every page of the app.
+
+Drives signaura.py headlessly with Streamlit's AppTest harness, so it runs
+offline on a CPU-only box. Each page is loaded as a logged-in user with
+realistic state: a generated dictionary of --signs signs per category, a
+chat history of --chat messages and --completed of every category done.
+
+Results are compared against a stored baseline and the script exits with
+status 1 when a page's p50 latency or peak memory grows by more than
+--threshold. Baselines are machine-specific: record one with
+--update-baseline on the box that runs the comparison.
+
+Usage: python benchmarks/bench_reruns.py [--runs 20] [--threshold 0.2] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block
+
+from auth import TokenSigner, hash_password
+from dictionary_store import write_dictionary
+from storage import Store
+
+APP = os.path.join(ROOT, "signaura.py")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "rerun_baseline.json")
+USERNAME = "bench"
+SECRET = "bench-secret"
+
+PAGES = ["Dashboard", "Learning", "Translator", "Chatbot", "Dictionary", "Profile"]
+
+
+def build_dictionary(signs_per_category, seed=0):
+    """The app's three categories, scaled up with made-up signs"""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ren", "sa", "tu", "vel", "zo", "an", "bri", "cho", "dem"]
+    dictionary = {}
+    for category in ("alphabets", "numbers", "words"):
+        signs = {}
+        while len(signs) < signs_per_category:
+            words = [
+                "".join(rng.choice(syllables) for _ in range(rng.randint(1, 3)))
+                for _ in range(rng.randint(1, 3))
+            ]
+            name = " ".join(words).title() if category == "words" else f"{category[0].upper()}{len(signs)}"
+            signs[name] = {
+                "video_url": f"placeholder_{name.lower().replace(' ', '_')}.mp4",
+                "description": f"{name} in ASL",
+            }
+        dictionary[category] = signs
+    return dictionary
+
+
+def build_chat(messages):
+    chat = []
+    for i in range(messages):
+        if i % 2 == 0:
+            chat.append({"role": "user", "content": f"How do I sign 'word {i}'?"})
+        else:
+            chat.append({"role": "assistant", "content": "I'm here to help you learn sign language! " * 3})
+    return chat
+
+
+def build_progress(dictionary, completed_fraction):
+    progress = {}
+    for category, signs in dictionary.items():
+        names = list(signs)
+        done = names[:int(len(names) * completed_fraction)]
+        progress[category] = {"completed": set(done), "current": len(done) % max(len(names), 1)}
+    return progress
+
+
+def count_elements(at):
+    return sum(1 for root in (at.main, at.sidebar) for node in root if not isinstance(node, Block))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure_page(page, state, runs, warmup):
+    at = AppTest.from_file(APP, default_timeout=120)
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.session_state.current_page = page
+
+    for _ in range(max(warmup, 1)):
+        at.run()
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+
+    # Measured separately: tracing allocations slows the timed reruns down
+    tracemalloc.start()
+    at.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "elements": count_elements(at),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return a list of human-readable regressions"""
+    regressions = []
+    for page, current in results.items():
+        previous = baseline.get(page)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "peak_kib"):
+            limit = previous[metric] * (1 + threshold)
+            if current[metric] > limit:
+                regressions.append(
+                    f"{page}: {metric} {current[metric]} > {previous[metric]} (+{threshold:.0%} allowed)"
+                )
+        if current["elements"] > previous["elements"]:
+            regressions.append(f"{page}: elements {current['elements']} > {previous['elements']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--signs", type=int, default=2000, help="signs per category")
+    parser.add_argument("--chat", type=int, default=500, help="chat messages")
+    parser.add_argument("--completed", type=float, default=0.5, help="fraction of each category completed")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    settings = {"signs": args.signs, "chat": args.chat, "completed": args.completed}
+    with tempfile.TemporaryDirectory() as tmp:
+        dictionary = build_dictionary(args.signs)
+        dictionary_path = os.path.join(tmp, "dictionary.jsonl")
+        write_dictionary(dictionary_path, dictionary)
+
+        os.environ.update({
+            "SIGNAURA_DB": os.path.join(tmp, "bench.db"),
+            "SIGNAURA_DICTIONARY": dictionary_path,
+            "SIGNAURA_SECRET_KEY": SECRET,
+            # Clip URLs are only formatted, never fetched
+            "SIGNAURA_MEDIA_URL": "http://127.0.0.1:9",
+            "SIGNAURA_MEDIA_ROOT": os.path.join(tmp, "media"),
+        })
+
+        chat = build_chat(args.chat)
+        store = Store(os.environ["SIGNAURA_DB"])
+        store.create_user(USERNAME, "bench@example.com", hash_password("bench"))
+        for message in chat:
+            store.append_chat(USERNAME, message["role"], message["content"])
+        store.close()
+
+        state = {
+            "authenticated": True,
+            "username": USERNAME,
+            "session_token": TokenSigner(SECRET).issue(USERNAME),
+            "learning_progress": build_progress(dictionary, args.completed),
+            "chat_history": chat,
+        }
+
+        results = {}
+        print(f"signs/category={args.signs} chat={args.chat} completed={args.completed:.0%} runs={args.runs}")
+        print(f"{'page':<12}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'elements':>10}{'peak KiB':>12}")
+        for page in args.pages:
+            result = measure_page(page, state, args.runs, args.warmup)
+            results[page] = result
+            print(f"{page:<12}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['max_ms']:>10.2f}"
+                  f"{result['elements']:>10}{result['peak_kib']:>12.1f}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "pages": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against; record one with --update-baseline")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != settings:
+        print(f"warning: baseline was recorded with {baseline.get('settings')}")
+    regressions = compare(results, baseline.get("pages", {}), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark cold start, warm latency and throughput of the model runtime.
+
+Every configuration runs in a fresh process, started with the BLAS thread
+variables for its intra-op thread count, so cold-start costs are real:
+
+* cold start: ``ModelRuntime`` start until ready (load the model, build
+  the reference index, warm up), then the first single-image request;
+* warm latency: p50/p99 of single-image ``predict_batch`` calls;
+* throughput: images/s through an ``InferenceService`` with the given
+  number of workers (inter-op) and --clients concurrent callers.
+
+Configurations cover fp32 and int8 weights, each intra-op thread count in
+--threads and each worker count in --workers, plus fp32 without warm-up to
+show what the first user pays otherwise.
+
+Usage: python benchmarks/bench_runtime.py [--threads 1,4] [--workers 1,2] [--seconds 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def child(config, seconds, clients):
+    # Imported here so the parent's thread settings never apply to numpy
+    import numpy as np
+
+    from dictionary_store import DictionaryStore
+    from embedding_index import EmbeddingStore, NearestSignModel
+    from inference import DummySignModel, InferenceService
+    from model_runtime import ModelRuntime
+
+    dictionaries = DictionaryStore(os.path.join(ROOT, "data", "dictionary.jsonl"))
+
+    def load():
+        embedder = DummySignModel([])
+        if config["int8"]:
+            embedder = embedder.quantize_int8()
+        embeddings = EmbeddingStore(os.path.join(config["tmp"], "bench.emb"), embedder)
+        return NearestSignModel(embedder, lambda: embeddings.current(dictionaries.current()))
+
+    images = list(np.random.default_rng(1).integers(0, 256, (64, 480, 640, 3), dtype=np.uint8))
+    start = time.perf_counter()
+    runtime = ModelRuntime(load, (64, 64), warmup_runs=config["warmup"], intra_op_threads=config["threads"]).start()
+    runtime.wait()
+    ready = time.perf_counter() - start
+    runtime.predict_batch(images[:1])
+    first = time.perf_counter() - start - ready
+
+    latencies = []
+    for image in images * 2:
+        start = time.perf_counter()
+        runtime.predict_batch([image])
+        latencies.append(time.perf_counter() - start)
+
+    service = InferenceService(runtime, max_batch_size=8, max_delay_ms=5, workers=config["workers"])
+    stop = threading.Event()
+    done = [0] * clients
+
+    def client(i):
+        while not stop.is_set():
+            service.predict(images[i % len(images)], timeout=60)
+            done[i] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    service.close()
+
+    print(json.dumps({
+        "ready_s": ready,
+        "load_s": runtime.timings["load"],
+        "first_ms": first * 1000,
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+        "images_per_s": sum(done) / seconds,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", default=",".join(str(n) for n in sorted({1, os.cpu_count() or 1})),
+                        help="comma-separated intra-op thread counts")
+    parser.add_argument("--workers", default="1,2", help="comma-separated inter-op (service worker) counts")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(json.loads(args.child), args.seconds, args.clients)
+        return
+
+    from model_runtime import thread_environment
+
+    configs = [
+        {"int8": int8, "warmup": 3, "threads": threads, "workers": workers}
+        for int8 in (False, True)
+        for threads in map(int, args.threads.split(","))
+        for workers in map(int, args.workers.split(","))
+    ]
+    configs.append({**configs[-1], "int8": False, "warmup": 0})
+
+    print(f"cpus={os.cpu_count()} clients={args.clients} throughput window={args.seconds}s")
+    print(f"{'weights':<8}{'warm-up':>8}{'intra':>6}{'inter':>6}{'load s':>8}{'ready s':>9}{'first ms':>10}"
+          f"{'p50 ms':>8}{'p99 ms':>8}{'img/s':>8}")
+    for config in configs:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {**config, "tmp": tmp}
+            env = {**os.environ, **thread_environment(config["threads"])}
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", json.dumps(config),
+                 "--seconds", str(args.seconds), "--clients", str(args.clients)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{'int8' if config['int8'] else 'fp32':<8}{config['warmup']:>8}{config['threads']:>6}"
+              f"{config['workers']:>6}{result['load_s']:>8.2f}{result['ready_s']:>9.2f}{result['first_ms']:>10.1f}"
+              f"{result['p50_ms']:>8.1f}{result['p99_ms']:>8.1f}{result['images_per_s']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark the dictionary search index on a synthetic catalog.
+
+Usage: python benchmarks/bench_search.py [--entries 100000] [--repeat 200]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex
+
+
+def synthetic_dictionary(entries, seed=0):
+    """Build a dictionary shaped like SIGN_DICTIONARY with ``entries`` words"""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(entries // 5 + 1)]
+    dictionary = {
+        "alphabets": {c: {"video_url": f"placeholder_{c.lower()}.mp4", "description": f"Letter {c} in ASL"} for c in string.ascii_uppercase},
+        "numbers": {str(n): {"video_url": f"placeholder_{n}.mp4", "description": f"Number {n} in ASL"} for n in range(100)},
+        "words": {},
+    }
+    while len(dictionary["words"]) < entries:
+        word = " ".join(rng.choices(vocabulary, k=rng.randint(1, 3)))
+        dictionary["words"][word] = {
+            "video_url": f"placeholder_{len(dictionary['words'])}.mp4",
+            "description": f"{word.title()} in ASL, related to {rng.choice(vocabulary)}",
+        }
+    return dictionary, vocabulary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    dictionary, vocabulary = synthetic_dictionary(args.entries)
+
+    start = time.perf_counter()
+    index = SearchIndex(dictionary)
+    print(f"built index over {len(index):,} signs in {time.perf_counter() - start:.2f}s")
+
+    queries = ["a", "b", "asl", "letter a", "7", "in asl", vocabulary[0], vocabulary[1][:2], "zzzz", "related to " + vocabulary[2][:3]]
+    categories = [None] + index.categories
+
+    worst = 0.0
+    for query in queries:
+        for category in categories:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                hits = index.search(query, category=category)
+            elapsed_ms = (time.perf_counter() - start) / args.repeat * 1000
+            worst = max(worst, elapsed_ms)
+            print(f"{query!r:>24} {str(category):>10} {len(hits):>4} hits {elapsed_ms:8.4f} ms")
+
+    print(f"worst mean query latency: {worst:.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark the spaced-repetition scheduler on synthetic review state.
+
+Loads --users users with --cards reviewed cards each, then times:
+
+* the batch "what is due today for everyone" job (vectorized, and as a
+  plain Python loop over the same rows for comparison),
+* grading one review for every user at once,
+* picking the next card for a single user from their due heap.
+
+Usage: python benchmarks/bench_srs.py [--users 10000] [--cards 100] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from srs import DEFAULT_EASE, GOOD, ReviewScheduler, today
+
+CATEGORIES = ["alphabets", "numbers", "words"]
+
+
+def synthetic_reviews(users, cards, day, seed=0):
+    rng = random.Random(seed)
+    for u in range(users):
+        username = f"user{u}"
+        for c in range(cards):
+            interval = rng.choice([1, 6, 15, 38, 95])
+            yield (username, CATEGORIES[c % len(CATEGORIES)], f"sign{c}", DEFAULT_EASE, interval,
+                   rng.randint(1, 5), day + rng.randint(-interval, interval))
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    day = today()
+    rows = list(synthetic_reviews(args.users, args.cards, day))
+    scheduler = ReviewScheduler()
+    start = time.perf_counter()
+    scheduler.load(rows)
+    print(f"loaded {len(scheduler):,} cards for {args.users:,} users in {time.perf_counter() - start:.2f}s")
+
+    def python_due_counts():
+        counts = {}
+        for username, _, _, _, _, _, due in rows:
+            if due <= day:
+                counts[username] = counts.get(username, 0) + 1
+        return counts
+
+    vectorized, counts = timed(lambda: scheduler.due_counts(day), args.repeat)
+    looped, expected = timed(python_due_counts, args.repeat)
+    assert counts == expected
+    print(f"due counts, vectorized   {vectorized * 1000:9.2f} ms  ({sum(counts.values()):,} due)")
+    print(f"due counts, Python loop  {looped * 1000:9.2f} ms  ({looped / vectorized:.1f}x slower)")
+
+    elapsed, queues = timed(lambda: scheduler.due_today(day), args.repeat)
+    print(f"due queues per user      {elapsed * 1000:9.2f} ms  ({len(queues):,} users)")
+
+    batch = np.arange(0, len(scheduler), args.cards)
+    start = time.perf_counter()
+    scheduler.review_rows(batch, np.full(len(batch), GOOD), day)
+    print(f"grade 1 card per user    {(time.perf_counter() - start) * 1000:9.2f} ms  ({len(batch):,} reviews)")
+
+    elapsed, _ = timed(lambda: [scheduler.next_due(f"user{u}", "words", day) for u in range(1000)], args.repeat)
+    print(f"next card, 1000 users    {elapsed * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark cold start: import time and first render of each page in a fresh process.
+
+Every (app, page) pair runs in its own interpreter, like the first visit
+after a deploy or a worker restart. The child first imports Streamlit's
+test harness, which every layout pays, then times the app's first run
+with a logged-in session on the page (Login logged out), then a second
+run of the same page. It reports the modules the app imported and which
+heavy libraries (numpy, pandas, PIL) ended up loaded. The app starts
+loading the recognition model in the background on its first run, so
+numpy shows up on every page.
+
+--baseline REV extracts signaura.py and its modules at a git revision
+(e.g. one before the page split) into a temporary directory and runs it
+next to the working tree; --app adds any other checkout.
+
+Usage: python benchmarks/bench_startup.py [--baseline HEAD~1] [--app path/to/signaura.py] [--repeat 3]
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["Login", "Dashboard", "Learning", "Translator", "Chatbot", "Dictionary", "Profile"]
+HEAVY = ["numpy", "pandas", "PIL.Image"]
+SECRET = "bench-startup"
+
+
+def child(app, page):
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, os.path.dirname(app))
+    from auth import TokenSigner
+
+    before = set(sys.modules)
+    at = AppTest.from_file(app, default_timeout=120)
+    if page != "Login":
+        at.session_state.authenticated = True
+        at.session_state.username = "demo"
+        at.session_state.session_token = TokenSigner(SECRET).issue("demo")
+        at.session_state.current_page = page
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    if at.exception:
+        raise SystemExit(f"{page}: {at.exception[0].message}")
+    imported = set(sys.modules) - before
+    start = time.perf_counter()
+    at.run()
+    second = time.perf_counter() - start
+    print(json.dumps({
+        "first_ms": first * 1000,
+        "second_ms": second * 1000,
+        "modules": len(imported),
+        "heavy": [name for name in HEAVY if name in imported],
+    }))
+
+
+def extract(rev, target):
+    """The tracked files of ``rev`` in ``target``; returns the path of its signaura.py"""
+    archive = subprocess.run(["git", "-C", ROOT, "archive", "--format=tar", rev], check=True,
+                             capture_output=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+    return os.path.join(target, "signaura.py")
+
+
+def measure(app, page, tmp):
+    env = {
+        **os.environ,
+        "SIGNAURA_DB": os.path.join(tmp, "bench.db"),
+        "SIGNAURA_EMBEDDINGS": os.path.join(tmp, "bench.emb"),
+        "SIGNAURA_SECRET_KEY": SECRET,
+    }
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", app, "--page", page],
+        cwd=os.path.dirname(app), env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", action="append", default=[], help="signaura.py of another checkout")
+    parser.add_argument("--baseline", help="git revision to extract and compare against")
+    parser.add_argument("--pages", default=",".join(PAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="fresh processes per page; the median is shown")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--page", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.page)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        apps = {"working tree": os.path.join(ROOT, "signaura.py")}
+        if args.baseline:
+            apps[args.baseline] = extract(args.baseline, os.path.join(tmp, "baseline"))
+        for app in args.app:
+            apps[app] = os.path.abspath(app)
+
+        print(f"{'app':<16}{'page':<12}{'first ms':>10}{'second ms':>11}{'modules':>9}  heavy modules loaded")
+        for name, app in apps.items():
+            for page in args.pages.split(","):
+                runs = [measure(app, page, tmp) for _ in range(args.repeat)]
+                print(f"{name[:15]:<16}{page:<12}{statistics.median(r['first_ms'] for r in runs):>10.0f}"
+                      f"{statistics.median(r['second_ms'] for r in runs):>11.1f}{runs[-1]['modules']:>9}  "
+                      f"{', '.join(runs[-1]['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
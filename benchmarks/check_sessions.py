@@ -0,0 +1,107 @@
+"""Check that a browser session survives moving between app processes.
+
+Starts two ``streamlit run`` workers on different ports that share one
+SQLite session backend, database and secret key, as two replicas behind a
+load balancer without sticky sessions would. The client logs in on worker
+A and advances the alphabet lesson, then reconnects to worker B with the
+session id from its URL and checks that it is still logged in, on the
+Learning page and at the same letter. Finally a client without the
+browser's session cookie opens the same URL, as someone it was pasted to
+would, and must land on the login page. Each step prints its time.
+
+Usage: python benchmarks/check_sessions.py [--app path/to/signaura.py]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from websockets.sync.client import connect
+
+from bench_fragments import ROOT, Session, free_port, wait_for_server
+
+
+def start_worker(app, port, env):
+    return subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app,
+         "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+         "--server.enableXsrfProtection", "false", "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=os.path.dirname(app), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def lesson_heading(session):
+    return next((body for body in session.markdown if body.startswith("### Learning:")), None)
+
+
+def step(name, started):
+    print(f"{name:<40}{(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "signaura.py"))
+    args = parser.parse_args()
+    app = os.path.abspath(args.app)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env.update({
+            "SIGNAURA_DB": os.path.join(tmp, "app.db"),
+            "SIGNAURA_SESSION_BACKEND": "sqlite:///" + os.path.join(tmp, "sessions.db"),
+            "SIGNAURA_SECRET_KEY": "check-secret",
+            "SIGNAURA_MEDIA_URL": "http://127.0.0.1:9",
+            "SIGNAURA_MEDIA_ROOT": os.path.join(tmp, "media"),
+            "SIGNAURA_SESSION_COOKIE": "signaura_browser",
+        })
+        browser = {"Cookie": "signaura_browser=check-browser"}
+        ports = [free_port(), free_port()]
+        workers = [start_worker(app, port, env) for port in ports]
+        try:
+            for port, process in zip(ports, workers):
+                wait_for_server(port, process)
+
+            with connect(f"ws://127.0.0.1:{ports[0]}/_stcore/stream", max_size=None, additional_headers=browser) as ws:
+                session = Session(ws)
+                started = time.perf_counter()
+                session.rerun()
+                session.click("Demo Login")
+                session.click("nav_Learning")
+                session.click("alphabet_next")
+                session.click("alphabet_next")
+                step("worker A: login, open lesson, 2 clicks", started)
+                before = lesson_heading(session)
+                query_string = session.query_string
+
+            with connect(f"ws://127.0.0.1:{ports[1]}/_stcore/stream", max_size=None, additional_headers=browser) as ws:
+                session = Session(ws, query_string)
+                started = time.perf_counter()
+                session.rerun()
+                step("worker B: first run of the session", started)
+                after = lesson_heading(session)
+
+            with connect(f"ws://127.0.0.1:{ports[1]}/_stcore/stream", max_size=None) as ws:
+                session = Session(ws, query_string)
+                session.rerun()
+                pasted = any("Welcome to Signaura" in body for body in session.markdown)
+        finally:
+            for process in workers:
+                process.terminate()
+                process.wait(timeout=10)
+
+    print(f"worker A: {before}")
+    print(f"worker B: {after}")
+    print(f"pasted URL, other browser: {'login page' if pasted else 'logged in'}")
+    if not query_string.startswith("sid=") or before is None or after != before:
+        sys.exit("session state did not survive the move to another worker")
+    if not pasted:
+        sys.exit("a pasted session URL logged another browser in")
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
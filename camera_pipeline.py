@@ -0,0 +1,422 @@
+"""Streaming live-camera recognition pipeline.
+
+    frame source -> bounded latest-frame queue -> motion/hand gate
+                 -> recognizer -> temporal smoothing
+
+The capture thread never waits for the recognizer: when the queue is full the
+oldest frame is dropped, and frames older than ``max_frame_age`` are skipped
+on the way out, so the pipeline always works on what the camera sees now.
+Inference only runs on frames where the gate fires.
+
+Frame sources yield ``(timestamp, frame)`` pairs where ``frame`` is an
+``(H, W, 3)`` uint8 RGB array. The app feeds ``BrowserFrameSource`` from the
+visitor's camera stream; ``SyntheticFrameSource`` and
+``VideoFileFrameSource`` make the whole pipeline testable offline.
+"""
+
+import threading
+import time
+from collections import Counter, deque, namedtuple
+
+import numpy as np
+
+SmoothedPrediction = namedtuple("SmoothedPrediction", ["label", "confidence", "votes"])
+
+STAGES = ("capture", "queue_wait", "gate", "inference", "smoothing")
+
+# Longest pause after the recognizer asks to retry later, in seconds
+MAX_THROTTLE_WAIT = 5.0
+
+
+# Frame sources
+class SyntheticFrameSource:
+    """Generates frames with a moving "hand" blob during active segments.
+
+    Frames alternate between ``still_frames`` of static background and
+    ``active_frames`` where a skin-coloured square moves across the image,
+    so the gate has both kinds of input to tell apart.
+    """
+
+    def __init__(self, frames=300, width=320, height=240, fps=30, active_frames=30, still_frames=30,
+                 realtime=False, seed=0):
+        self.frames = frames
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.active_frames = active_frames
+        self.still_frames = still_frames
+        self.realtime = realtime
+        self._rng = np.random.default_rng(seed)
+
+    def __iter__(self):
+        background = self._rng.integers(40, 80, (self.height, self.width, 3), dtype=np.uint8)
+        size = min(self.width, self.height) // 4
+        period = self.active_frames + self.still_frames
+        start = time.monotonic()
+        for i in range(self.frames):
+            if self.realtime:
+                delay = start + i / self.fps - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            frame = background.copy()
+            phase = i % period
+            if phase < self.active_frames:
+                x = int((self.width - size) * phase / max(self.active_frames - 1, 1))
+                y = (self.height - size) // 2
+                frame[y:y + size, x:x + size] = (224, 172, 140)
+            yield time.monotonic(), frame
+
+
+class BrowserFrameSource:
+    """Frames pushed from the visitor's browser, e.g. by a WebRTC frame callback.
+
+    ``push`` never blocks the caller and keeps only the newest frame.
+    Iteration ends on ``close`` or after ``idle_timeout`` seconds without a
+    frame, which is what happens when the tab is closed or the stream is
+    stopped, so an abandoned pipeline winds down on its own.
+    """
+
+    def __init__(self, idle_timeout=10.0):
+        self.idle_timeout = idle_timeout
+        self._cond = threading.Condition()
+        self._frame = None
+        self._closed = False
+
+    def push(self, frame):
+        with self._cond:
+            self._frame = (time.monotonic(), frame)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __iter__(self):
+        while True:
+            with self._cond:
+                if not self._cond.wait_for(lambda: self._frame is not None or self._closed, self.idle_timeout):
+                    return
+                if self._closed:
+                    return
+                item, self._frame = self._frame, None
+            yield item
+
+
+class VideoFileFrameSource:
+    """Reads frames from a local video file (requires OpenCV)"""
+
+    def __init__(self, path, realtime=False, max_frames=None):
+        self.path = path
+        self.realtime = realtime
+        self.max_frames = max_frames
+
+    def __iter__(self):
+        return _iter_capture(self.path, self.realtime, self.max_frames)
+
+
+class CameraFrameSource:
+    """Reads frames from a local webcam device (requires OpenCV)"""
+
+    def __init__(self, device=0, max_frames=None):
+        self.device = device
+        self.max_frames = max_frames
+
+    def __iter__(self):
+        return _iter_capture(self.device, False, self.max_frames)
+
+
+def _iter_capture(target, realtime, max_frames):
+    try:
+        import cv2
+    except ImportError as exc:
+        raise ImportError("Reading video files or cameras requires opencv-python") from exc
+
+    capture = cv2.VideoCapture(target)
+    if not capture.isOpened():
+        raise IOError(f"Could not open video source {target!r}")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    start = time.monotonic()
+    count = 0
+    try:
+        while max_frames is None or count < max_frames:
+            ok, frame = capture.read()
+            if not ok:
+                return
+            if realtime:
+                delay = start + count / fps - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            count += 1
+            yield time.monotonic(), cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    finally:
+        capture.release()
+
+
+# Pipeline stages
+class LatestFrameQueue:
+    """Bounded queue that drops the oldest frame instead of blocking the producer"""
+
+    def __init__(self, maxsize=2):
+        self._items = deque()
+        self._maxsize = maxsize
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the next item, or None once the queue is closed and drained"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            return self._items.popleft() if self._items else None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class MotionGate:
+    """Cheap motion and hand-presence check on a downscaled frame.
+
+    Fires when at least ``motion_fraction`` of the pixels changed by more
+    than ``pixel_delta`` (0-255 scale) since the previous frame and, if
+    ``min_skin_fraction`` is set, enough pixels fall in a simple YCrCb
+    skin-tone range.
+    """
+
+    def __init__(self, pixel_delta=25.0, motion_fraction=0.005, min_skin_fraction=0.0, downscale=4):
+        self.pixel_delta = pixel_delta
+        self.motion_fraction = motion_fraction
+        self.min_skin_fraction = min_skin_fraction
+        self.downscale = downscale
+        self._reference = None
+
+    def __call__(self, frame):
+        small = frame[::self.downscale, ::self.downscale, :3].astype(np.float32)
+        gray = small @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        reference, self._reference = self._reference, gray
+        if reference is None or reference.shape != gray.shape:
+            return False
+        if float((np.abs(gray - reference) > self.pixel_delta).mean()) < self.motion_fraction:
+            return False
+        if self.min_skin_fraction <= 0:
+            return True
+        r, g, b = small[..., 0], small[..., 1], small[..., 2]
+        cr = 128 + 0.5 * r - 0.4187 * g - 0.0813 * b
+        cb = 128 - 0.1687 * r - 0.3313 * g + 0.5 * b
+        skin = (cr >= 133) & (cr <= 173) & (cb >= 77) & (cb <= 127)
+        return float(skin.mean()) >= self.min_skin_fraction
+
+
+class PredictionSmoother:
+    """Majority vote over the last ``window`` predictions"""
+
+    def __init__(self, window=5, min_votes=3):
+        self.min_votes = min_votes
+        self._recent = deque(maxlen=window)
+
+    def update(self, prediction):
+        self._recent.append(prediction)
+        votes = Counter(p.label for p in self._recent)
+        label, count = votes.most_common(1)[0]
+        if count < self.min_votes:
+            return None
+        confidence = sum(p.confidence for p in self._recent if p.label == label) / count
+        return SmoothedPrediction(label, round(confidence, 1), count)
+
+    def reset(self):
+        self._recent.clear()
+
+
+class StageStats:
+    """Per-stage latency samples and frame counters"""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._latency = {stage: deque(maxlen=window) for stage in STAGES}
+        self.counters = Counter()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self._latency[stage].append(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def snapshot(self):
+        """Counters plus p50/p95 latency in milliseconds for each stage"""
+        with self._lock:
+            report = {"counters": dict(self.counters), "latency_ms": {}}
+            for stage, samples in self._latency.items():
+                if samples:
+                    values = np.fromiter(samples, dtype=np.float64) * 1000
+                    report["latency_ms"][stage] = {
+                        "p50": round(float(np.percentile(values, 50)), 3),
+                        "p95": round(float(np.percentile(values, 95)), 3),
+                        "n": len(values),
+                    }
+        return report
+
+
+class StreamingRecognizer:
+    """Runs a frame source through the gated recognition pipeline on two threads.
+
+    ``recognize`` takes one frame and returns an object with ``label`` and
+    ``confidence`` (for example ``InferenceService.predict``). A failed
+    recognition skips its frame, backs off briefly and is counted in
+    ``recognize_errors``; only ``max_errors`` failures in a row stop the
+    pipeline with a fatal ``error``, like a failed capture does. A
+    recognizer that turns a frame away with a ``retry_after`` (admission
+    control) is not failing: the pipeline skips frames for that long and
+    counts them as ``throttled``.
+    """
+
+    def __init__(self, source, recognize, gate=None, smoother=None, queue_size=2, max_frame_age=0.5,
+                 max_errors=10, error_backoff=0.05):
+        self.source = source
+        self.recognize = recognize
+        self.gate = gate or MotionGate()
+        self.smoother = smoother or PredictionSmoother()
+        self.max_frame_age = max_frame_age
+        self.max_errors = max_errors
+        self.error_backoff = error_backoff
+        self.stats = StageStats()
+        self._queue = LatestFrameQueue(queue_size)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._latest = None
+        self._error = None
+        self._last_recognize_error = None
+        self._threads = []
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="signaura-capture", daemon=True),
+            threading.Thread(target=self._process_loop, name="signaura-recognize", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._queue.close()
+        # Wake a capture thread waiting on a push-based source
+        close = getattr(self.source, "close", None)
+        if close is not None:
+            close()
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def error(self):
+        """Fatal error that stopped the pipeline, or None"""
+        return self._error
+
+    @property
+    def last_recognize_error(self):
+        """Most recent transient recognizer failure, or None"""
+        return self._last_recognize_error
+
+    def latest(self):
+        """Most recent smoothed prediction, or None"""
+        with self._lock:
+            return self._latest
+
+    def report(self):
+        report = self.stats.snapshot()
+        report["counters"]["dropped_queue_full"] = self._queue.dropped
+        return report
+
+    def _capture_loop(self):
+        try:
+            iterator = iter(self.source)
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                try:
+                    captured_at, frame = next(iterator)
+                except StopIteration:
+                    break
+                self.stats.record("capture", time.perf_counter() - start)
+                self.stats.count("frames_in")
+                self._queue.put((captured_at, time.perf_counter(), frame))
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._queue.close()
+
+    def _process_loop(self):
+        failures = 0
+        while not self._stop.is_set():
+            item = self._queue.get(timeout=0.1)
+            if item is None:
+                if self._queue.closed:
+                    return
+                continue
+            captured_at, queued_at, frame = item
+            self.stats.record("queue_wait", time.perf_counter() - queued_at)
+            if time.monotonic() - captured_at > self.max_frame_age:
+                self.stats.count("dropped_stale")
+                continue
+
+            start = time.perf_counter()
+            fired = self.gate(frame)
+            self.stats.record("gate", time.perf_counter() - start)
+            if not fired:
+                self.stats.count("gated_out")
+                continue
+
+            start = time.perf_counter()
+            try:
+                prediction = self.recognize(frame)
+            except Exception as exc:
+                retry_after = getattr(exc, "retry_after", None)
+                if retry_after is not None:
+                    self.stats.count("throttled")
+                    self._stop.wait(min(max(retry_after, self.error_backoff), MAX_THROTTLE_WAIT))
+                    continue
+                failures += 1
+                self._last_recognize_error = exc
+                self.stats.count("recognize_errors")
+                if failures >= self.max_errors:
+                    self._error = RuntimeError(f"recognition failed {failures} times in a row: {exc}")
+                    self.stop()
+                    return
+                # Frames that arrive meanwhile are dropped by the latest-frame queue
+                self._stop.wait(min(self.error_backoff * 2 ** (failures - 1), 1.0))
+                continue
+            failures = 0
+            self.stats.record("inference", time.perf_counter() - start)
+            self.stats.count("inferred")
+
+            start = time.perf_counter()
+            smoothed = self.smoother.update(prediction)
+            self.stats.record("smoothing", time.perf_counter() - start)
+            if smoothed is not None:
+                with self._lock:
+                    self._latest = smoothed
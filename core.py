@@ -0,0 +1,373 @@
+"""Session state and process-wide services shared by the app and its pages.
+
+``signaura.py`` runs as the Streamlit script, so the page modules in
+``views`` cannot import from it; everything more than one page needs
+lives here: session state and its persistence, the database, login
+sessions, the sign dictionary, the event log, sign clips, rerun metrics
+and the recognition service. Modules that pull in numpy are imported
+inside the getters that build their objects.
+"""
+
+import errno
+import hmac
+import logging
+import os
+import re
+from functools import partial, wraps
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from analytics import SESSION_END, SESSION_START, EventLog
+from auth import Authenticator, hash_password
+from dictionary_store import DEFAULT_PATH as BUNDLED_DICTIONARY_PATH, DictionaryStore
+from media_server import MediaLibrary, clip_url, start_in_background
+from metrics import Instrumentation, start_metrics_server
+from session_store import SessionStore, backend_from_url, new_session_id
+from storage import Store, empty_progress
+
+logger = logging.getLogger(__name__)
+
+# Chat messages kept in the session, and shown before "Show earlier messages"
+CHAT_WINDOW = 50
+CHAT_VISIBLE = 20
+
+# Initialize session state
+def init_session_state():
+    """Initialize all session state variables"""
+    if 'authenticated' not in st.session_state:
+        st.session_state.authenticated = False
+    if 'username' not in st.session_state:
+        st.session_state.username = ""
+    if 'session_token' not in st.session_state:
+        st.session_state.session_token = ""
+    if 'current_page' not in st.session_state:
+        st.session_state.current_page = "Login"
+    if 'learning_progress' not in st.session_state:
+        st.session_state.learning_progress = empty_progress()
+    if 'chat_history' not in st.session_state:
+        st.session_state.chat_history = []
+    if 'chat_visible' not in st.session_state:
+        st.session_state.chat_visible = CHAT_VISIBLE
+    if 'theme' not in st.session_state:
+        st.session_state.theme = "light"
+    if 'video_quality' not in st.session_state:
+        st.session_state.video_quality = "auto"
+
+# Session state shared by all app processes: memory, sqlite:///path or redis://host:port/db.
+# Sessions move between processes only with a shared backend and SIGNAURA_SECRET_KEY set.
+SESSION_BACKEND = os.environ.get("SIGNAURA_SESSION_BACKEND", "memory")
+PERSISTED_SESSION_KEYS = ('authenticated', 'username', 'session_token', 'session_binding', 'current_page',
+                          'learning_progress', 'chat_history', 'chat_visible', 'theme', 'video_quality')
+# Kept when saved state can't log this browser in
+SETTINGS_SESSION_KEYS = ('theme', 'video_quality')
+SESSION_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{16,64}")
+# Cookie that ties a restored login to the browser it was made in, e.g. an HttpOnly cookie set by the
+# proxy in front of the app. Logins only survive a reload or a move to another process when it is set;
+# without it a session id in the URL carries nothing but display settings.
+SESSION_COOKIE = os.environ.get("SIGNAURA_SESSION_COOKIE", "")
+
+@st.cache_resource(show_spinner=False)
+def get_session_store():
+    return SessionStore(backend_from_url(SESSION_BACKEND))
+
+def restore_session():
+    """On the first run of a browser session, pick up its saved state by the id in the URL"""
+    if 'session_snapshot' in st.session_state:
+        return
+    sid = st.query_params.get("sid", "")
+    if not SESSION_ID_PATTERN.fullmatch(sid):
+        sid = new_session_id()
+        st.query_params["sid"] = sid
+    values, snapshot = get_session_store().load(sid)
+    if not login_restorable(values):
+        # Unbound, expired or forged login, or a session id carried to another browser:
+        # start over logged out under a new id, keeping only the display settings
+        sid = new_session_id()
+        st.query_params["sid"] = sid
+        values = {key: values[key] for key in SETTINGS_SESSION_KEYS if key in values}
+        snapshot = {}
+    for key in PERSISTED_SESSION_KEYS:
+        if key in values:
+            st.session_state[key] = values[key]
+    st.session_state.session_sid = sid
+    st.session_state.session_snapshot = snapshot
+
+def browser_binding():
+    """Keyed hash of this browser's SESSION_COOKIE, or "" when there is nothing to bind to"""
+    cookie = st.context.cookies.get(SESSION_COOKIE, "") if SESSION_COOKIE else ""
+    return get_authenticator().fingerprint(cookie) if cookie else ""
+
+def login_restorable(values):
+    """Whether saved state may be restored here: a login needs a valid token and this browser's cookie"""
+    if not values.get('authenticated'):
+        return True  # logged out: end_session has cleared everything private
+    if not SESSION_COOKIE:
+        return False
+    if get_authenticator().check_token(values.get('session_token', "")) != values.get('username'):
+        return False
+    binding = browser_binding()
+    return bool(binding) and hmac.compare_digest(binding, values.get('session_binding', ""))
+
+def rotate_session_id():
+    """Move the session to a fresh id, so a shared link can't carry a login"""
+    st.session_state.session_sid = new_session_id()
+    st.session_state.session_snapshot = {}
+    st.query_params["sid"] = st.session_state.session_sid
+
+def save_session():
+    """Write back only the persisted fields this run changed"""
+    if 'session_snapshot' not in st.session_state:
+        return
+    values = {key: st.session_state[key] for key in PERSISTED_SESSION_KEYS if key in st.session_state}
+    st.session_state.session_snapshot = get_session_store().save(
+        st.session_state.session_sid, values, st.session_state.session_snapshot)
+
+def fragment(func=None, *, run_every=None):
+    """st.fragment that is instrumented and saves the session after a fragment-only rerun
+
+    A full rerun times the fragment as a section of its page; a
+    fragment-only rerun never reaches main(), so it is tracked as a rerun
+    of its own, labelled "<page>:<fragment>".
+    """
+    def decorate(func):
+        @wraps(func)
+        def run(*args, **kwargs):
+            ctx = get_script_run_ctx()
+            if ctx is None or not ctx.fragment_ids_this_run:
+                with get_instrumentation().section(f"fragment:{func.__name__}"):
+                    return func(*args, **kwargs)
+            label = f"{st.session_state.get('current_page', '')}:{func.__name__}"
+            with get_instrumentation().track(label, ctx):
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    save_session()
+        return st.fragment(run, run_every=run_every)
+    return decorate if func is None else decorate(func)
+
+# Seed accounts, inserted into the database on first start
+USERS_DB = {
+    "demo": {"password": "demo123", "email": "demo@signaura.com"},
+    "user1": {"password": "pass123", "email": "user1@example.com"}
+}
+
+# Sign dictionary: a JSON Lines data file, reloaded when it changes on disk
+DICTIONARY_PATH = os.environ.get("SIGNAURA_DICTIONARY", BUNDLED_DICTIONARY_PATH)
+DICTIONARY_RELOAD_INTERVAL = float(os.environ.get("SIGNAURA_DICTIONARY_RELOAD", "2"))
+
+@st.cache_resource(show_spinner=False)
+def get_dictionary_store():
+    return DictionaryStore(DICTIONARY_PATH, check_interval=DICTIONARY_RELOAD_INTERVAL)
+
+def sign_dictionary():
+    """The current sign dictionary; every reader goes through this"""
+    return get_dictionary_store().current()
+
+# Recognition service settings
+INFERENCE_BATCH_SIZE = int(os.environ.get("SIGNAURA_BATCH_SIZE", "8"))
+INFERENCE_BATCH_DELAY_MS = float(os.environ.get("SIGNAURA_BATCH_DELAY_MS", "10"))
+INFERENCE_WORKERS = int(os.environ.get("SIGNAURA_INFERENCE_WORKERS", "2"))
+INFERENCE_TIMEOUT = 30
+# Reference embeddings of the dictionary signs, sample images per <category>/<sign>/, candidates shown
+EMBEDDINGS_PATH = os.environ.get("SIGNAURA_EMBEDDINGS", DICTIONARY_PATH + ".emb")
+REFERENCES_DIR = os.environ.get("SIGNAURA_REFERENCES", "")
+RECOGNIZE_TOP_K = int(os.environ.get("SIGNAURA_TOP_K", "3"))
+# Model runtime: int8 weights, warm-up rounds before serving, BLAS threads per matrix product
+# (0 = library default); batches running at once are SIGNAURA_INFERENCE_WORKERS
+MODEL_INPUT_SIZE = (64, 64)
+MODEL_INT8 = os.environ.get("SIGNAURA_MODEL_INT8", "") not in ("", "0")
+MODEL_WARMUP_RUNS = int(os.environ.get("SIGNAURA_MODEL_WARMUP_RUNS", "3"))
+INTRA_OP_THREADS = int(os.environ.get("SIGNAURA_INTRA_OP_THREADS", "0"))
+
+def load_recognition_model(dictionaries):
+    """Embedder plus the reference index of the current dictionary"""
+    from embedding_index import EmbeddingStore, NearestSignModel
+    from inference import DummySignModel
+
+    embedder = DummySignModel([], input_size=MODEL_INPUT_SIZE)
+    if MODEL_INT8:
+        embedder = embedder.quantize_int8()
+    embeddings = EmbeddingStore(EMBEDDINGS_PATH, embedder, references=REFERENCES_DIR or None)
+    return NearestSignModel(embedder, lambda: embeddings.current(dictionaries.current()), k=RECOGNIZE_TOP_K)
+
+@st.cache_resource(show_spinner=False)
+def get_inference_service():
+    """One recognition service per process, shared by every session; the model loads in the background"""
+    from model_runtime import ModelRuntime
+
+    # Started before anything here imports numpy, so the BLAS thread limit can still go through the environment
+    runtime = ModelRuntime(
+        partial(load_recognition_model, get_dictionary_store()),
+        MODEL_INPUT_SIZE,
+        warmup_runs=MODEL_WARMUP_RUNS,
+        intra_op_threads=INTRA_OP_THREADS,
+    ).start()
+    from inference import InferenceService
+
+    return InferenceService(
+        runtime,
+        max_batch_size=INFERENCE_BATCH_SIZE,
+        max_delay_ms=INFERENCE_BATCH_DELAY_MS,
+        workers=INFERENCE_WORKERS,
+    )
+
+def stop_live_recognition():
+    """Stop this session's live camera pipeline, if any: on leaving the Translator and on logout"""
+    pipeline = st.session_state.pop("live_pipeline", None)
+    if pipeline is not None:
+        pipeline.stop()
+
+DATABASE_PATH = os.environ.get("SIGNAURA_DB", "signaura.db")
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    """Process-wide database handle with its connection pool and write-behind queue"""
+    store = Store(DATABASE_PATH)
+    for username, info in USERS_DB.items():
+        if store.get_user(username) is None:
+            store.create_user(username, info["email"], hash_password(info["password"]))
+    return store
+
+@st.cache_resource(show_spinner=False)
+def get_authenticator():
+    """Shared login service: bounded hashing pool and session-token signer"""
+    return Authenticator(get_store(), secret=os.environ.get("SIGNAURA_SECRET_KEY"))
+
+def start_session(username, token):
+    st.session_state.authenticated = True
+    st.session_state.username = username
+    st.session_state.session_token = token
+    st.session_state.session_binding = browser_binding()
+    rotate_session_id()
+    load_user_state(username)
+    log_event(SESSION_START)
+    st.session_state.current_page = "Dashboard"
+
+def end_session():
+    stop_live_recognition()
+    if st.session_state.authenticated:
+        log_event(SESSION_END)
+    st.session_state.authenticated = False
+    st.session_state.username = ""
+    st.session_state.session_token = ""
+    st.session_state.session_binding = ""
+    st.session_state.learning_progress = empty_progress()
+    st.session_state.chat_history = []
+    st.session_state.chat_visible = CHAT_VISIBLE
+    st.session_state.current_page = "Login"
+
+def check_session():
+    """Cheap per-rerun check of the signed session token instead of the password"""
+    if st.session_state.authenticated:
+        if get_authenticator().check_token(st.session_state.session_token) != st.session_state.username:
+            end_session()
+
+def load_user_state(username):
+    """Restore a user's saved progress and chat history into the session"""
+    store = get_store()
+    # Include writes this process queued for the user, e.g. before a logout and back in
+    store.flush()
+    st.session_state.learning_progress = store.load_progress(username)
+    st.session_state.chat_history = store.recent_chat(username, limit=CHAT_WINDOW)
+    st.session_state.chat_visible = CHAT_VISIBLE
+    review_scheduler(username)
+
+# Seconds a process trusts its in-memory copy of a user's reviews, stats and translation history
+# before reading them again, so changes made through other app processes show up
+USER_CACHE_TTL = float(os.environ.get("SIGNAURA_USER_CACHE_TTL", "30"))
+
+# Spaced repetition: review state of every user in one scheduler
+@st.cache_resource(show_spinner=False)
+def get_scheduler():
+    from srs import ReviewScheduler
+
+    return ReviewScheduler()
+
+def review_scheduler(username):
+    """The shared scheduler, with this user's saved reviews loaded"""
+    scheduler = get_scheduler()
+    if not scheduler.is_loaded(username, max_age=USER_CACHE_TTL):
+        store = get_store()
+        # This process's queued reviews first, so the reload includes them
+        store.flush()
+        scheduler.load_user(username, store.load_reviews(username), replace=True)
+    return scheduler
+
+# Learning events, rolled up into daily and per-user stats as they arrive
+@st.cache_resource(show_spinner=False)
+def get_event_log():
+    return EventLog(get_store(), max_age=USER_CACHE_TTL)
+
+def log_event(kind, category=None, sign=None):
+    ctx = get_script_run_ctx()
+    session = ctx.session_id if ctx is not None else ""
+    get_event_log().record(st.session_state.username, session, kind, category, sign)
+
+def user_stats():
+    return get_event_log().stats(st.session_state.username)
+
+def streak_label(days):
+    return f"{days} day{'s' if days != 1 else ''}"
+
+# Sign clips are served by the media server, never through the Streamlit server: an external
+# one at SIGNAURA_MEDIA_URL, or one started next to the app on MEDIA_HOST:MEDIA_PORT that
+# browsers reach at SIGNAURA_MEDIA_PUBLIC_URL (e.g. behind a reverse proxy)
+MEDIA_ROOT = os.environ.get("SIGNAURA_MEDIA_ROOT", "media")
+MEDIA_BASE_URL = os.environ.get("SIGNAURA_MEDIA_URL", "")
+MEDIA_HOST = os.environ.get("SIGNAURA_MEDIA_HOST", "127.0.0.1")
+MEDIA_PORT = int(os.environ.get("SIGNAURA_MEDIA_PORT", "8502"))
+MEDIA_PUBLIC_URL = os.environ.get("SIGNAURA_MEDIA_PUBLIC_URL", f"http://localhost:{MEDIA_PORT}")
+VIDEO_QUALITIES = ["auto", "240p", "480p", "720p"]
+
+@st.cache_resource(show_spinner=False)
+def get_media_base_url():
+    """Configured media server, or one started next to the app on first use"""
+    if MEDIA_BASE_URL:
+        return MEDIA_BASE_URL
+    try:
+        start_in_background(MEDIA_ROOT, MEDIA_HOST, MEDIA_PORT)
+    except OSError as exc:
+        if exc.errno != errno.EADDRINUSE:
+            logger.error("Could not start the media server on %s:%d: %s", MEDIA_HOST, MEDIA_PORT, exc)
+            raise
+        # Normally another app process on this host, already serving MEDIA_ROOT
+        logger.warning("Media port %s:%d is in use; assuming another app process serves %s there",
+                       MEDIA_HOST, MEDIA_PORT, MEDIA_ROOT)
+    return MEDIA_PUBLIC_URL
+
+@st.cache_resource(show_spinner=False)
+def get_media_library():
+    return MediaLibrary(MEDIA_ROOT)
+
+@st.cache_data(show_spinner=False, ttl=60)
+def clip_available(video_url):
+    return bool(get_media_library().available(video_url))
+
+def sign_clip_url(video_url):
+    """Media server URL for a sign clip, or None when the clip hasn't been published"""
+    if not video_url or not (MEDIA_BASE_URL or clip_available(video_url)):
+        return None
+    return clip_url(get_media_base_url(), video_url, st.session_state.video_quality)
+
+# Rerun instrumentation, off unless SIGNAURA_METRICS is set
+METRICS_ENABLED = os.environ.get("SIGNAURA_METRICS", "") not in ("", "0")
+METRICS_PORT = int(os.environ.get("SIGNAURA_METRICS_PORT", "0"))
+METRICS_LOG_INTERVAL = float(os.environ.get("SIGNAURA_METRICS_LOG_INTERVAL", "0"))
+PROFILE_SAMPLE_RATE = float(os.environ.get("SIGNAURA_PROFILE_SAMPLE", "0"))
+PROFILE_SLOW_MS = float(os.environ.get("SIGNAURA_PROFILE_SLOW_MS", "500"))
+PROFILE_DIR = os.environ.get("SIGNAURA_PROFILE_DIR", "")
+
+@st.cache_resource(show_spinner=False)
+def get_instrumentation():
+    """Process-wide rerun metrics, with a /metrics endpoint when a port is set"""
+    instrumentation = Instrumentation(
+        enabled=METRICS_ENABLED,
+        profile_sample=PROFILE_SAMPLE_RATE,
+        slow_ms=PROFILE_SLOW_MS,
+        profile_dir=PROFILE_DIR or None,
+        log_interval=METRICS_LOG_INTERVAL,
+    )
+    if METRICS_ENABLED and METRICS_PORT:
+        start_metrics_server(instrumentation, MEDIA_HOST, METRICS_PORT)
+    return instrumentation
@@ -0,0 +1,314 @@
+"""Sign dictionary data store.
+
+The dictionary lives in a JSON Lines data file rather than in the code. The
+first line is a header, then one record per sign, with the records of a
+category kept together in display order:
+
+    {"format": "signaura-dictionary", "version": 2}
+    {"category": "alphabets", "sign": "A", "video_url": "placeholder_a.mp4", "description": "Letter A in ASL"}
+
+Next to it sits a binary index, ``<file>.idx``: the category table and one
+uint64 byte offset per record. It is built on first open, rebuilt whenever
+the data file changes, and memory-mapped together with the data file, so:
+
+* opening a dictionary parses neither file,
+* ``count`` and ``entry_at`` (the n-th sign of a category) touch one line,
+* a category's signs are parsed only the first time the category is read,
+* ``DictionaryStore.current()`` notices a changed file and swaps in a new
+  dictionary without restarting the server.
+
+Usage:
+
+    python dictionary_store.py convert signs.json data/dictionary.jsonl --version 3
+    python dictionary_store.py index data/dictionary.jsonl
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+FORMAT = "signaura-dictionary"
+# The dictionary shipped with the app, wherever it is run from
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "dictionary.jsonl")
+INDEX_MAGIC = b"SGNIDX1\n"
+# Start of a record line; write_dictionary puts the category first, so the
+# scan rarely needs to parse a whole record
+_RECORD_START = re.compile(rb'^(?=[^\s])(?:\{"category": ("(?:[^"\\]|\\.)*"))?', re.MULTILINE)
+_INDEX_PREFIX = struct.Struct("<8sQ")
+# What reading a truncated or corrupt data file or index sidecar raises; a bad index is rebuilt
+_CORRUPT_FILE_ERRORS = (OSError, ValueError, TypeError, KeyError, IndexError, struct.error)
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _atomic_write(path, chunks):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class SignDictionary(Mapping):
+    """Read-only ``{category: {sign: data}}`` view of a data file, loaded lazily"""
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.stat_key = (stat.st_size, stat.st_mtime_ns)
+        self._data = _map(path)
+        end = self._data.find(b"\n")
+        header = json.loads(self._data[:end if end >= 0 else len(self._data)] or b"{}")
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} file")
+        self.data_version = header.get("version", 0)
+        # Changes with the declared version and with any rewrite of the file
+        self.version = f"{self.data_version}-{stat.st_mtime_ns}"
+
+        self._categories, self._offsets = self._open_index()
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    # Mapping interface: the categories
+    def __getitem__(self, category):
+        signs = self._loaded.get(category)
+        if signs is None:
+            first, count = self._categories[category]
+            with self._lock:
+                signs = self._loaded.get(category)
+                if signs is None:
+                    signs = self._parse_range(first, count)
+                    self._loaded[category] = signs
+        return signs
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self):
+        return len(self._categories)
+
+    @property
+    def categories(self):
+        return list(self._categories)
+
+    def count(self, category=None):
+        """Signs in a category, or in the whole dictionary, without parsing any"""
+        if category is None:
+            return len(self._offsets)
+        return self._categories.get(category, (0, 0))[1]
+
+    def entry_at(self, category, position):
+        """(sign, data) at a position within a category, parsing just that record"""
+        first, count = self._categories[category]
+        if not 0 <= position < count:
+            raise IndexError(position)
+        if category in self._loaded:
+            sign, _ = self._record(first + position)
+            return sign, self._loaded[category][sign]
+        return self._record(first + position)
+
+    def entry(self, category, sign):
+        """Data for one sign, or None"""
+        if category not in self._categories:
+            return None
+        return self[category].get(sign)
+
+    def is_loaded(self, category):
+        return category in self._loaded
+
+    def _parse_range(self, first, count):
+        """Parse a run of records with a single json.loads call"""
+        if not count:
+            return {}
+        start = self._offsets[first]
+        last = first + count
+        end = self._offsets[last] if last < len(self._offsets) else len(self._data)
+        lines = [line for line in self._data[start:end].split(b"\n") if line.strip()]
+        signs = {}
+        for data in json.loads(b"[" + b",".join(lines) + b"]"):
+            data.pop("category", None)
+            signs[data.pop("sign")] = data
+        return signs
+
+    def _record(self, i):
+        start = self._offsets[i]
+        end = self._offsets[i + 1] if i + 1 < len(self._offsets) else len(self._data)
+        data = json.loads(self._data[start:end])
+        data.pop("category", None)
+        return data.pop("sign"), data
+
+    def _open_index(self):
+        index_path = self.path + ".idx"
+        try:
+            loaded = self._read_index(index_path)
+        except FileNotFoundError:
+            loaded = None
+        except _CORRUPT_FILE_ERRORS:
+            logger.warning("Dictionary index %s is corrupt; rebuilding it", index_path, exc_info=True)
+            loaded = None
+        if loaded is not None:
+            return loaded
+
+        categories, offsets = self._scan()
+        header = json.dumps({
+            "size": self.stat_key[0],
+            "mtime_ns": self.stat_key[1],
+            "byteorder": sys.byteorder,
+            "categories": [[name, first, count] for name, (first, count) in categories.items()],
+        }).encode("utf-8")
+        padding = b" " * (-(_INDEX_PREFIX.size + len(header)) % 8)
+        try:
+            _atomic_write(index_path, [_INDEX_PREFIX.pack(INDEX_MAGIC, len(header) + len(padding)),
+                                       header, padding, offsets.tobytes()])
+        except OSError:
+            logger.warning("Could not write dictionary index %s; using it from memory", index_path)
+        return categories, offsets
+
+    def _read_index(self, index_path):
+        """Map an index that matches the data file, or return None"""
+        mapped = _map(index_path)
+        magic, header_size = _INDEX_PREFIX.unpack_from(mapped, 0)
+        if magic != INDEX_MAGIC:
+            return None
+        if _INDEX_PREFIX.size + header_size > len(mapped):
+            raise ValueError("index header is truncated")
+        header = json.loads(mapped[_INDEX_PREFIX.size:_INDEX_PREFIX.size + header_size])
+        if (header["size"], header["mtime_ns"]) != self.stat_key or header["byteorder"] != sys.byteorder:
+            return None
+        offsets = memoryview(mapped)[_INDEX_PREFIX.size + header_size:].cast("Q")
+        categories = {name: (int(first), int(count)) for name, first, count in header["categories"]}
+        # The category table must tile the offsets, and the offsets must point into the data
+        position = 0
+        for first, count in sorted(categories.values()):
+            if first != position:
+                raise ValueError("index category table has gaps or overlaps")
+            position += count
+        if position != len(offsets) or (position and offsets[-1] >= len(self._data)):
+            raise ValueError("index does not match its category table")
+        return categories, offsets
+
+    def _scan(self):
+        """One pass over the data file collecting record offsets per category"""
+        data = self._data
+        categories = {}
+        offsets = array("Q")
+        current_raw = current = None
+        header_end = data.find(b"\n") + 1 if data else 0
+        if header_end:
+            # Every non-blank line after the header is a record
+            for match in _RECORD_START.finditer(data, header_end):
+                raw = match.group(1)
+                if raw is None or raw != current_raw:
+                    if raw is not None:
+                        category = json.loads(raw)
+                    else:
+                        end = data.find(b"\n", match.start())
+                        category = json.loads(data[match.start():end if end >= 0 else len(data)])["category"]
+                    if category != current:
+                        if category in categories:
+                            raise ValueError(f"{self.path}: records of {category!r} are not contiguous")
+                        categories[category] = [len(offsets), 0]
+                        current = category
+                    current_raw = raw
+                categories[current][1] += 1
+                offsets.append(match.start())
+        return {name: tuple(entry) for name, entry in categories.items()}, offsets
+
+
+class DictionaryStore:
+    """Hands out the current dictionary, reopening it when the file changes"""
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._current = SignDictionary(path)
+        self._checked = time.monotonic()
+
+    def current(self):
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return self._current
+        with self._lock:
+            if now - self._checked >= self.check_interval:
+                self._checked = now
+                self._reload_if_changed()
+        return self._current
+
+    def _reload_if_changed(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            logger.exception("Dictionary file %s is unavailable; keeping the loaded version", self.path)
+            return
+        if (stat.st_size, stat.st_mtime_ns) == self._current.stat_key:
+            return
+        try:
+            dictionary = SignDictionary(self.path)
+        except _CORRUPT_FILE_ERRORS:
+            logger.exception("Could not reload %s; keeping the loaded version", self.path)
+            return
+        logger.info("Reloaded %s (version %s)", self.path, dictionary.version)
+        self._current = dictionary
+
+
+def write_dictionary(path, dictionary, version=1):
+    """Atomically write a ``{category: {sign: data}}`` mapping as a data file"""
+    def lines():
+        yield json.dumps({"format": FORMAT, "version": version}).encode("utf-8") + b"\n"
+        for category, signs in dictionary.items():
+            for sign, data in signs.items():
+                record = {"category": category, "sign": sign, **data}
+                yield json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    _atomic_write(path, lines())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage Signaura sign dictionary data files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="write a data file from a {category: {sign: data}} JSON file")
+    convert.add_argument("source")
+    convert.add_argument("target")
+    convert.add_argument("--version", type=int, default=1)
+
+    index = commands.add_parser("index", help="build the index of a data file and print its categories")
+    index.add_argument("path")
+
+    args = parser.parse_args(argv)
+    if args.command == "convert":
+        with open(args.source, encoding="utf-8") as f:
+            write_dictionary(args.target, json.load(f), version=args.version)
+        args.path = args.target
+    dictionary = SignDictionary(args.path)
+    print(f"{args.path}: version {dictionary.data_version}, {dictionary.count()} signs")
+    for category in dictionary.categories:
+        print(f"  {category}: {dictionary.count(category)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""Reference-embedding index for nearest-neighbour sign classification.
+
+Every dictionary sign has a few reference embeddings (feature vectors of
+sample images of the sign). A query image is embedded the same way and
+labelled by cosine similarity to the references, so adding a sign to the
+dictionary only adds rows to the index; nothing is retrained.
+
+The index lives next to the dictionary in ``<dictionary>.emb``: a JSON
+header, then L2-normalised vectors as one contiguous float32 matrix and the
+sign of each row, all memory-mapped on open. ``search`` scores a batch of
+queries against the matrix in fixed-size row chunks (one matrix product
+and an ``argpartition`` per chunk). Above ``IVF_THRESHOLD`` rows the
+builder also clusters the vectors (spherical k-means, an inverted file) and
+stores them grouped by cluster, so a query scans only the ``nprobe``
+clusters nearest to it.
+
+References come from ``<references>/<category>/<sign>/*.png|jpg``. Signs
+without sample images get deterministic placeholder vectors, like the
+placeholder clips, until real samples are added. ``EmbeddingStore`` keeps
+the index in step with the dictionary, re-embedding only new signs:
+
+    python embedding_index.py build data/dictionary.jsonl --references references/
+"""
+
+import argparse
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from dictionary_store import _atomic_write
+from inference import Prediction
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SGNEMB1\n"
+_HEADER_LENGTH = struct.Struct("<Q")
+_ALIGN = 64
+
+IVF_THRESHOLD = 100000
+NPROBE = 16
+SAMPLES_PER_SIGN = 4
+# Rows scored per matrix product in an exact search
+CHUNK_ROWS = 65536
+# Neighbours fetched per requested sign, since each sign has several references
+NEIGHBOURS_PER_SIGN = 8
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def placeholder_vectors(category, sign, dim, samples=SAMPLES_PER_SIGN):
+    """Stable stand-in references: a random direction per sign plus small per-sample noise"""
+    rng = np.random.default_rng(zlib.crc32(f"{category}/{sign}".encode("utf-8")))
+    centre = rng.standard_normal(dim)
+    return normalize(centre + 0.3 * rng.standard_normal((samples, dim)))
+
+
+def reference_images(references, category, sign):
+    """RGB arrays of a sign's sample images, or an empty list"""
+    from PIL import Image
+
+    if not references:
+        return []
+    directory = os.path.join(references, category, sign)
+    if not os.path.isdir(directory):
+        return []
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(IMAGE_SUFFIXES):
+            with Image.open(os.path.join(directory, name)) as image:
+                images.append(np.asarray(image.convert("RGB")))
+    return images
+
+
+def train_ivf(vectors, nlist, iterations=10, sample=50000, seed=0):
+    """Centroids of a spherical k-means over (a sample of) normalised vectors"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample:
+        data = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample, replace=False))])
+    else:
+        data = np.asarray(vectors)
+    centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        filled = np.bincount(assign, minlength=nlist) > 0
+        # An empty cluster keeps its old centroid
+        centroids[filled] = normalize(sums[filled])
+    return centroids
+
+
+def assign_lists(vectors, centroids):
+    return np.concatenate([
+        np.argmax(vectors[start:start + CHUNK_ROWS] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), CHUNK_ROWS)
+    ]) if len(vectors) else np.zeros(0, dtype=np.intp)
+
+
+def write_index(path, classes, vectors, row_classes, dictionary_version, embedder_id, placeholders=(),
+                ivf_threshold=IVF_THRESHOLD, nlist=None):
+    """Atomically write an index file; vectors are normalised, and clustered above ``ivf_threshold`` rows"""
+    vectors = normalize(vectors).reshape(len(row_classes), -1)
+    row_classes = np.asarray(row_classes, dtype=np.int32)
+    sections = {"vectors": vectors, "row_classes": row_classes}
+    if len(vectors) > ivf_threshold:
+        centroids = train_ivf(vectors, nlist or int(np.sqrt(len(vectors))))
+        lists = assign_lists(vectors, centroids)
+        order = np.argsort(lists, kind="stable")
+        sections = {
+            "vectors": vectors[order],
+            "row_classes": row_classes[order],
+            "centroids": centroids,
+            "list_offsets": np.searchsorted(lists[order], np.arange(len(centroids) + 1)).astype(np.int64),
+        }
+
+    header = {
+        "dictionary": dictionary_version,
+        "embedder": embedder_id,
+        "dim": int(vectors.shape[1]),
+        "classes": [list(label) for label in classes],
+        "placeholders": sorted(int(i) for i in placeholders),
+        "sections": {},
+    }
+    # Section offsets depend on the header length, so lay out against an upper bound
+    header_bytes = json.dumps(header).encode("utf-8")
+    offset = -(-(len(MAGIC) + _HEADER_LENGTH.size + len(header_bytes) + 256 * len(sections)) // _ALIGN) * _ALIGN
+    for name, array in sections.items():
+        array = np.ascontiguousarray(array)
+        sections[name] = array
+        header["sections"][name] = [offset, array.dtype.str, list(array.shape)]
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    def chunks():
+        yield MAGIC + _HEADER_LENGTH.pack(len(header_bytes)) + header_bytes
+        position = len(MAGIC) + _HEADER_LENGTH.size + len(header_bytes)
+        for name, array in sections.items():
+            start = header["sections"][name][0]
+            yield b"\0" * (start - position)
+            yield memoryview(array).cast("B")
+            position = start + array.nbytes
+
+    _atomic_write(path, chunks())
+
+
+class EmbeddingIndex:
+    """Memory-mapped reference vectors with batched top-k cosine search"""
+
+    def __init__(self, path, nprobe=NPROBE):
+        self.path = path
+        self.nprobe = nprobe
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an embedding index")
+            (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+            header = json.loads(f.read(length))
+        self.dictionary_version = header["dictionary"]
+        self.embedder = header["embedder"]
+        self.dim = header["dim"]
+        self.classes = [tuple(label) for label in header["classes"]]
+        self.placeholders = frozenset(header["placeholders"])
+        arrays = {}
+        for name, (offset, dtype, shape) in header["sections"].items():
+            if np.prod(shape) == 0:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape))
+        self.vectors = arrays["vectors"]
+        self.row_classes = arrays["row_classes"]
+        self.centroids = arrays.get("centroids")
+        self.list_offsets = arrays.get("list_offsets")
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def is_ivf(self):
+        return self.centroids is not None
+
+    def label(self, class_id):
+        """The sign of a class id"""
+        return self.classes[class_id][1]
+
+    def rows_by_class(self):
+        """{(category, sign): its rows of vectors}"""
+        order = np.argsort(self.row_classes, kind="stable")
+        bounds = np.searchsorted(self.row_classes[order], np.arange(len(self.classes) + 1))
+        return {label: np.asarray(self.vectors[order[bounds[i]:bounds[i + 1]]]) for i, label in enumerate(self.classes)}
+
+    def search(self, queries, k=3, exact=False):
+        """Up to ``k`` (class id, cosine score) pairs per query, best first, one entry per sign"""
+        queries = normalize(np.atleast_2d(queries))
+        neighbours = min(len(self), k * NEIGHBOURS_PER_SIGN)
+        if neighbours == 0:
+            return [[] for _ in queries]
+        if self.is_ivf and not exact:
+            found = [self._probe(query, neighbours) for query in queries]
+        else:
+            found = zip(*self._scan(queries, neighbours))
+        return [self._top_classes(scores, rows, k) for scores, rows in found]
+
+    def _scan(self, queries, neighbours):
+        """Exact top ``neighbours`` rows for every query, one matrix product per chunk"""
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.intp)
+        for start in range(0, len(self), CHUNK_ROWS):
+            scores = queries @ self.vectors[start:start + CHUNK_ROWS].T
+            take = min(neighbours, scores.shape[1])
+            rows = np.argpartition(scores, -take, axis=1)[:, -take:]
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, rows, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, rows + start], axis=1)
+            if best_scores.shape[1] > neighbours:
+                keep = np.argpartition(best_scores, -neighbours, axis=1)[:, -neighbours:]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+        return best_scores, best_rows
+
+    def _probe(self, query, neighbours):
+        """Approximate top rows for one query from its ``nprobe`` nearest clusters"""
+        nprobe = min(self.nprobe, len(self.centroids))
+        lists = np.argpartition(self.centroids @ query, -nprobe)[-nprobe:]
+        rows = np.concatenate([np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in lists])
+        scores = self.vectors[rows] @ query
+        if len(rows) <= neighbours:
+            return scores, rows
+        best = np.argpartition(scores, -neighbours)[-neighbours:]
+        return scores[best], rows[best]
+
+    def _top_classes(self, scores, rows, k):
+        order = np.argsort(-scores)
+        classes = self.row_classes[rows[order]]
+        _, first = np.unique(classes, return_index=True)
+        return [(int(classes[i]), float(scores[order[i]])) for i in np.sort(first)[:k]]
+
+
+def build_index(path, dictionary, embedder, references=None, previous=None, samples=SAMPLES_PER_SIGN,
+                ivf_threshold=IVF_THRESHOLD):
+    """Write the index for a dictionary, reusing ``previous`` rows; returns counts of signs by source"""
+    reusable = {}
+    if previous is not None and previous.embedder == embedder.embedding_id:
+        placeholders = {previous.classes[i] for i in previous.placeholders}
+        reusable = {label: rows for label, rows in previous.rows_by_class().items() if label not in placeholders}
+
+    classes, blocks, placeholders = [], [], []
+    counts = {"reused": 0, "embedded": 0, "placeholder": 0}
+    for category in dictionary:
+        for sign in dictionary[category]:
+            label = (category, sign)
+            rows = reusable.get(label)
+            if rows is not None:
+                counts["reused"] += 1
+            else:
+                images = reference_images(references, category, sign)
+                if images:
+                    rows = embedder.embed_batch(images)
+                    counts["embedded"] += 1
+                else:
+                    rows = placeholder_vectors(category, sign, embedder.embedding_dim, samples)
+                    placeholders.append(len(classes))
+                    counts["placeholder"] += 1
+            classes.append(label)
+            blocks.append(rows)
+
+    dim = embedder.embedding_dim
+    vectors = np.concatenate(blocks) if blocks else np.zeros((0, dim), dtype=np.float32)
+    row_classes = np.repeat(np.arange(len(classes)), [len(rows) for rows in blocks])
+    write_index(path, classes, vectors, row_classes, dictionary.version, embedder.embedding_id, placeholders,
+                ivf_threshold)
+    return counts
+
+
+class EmbeddingStore:
+    """Hands out the index for the current dictionary, extending it when the dictionary changes"""
+
+    def __init__(self, path, embedder, references=None, ivf_threshold=IVF_THRESHOLD, nprobe=NPROBE):
+        self.path = path
+        self.embedder = embedder
+        self.references = references
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        self._index = None
+
+    def current(self, dictionary):
+        index = self._index
+        if index is not None and index.dictionary_version == dictionary.version:
+            return index
+        with self._lock:
+            if self._index is None or self._index.dictionary_version != dictionary.version:
+                self._index = self._load_or_build(dictionary)
+            return self._index
+
+    def _load_or_build(self, dictionary):
+        previous = self._index
+        if previous is None and os.path.exists(self.path):
+            try:
+                previous = EmbeddingIndex(self.path, self.nprobe)
+            except (OSError, ValueError, KeyError):
+                logger.exception("Could not open %s; rebuilding it", self.path)
+        if (previous is not None and previous.dictionary_version == dictionary.version
+                and previous.embedder == self.embedder.embedding_id):
+            return previous
+        start = time.perf_counter()
+        counts = build_index(self.path, dictionary, self.embedder, self.references, previous,
+                             ivf_threshold=self.ivf_threshold)
+        logger.info("Built %s for dictionary %s in %.2fs: %s", self.path, dictionary.version,
+                    time.perf_counter() - start, counts)
+        return EmbeddingIndex(self.path, self.nprobe)
+
+
+class NearestSignModel:
+    """Recognition model for ``InferenceService``: an embedder plus the current reference index"""
+
+    def __init__(self, embedder, index_for, k=3):
+        self.embedder = embedder
+        self.index_for = index_for
+        self.k = k
+
+    @property
+    def input_size(self):
+        return self.embedder.input_size
+
+    @property
+    def version(self):
+        """The embedder's id; the index itself follows the dictionary version"""
+        return self.embedder.embedding_id
+
+    def predict_batch(self, inputs):
+        index = self.index_for()
+        predictions = []
+        for matches in index.search(self.embedder.embed_batch(inputs), self.k):
+            candidates = tuple((index.label(class_id), round(max(score, 0.0) * 100, 1)) for class_id, score in matches)
+            label, confidence = candidates[0] if candidates else ("Unknown", 0.0)
+            predictions.append(Prediction(label, confidence, candidates))
+        return predictions
+
+
+def main(argv=None):
+    from dictionary_store import SignDictionary
+    from inference import DummySignModel
+
+    parser = argparse.ArgumentParser(description="Build Signaura reference-embedding indexes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build or extend the index of a dictionary data file")
+    build.add_argument("dictionary")
+    build.add_argument("--references", help="directory of <category>/<sign>/ sample images")
+    build.add_argument("--out", help="index file (default: <dictionary>.emb)")
+    build.add_argument("--ivf-threshold", type=int, default=IVF_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    path = args.out or args.dictionary + ".emb"
+    previous = EmbeddingIndex(path) if os.path.exists(path) else None
+    start = time.perf_counter()
+    counts = build_index(path, SignDictionary(args.dictionary), DummySignModel([]), args.references, previous,
+                         ivf_threshold=args.ivf_threshold)
+    index = EmbeddingIndex(path)
+    kind = f"IVF, {len(index.centroids)} lists" if index.is_ivf else "exact"
+    print(f"{path}: {len(index):,} vectors for {len(index.classes):,} signs ({kind}) "
+          f"in {time.perf_counter() - start:.2f}s")
+    print("  " + ", ".join(f"{name}: {count}" for name, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Per-user translation history.
+
+Every prediction from the translator is appended to the ``translations``
+table (write-behind, keyed by user and timestamp). The newest entries of
+each active user are also kept in an in-memory ring buffer, so the first
+page of the history panel never touches the database after the first
+load, however long the history is. Older pages are read with keyset
+pagination: "the ``limit`` entries before timestamp T", answered from the
+(username, created_at) primary key in time proportional to the page size.
+
+Timestamps are integer microseconds, strictly increasing per user, so a
+timestamp is both the key of an entry and the cursor of the next page.
+
+With ``max_age`` set, a ring older than that is read again from the
+table, so translations recorded by other app processes show up.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+SIGN_TO_TEXT = "sign_to_text"
+TEXT_TO_SIGN = "text_to_sign"
+
+
+def entry_from_row(row):
+    created_at, direction, source, result, confidence, latency_ms = row
+    return {
+        "created_at": created_at,
+        "direction": direction,
+        "source": source,
+        "result": result,
+        "confidence": confidence,
+        "latency_ms": latency_ms,
+    }
+
+
+class TranslationHistory:
+    """Ring buffers of recent translations in front of the translations table"""
+
+    def __init__(self, store, ring_size=50, max_users=1000, max_age=None):
+        self.store = store
+        self.ring_size = ring_size
+        self.max_users = max_users
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._rings = OrderedDict()  # username -> deque of entries, oldest first
+        self._loaded_at = {}         # username -> time.monotonic() of its last read
+
+    def record(self, username, direction, source, result, confidence=None, latency_ms=None):
+        """Append one translation; the database write happens in the background"""
+        ring = self._ring(username)
+        with self._lock:
+            now = time.time_ns() // 1000
+            created_at = max(now, ring[-1]["created_at"] + 1) if ring else now
+            entry = {
+                "created_at": created_at,
+                "direction": direction,
+                "source": source,
+                "result": result,
+                "confidence": confidence,
+                "latency_ms": latency_ms,
+            }
+            ring.append(entry)
+        self.store.append_translation(username, created_at, direction, source, result, confidence, latency_ms)
+        return entry
+
+    def recent(self, username, limit=None):
+        """Newest entries first, from memory"""
+        ring = self._ring(username)
+        with self._lock:
+            entries = list(ring)
+        entries.reverse()
+        return entries[:limit] if limit is not None else entries
+
+    def page(self, username, before, limit=20):
+        """Newest first, the ``limit`` entries older than timestamp ``before``"""
+        with self._lock:
+            ring = self._rings.get(username)
+            cached = [entry for entry in reversed(ring) if entry["created_at"] < before] if ring else []
+        if len(cached) >= limit:
+            return cached[:limit]
+        if cached:
+            before = cached[-1]["created_at"]
+        rows = self.store.translations(username, before=before, limit=limit - len(cached))
+        return cached + [entry_from_row(row) for row in rows]
+
+    def forget(self, username):
+        with self._lock:
+            self._rings.pop(username, None)
+            self._loaded_at.pop(username, None)
+
+    def _ring(self, username):
+        now = time.monotonic()
+        with self._lock:
+            ring = self._rings.get(username)
+            if ring is not None and (self.max_age is None or now - self._loaded_at[username] < self.max_age):
+                self._rings.move_to_end(username)
+                return ring
+        # This process's queued entries first, so the reload includes them
+        self.store.flush()
+        rows = self.store.translations(username, limit=self.ring_size)
+        with self._lock:
+            if self._loaded_at.get(username, -1.0) < now:
+                self._rings[username] = deque((entry_from_row(row) for row in reversed(rows)), maxlen=self.ring_size)
+                self._loaded_at[username] = now
+            self._rings.move_to_end(username)
+            while len(self._rings) > self.max_users:
+                evicted, _ = self._rings.popitem(last=False)
+                del self._loaded_at[evicted]
+            return self._rings[username]
@@ -0,0 +1,200 @@
+"""Shared, micro-batched inference service for sign recognition.
+
+One ``InferenceService`` is created per process and shared by every
+Streamlit session. Requests go onto a single queue; a batching thread groups
+whatever arrives within ``max_delay_ms`` (up to ``max_batch_size`` items) and
+hands each micro-batch to a small worker pool. Callers get a
+``concurrent.futures.Future`` and only ever wait on their own result.
+"""
+
+import math
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+# candidates: best (label, confidence) pairs, the prediction itself first, when the model ranks several
+Prediction = namedtuple("Prediction", ["label", "confidence", "candidates"], defaults=((),))
+
+
+class InferenceQueueFull(RuntimeError):
+    """Raised when the request queue is at capacity"""
+
+
+class DummySignModel:
+    """CPU-only stand-in for the recognition model.
+
+    A fixed random two-layer projection of the downsampled RGB input. The
+    answers are meaningless but deterministic, and the cost per batch scales
+    like a real dense model, so the service can be benchmarked.
+    """
+
+    def __init__(self, labels, input_size=(64, 64), hidden=256, seed=0):
+        rng = np.random.default_rng(seed)
+        self.labels = list(labels)
+        self.input_size = input_size
+        features = input_size[0] * input_size[1] * 3
+        self._w1 = (rng.standard_normal((features, hidden)) / math.sqrt(features)).astype(np.float32)
+        self._w2 = rng.standard_normal((hidden, len(self.labels))).astype(np.float32)
+        self.embedding_id = f"dummy-{input_size[0]}x{input_size[1]}-{hidden}-{seed}"
+        self.embedding_dim = hidden
+
+    def prepare(self, image):
+        """Nearest-neighbour resize an ``(H, W, 3)`` uint8 array to a flat float32 vector"""
+        image = np.asarray(image)
+        if image.ndim == 2:
+            image = np.repeat(image[:, :, None], 3, axis=2)
+        height, width = self.input_size
+        if image.shape[:2] == (height, width):
+            return image[:, :, :3].reshape(-1).astype(np.float32) / 255.0
+        rows = np.linspace(0, image.shape[0] - 1, height).astype(np.intp)
+        cols = np.linspace(0, image.shape[1] - 1, width).astype(np.intp)
+        return image[rows][:, cols, :3].reshape(-1).astype(np.float32) / 255.0
+
+    def embed_batch(self, inputs):
+        """Feature vectors of the inputs: the centred input through the first projection"""
+        batch = np.stack([self.prepare(x) for x in inputs])
+        return self._project(batch - 0.5)
+
+    def predict_batch(self, inputs):
+        batch = np.stack([self.prepare(x) for x in inputs])
+        hidden = np.maximum(self._project(batch), 0.0)
+        logits = hidden @ self._w2
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        return [Prediction(self.labels[i], round(float(p[i]) * 100, 1)) for i, p in zip(best, probs)]
+
+    def _project(self, batch):
+        return batch @ self._w1
+
+    def quantize_int8(self):
+        """Copy with the first projection stored as int8, one float32 scale per output column"""
+        return Int8SignModel(self)
+
+
+class Int8SignModel(DummySignModel):
+    """DummySignModel with symmetric per-column int8 weights for the large first layer"""
+
+    def __init__(self, model):
+        self.labels = model.labels
+        self.input_size = model.input_size
+        self.embedding_id = model.embedding_id
+        self.embedding_dim = model.embedding_dim
+        self._w2 = model._w2
+        self._scale = np.maximum(np.abs(model._w1).max(axis=0), 1e-12) / 127.0
+        self._q1 = np.round(model._w1 / self._scale).astype(np.int8)
+
+    def _project(self, batch):
+        return (batch @ self._q1) * self._scale
+
+
+class InferenceService:
+    """Queue + micro-batcher + worker pool around a model with ``predict_batch``"""
+
+    _STOP = object()
+
+    def __init__(self, model, max_batch_size=8, max_delay_ms=10, workers=2, max_queue=256):
+        if max_batch_size < 1 or workers < 1:
+            raise ValueError("max_batch_size and workers must be at least 1")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue = queue.Queue(max_queue)
+        # One slot per worker: while every worker is busy the batcher keeps
+        # collecting, so batches grow with load instead of piling up.
+        self._slots = threading.BoundedSemaphore(workers)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="signaura-infer")
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "rejected": 0, "errors": 0}
+        self._closed = False
+        self._batcher = threading.Thread(target=self._batch_loop, name="signaura-batcher", daemon=True)
+        self._batcher.start()
+
+    def submit(self, item):
+        """Queue one input and return a Future resolving to a Prediction"""
+        if self._closed:
+            raise RuntimeError("inference service is closed")
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise InferenceQueueFull("inference queue is full") from None
+        return future
+
+    def predict(self, item, timeout=None):
+        """Submit one input and block until its own result is ready"""
+        return self.submit(item).result(timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["mean_batch_size"] = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    def close(self, wait=True):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        if wait:
+            self._batcher.join()
+            while True:
+                try:
+                    _, future = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                future.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def _batch_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._slots.acquire()
+            self._executor.submit(self._run_batch, batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch):
+        try:
+            live = [(x, future) for x, future in batch if future.set_running_or_notify_cancel()]
+            if not live:
+                return
+            try:
+                predictions = self.model.predict_batch([x for x, _ in live])
+            except Exception as exc:
+                with self._lock:
+                    self._stats["errors"] += len(live)
+                for _, future in live:
+                    future.set_exception(exc)
+                return
+            with self._lock:
+                self._stats["requests"] += len(live)
+                self._stats["batches"] += 1
+            for (_, future), prediction in zip(live, predictions):
+                future.set_result(prediction)
+        finally:
+            self._slots.release()
@@ -0,0 +1,348 @@
+"""Local media server for sign clips.
+
+Serves pre-encoded renditions straight to the browser so video bytes never
+pass through the Streamlit server:
+
+    <root>/<rendition>/<clip>      e.g. media/480p/placeholder_hello.mp4
+
+* ``GET``/``HEAD /media/<clip>?q=auto|240p|480p|720p``
+* single byte ranges (``Range: bytes=a-b``, ``bytes=a-``, ``bytes=-n``) with
+  ``206``/``416`` responses and ``If-Range``
+* ``ETag``/``Last-Modified`` validators with ``304`` responses
+* files are memory-mapped once and sliced per request
+* with ``q=auto`` the rendition is picked from client hints
+  (``Save-Data``, ``Downlink``, ``ECT``)
+
+Usage:
+
+    python media_server.py serve --root media --port 8502
+    python media_server.py encode raw_clips/ --root media    # needs ffmpeg
+"""
+
+import argparse
+import email.utils
+import mimetypes
+import mmap
+import os
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+# Rendition name -> (video height, approximate bitrate in kbit/s), lowest first
+RENDITIONS = OrderedDict([
+    ("240p", (240, 400)),
+    ("480p", (480, 1200)),
+    ("720p", (720, 2800)),
+])
+DEFAULT_RENDITION = "480p"
+
+CHUNK_SIZE = 256 * 1024
+
+
+class MappedFile:
+    """A read-only memory map with the validators derived from its stat"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            # Stat the open file, so the validators describe what is mapped even if the path is replaced
+            stat = os.fstat(f.fileno())
+            self.size = stat.st_size
+            self.mtime = stat.st_mtime
+            self.etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+            self.last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+            self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            self.key = (stat.st_size, stat.st_mtime_ns)
+            if self.size:
+                self.view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                self.view = memoryview(b"")
+
+
+class MediaLibrary:
+    """Resolves clip names to renditions and keeps recently used files mapped"""
+
+    def __init__(self, root, max_open=256):
+        self.root = os.path.abspath(root)
+        self.max_open = max_open
+        self._open = OrderedDict()
+        self._lock = threading.Lock()
+
+    def available(self, clip):
+        """Renditions that exist for a clip"""
+        return [name for name in RENDITIONS if os.path.isfile(self._path(name, clip))]
+
+    def choose(self, clip, requested="auto", headers=None):
+        """Pick a rendition for this client; falls back to the nearest one on disk"""
+        available = self.available(clip)
+        if not available:
+            return None
+        wanted = requested if requested in RENDITIONS else select_rendition(headers or {})
+        if wanted in available:
+            return wanted
+        order = list(RENDITIONS)
+        # Prefer the closest lower quality, then the closest higher one
+        lower = [name for name in available if order.index(name) < order.index(wanted)]
+        return lower[-1] if lower else available[0]
+
+    def open(self, rendition, clip):
+        path = self._path(rendition, clip)
+        stat = os.stat(path)
+        with self._lock:
+            mapped = self._open.get(path)
+            if mapped is not None and mapped.key == (stat.st_size, stat.st_mtime_ns):
+                self._open.move_to_end(path)
+                return mapped
+        mapped = MappedFile(path)
+        with self._lock:
+            self._open[path] = mapped
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+        return mapped
+
+    def warm(self, clip, requested=DEFAULT_RENDITION, nbytes=CHUNK_SIZE):
+        """Fault the first ``nbytes`` of a clip into the page cache; returns (mapped file, bytes warmed)"""
+        rendition = self.choose(clip, requested)
+        if rendition is None:
+            return None, 0
+        mapped = self.open(rendition, clip)
+        end = min(nbytes, mapped.size)
+        # One read per page is enough to bring it in
+        for offset in range(0, end, mmap.PAGESIZE):
+            mapped.view[offset]
+        return mapped, end
+
+    def _path(self, rendition, clip):
+        return os.path.join(self.root, rendition, clip)
+
+
+def select_rendition(headers):
+    """Choose a rendition from Save-Data / Downlink / ECT client hints"""
+    if headers.get("Save-Data", "").strip().lower() == "on":
+        return next(iter(RENDITIONS))
+    downlink = headers.get("Downlink")
+    if downlink:
+        try:
+            budget_kbps = float(downlink) * 1000 * 0.8
+        except ValueError:
+            budget_kbps = None
+        if budget_kbps is not None:
+            fitting = [name for name, (_, kbps) in RENDITIONS.items() if kbps <= budget_kbps]
+            return fitting[-1] if fitting else next(iter(RENDITIONS))
+    if headers.get("ECT", "").strip().lower() in ("slow-2g", "2g"):
+        return next(iter(RENDITIONS))
+    return DEFAULT_RENDITION
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single-range header, None for the whole file,
+    or "unsatisfiable" for a range outside the file"""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    spec = header[len("bytes="):].strip()
+    first, _, last = spec.partition("-")
+    try:
+        if first == "":
+            length = int(last)
+            if length <= 0:
+                return "unsatisfiable"
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, min(end, size - 1)
+
+
+class MediaRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SignauraMedia/1.0"
+    library = None  # set by make_server
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def _serve(self, send_body):
+        url = urlsplit(self.path)
+        prefix = "/media/"
+        if not url.path.startswith(prefix):
+            return self._error(HTTPStatus.NOT_FOUND)
+        clip = unquote(url.path[len(prefix):])
+        if not clip or clip != os.path.basename(clip) or clip.startswith("."):
+            return self._error(HTTPStatus.NOT_FOUND)
+
+        requested = parse_qs(url.query).get("q", ["auto"])[0]
+        rendition = self.library.choose(clip, requested, self.headers)
+        if rendition is None:
+            return self._error(HTTPStatus.NOT_FOUND)
+        try:
+            mapped = self.library.open(rendition, clip)
+        except OSError:
+            # Removed or replaced since choose() saw it
+            return self._error(HTTPStatus.NOT_FOUND)
+
+        headers = {
+            "ETag": mapped.etag,
+            "Last-Modified": mapped.last_modified,
+            "Cache-Control": "public, max-age=86400",
+            "Accept-Ranges": "bytes",
+            "Access-Control-Allow-Origin": "*",
+            "X-Rendition": rendition,
+        }
+        if requested == "auto":
+            headers["Accept-CH"] = "Save-Data, Downlink, ECT"
+            headers["Vary"] = "Save-Data, Downlink, ECT"
+
+        if self._not_modified(mapped):
+            return self._send(HTTPStatus.NOT_MODIFIED, headers)
+
+        byte_range = parse_range(self.headers.get("Range"), mapped.size)
+        if_range = self.headers.get("If-Range")
+        if byte_range is not None and if_range and if_range not in (mapped.etag, mapped.last_modified):
+            byte_range = None
+        if byte_range == "unsatisfiable":
+            headers["Content-Range"] = f"bytes */{mapped.size}"
+            return self._send(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers)
+
+        headers["Content-Type"] = mapped.content_type
+        if byte_range is None:
+            start, end, status = 0, mapped.size - 1, HTTPStatus.OK
+        else:
+            (start, end), status = byte_range, HTTPStatus.PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start}-{end}/{mapped.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        self._send(status, headers)
+
+        if send_body:
+            view = mapped.view
+            position = start
+            try:
+                while position <= end:
+                    stop = min(position + CHUNK_SIZE, end + 1)
+                    self.wfile.write(view[position:stop])
+                    position = stop
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+    def _not_modified(self, mapped):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return mapped.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mapped.mtime) <= since
+        return False
+
+    def _send(self, status, headers):
+        self.send_response(status)
+        if "Content-Length" not in headers:
+            headers["Content-Length"] = "0"
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _error(self, status):
+        self._send(status, {"Access-Control-Allow-Origin": "*"})
+
+
+def make_server(root, host="127.0.0.1", port=8502, verbose=False):
+    handler = type("BoundMediaRequestHandler", (MediaRequestHandler,), {"library": MediaLibrary(root)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def start_in_background(root, host="127.0.0.1", port=8502):
+    """Start the media server on a daemon thread next to the app"""
+    server = make_server(root, host, port)
+    threading.Thread(target=server.serve_forever, name="signaura-media", daemon=True).start()
+    return server
+
+
+def clip_url(base_url, clip, quality="auto"):
+    """URL of a clip on a media server"""
+    return f"{base_url.rstrip('/')}/media/{quote(clip)}?q={quote(quality)}"
+
+
+# Offline rendition encoding
+def encode_renditions(source_dir, root, renditions=None, overwrite=False):
+    """Encode every clip in ``source_dir`` into each rendition with ffmpeg"""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required to encode renditions")
+    renditions = renditions or list(RENDITIONS)
+    for name in sorted(os.listdir(source_dir)):
+        source = os.path.join(source_dir, name)
+        if not os.path.isfile(source):
+            continue
+        clip = os.path.splitext(name)[0] + ".mp4"
+        for rendition in renditions:
+            height, kbps = RENDITIONS[rendition]
+            target = os.path.join(root, rendition, clip)
+            if os.path.exists(target) and not overwrite:
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # A running server may have the target mapped: encode next to it (hidden, so it is never
+            # served half-written) and swap it in, rather than rewriting the mapped file in place
+            partial = os.path.join(os.path.dirname(target), f".{clip}.{os.getpid()}.mp4")
+            try:
+                subprocess.run([
+                    ffmpeg, "-loglevel", "error", "-y", "-i", source,
+                    "-vf", f"scale=-2:{height}", "-c:v", "libx264", "-preset", "slow",
+                    "-b:v", f"{kbps}k", "-maxrate", f"{kbps * 3 // 2}k", "-bufsize", f"{kbps * 2}k",
+                    "-an", "-movflags", "+faststart", partial,
+                ], check=True)
+                os.replace(partial, target)
+            except BaseException:
+                if os.path.exists(partial):
+                    os.unlink(partial)
+                raise
+            print(f"{rendition}/{clip}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Signaura sign-clip media server")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="serve renditions over HTTP")
+    serve.add_argument("--root", default="media")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8502)
+    serve.add_argument("--verbose", action="store_true")
+
+    encode = commands.add_parser("encode", help="pre-encode renditions with ffmpeg")
+    encode.add_argument("source_dir")
+    encode.add_argument("--root", default="media")
+    encode.add_argument("--overwrite", action="store_true")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        server = make_server(args.root, args.host, args.port, verbose=args.verbose)
+        print(f"Serving {os.path.abspath(args.root)} on http://{args.host}:{args.port}/media/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    else:
+        encode_renditions(args.source_dir, args.root, overwrite=args.overwrite)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""Per-rerun instrumentation for the Streamlit app.
+
+``Instrumentation.track(page, ctx)`` wraps one script rerun and records:
+
+* wall time and CPU time of the script thread,
+* elements sent to the browser and bytes of markdown/HTML among them,
+
+tagged by page and by session. Values are aggregated in-process into
+fixed-bucket histograms and exposed in the Prometheus text format, either
+over HTTP (``start_metrics_server``) or as a periodic summary log line.
+``section(name)`` times a part of a page the same way, and ``add_gauges``
+exports the current values of another component's counters.
+
+A fraction of reruns can be run under cProfile; profiles of reruns slower
+than ``slow_ms`` are logged and optionally dumped to ``profile_dir``.
+
+A ``track`` opened while another rerun is tracked on the same thread (a
+fragment drawn inside a fragment rerun) is timed as a section of the
+outer rerun, which keeps counting its elements.
+
+When disabled, ``track`` and ``section`` return a shared no-op context
+manager, so the only cost is a method call.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+ELEMENT_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500)
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+_DISABLED = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.sum:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class _Rerun:
+    __slots__ = ("page", "elements", "html_bytes")
+
+    def __init__(self, page):
+        self.page = page
+        self.elements = 0
+        self.html_bytes = 0
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Instrumentation:
+    """Collects rerun and section measurements and renders them as metrics"""
+
+    def __init__(self, enabled=True, profile_sample=0.0, slow_ms=500.0, profile_dir=None,
+                 log_interval=0.0, max_sessions=1000):
+        self.enabled = enabled
+        self.profile_sample = profile_sample
+        self.slow_ms = slow_ms
+        self.profile_dir = profile_dir
+        self.log_interval = log_interval
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._sections = {}
+        self._sessions = OrderedDict()
+        self._slow_reruns = {}
+        self._gauges = []
+        self._local = threading.local()
+        self._last_log = time.monotonic()
+
+    def track(self, page, ctx=None):
+        """Context manager around one rerun of ``page``; ``ctx`` is the ScriptRunContext"""
+        if not self.enabled:
+            return _DISABLED
+        if getattr(self._local, "rerun", None) is not None:
+            # Nested: the outer rerun owns the element counter and the section tags
+            return self._section(page)
+        return self._track(page, ctx)
+
+    def add_gauges(self, name, help_text, collect):
+        """Export each numeric value of ``collect()`` as a ``signaura_<name>_<key>`` gauge"""
+        with self._lock:
+            self._gauges.append((name, help_text, collect))
+
+    def section(self, name):
+        """Context manager timing part of the current page"""
+        if not self.enabled:
+            return _DISABLED
+        return self._section(name)
+
+    @contextmanager
+    def _track(self, page, ctx):
+        rerun = _Rerun(page)
+        self._local.rerun = rerun
+        if ctx is not None:
+            self._count_messages(ctx, rerun)
+        profiler = self._start_profiler()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            if profiler is not None:
+                profiler.disable()
+            if ctx is not None:
+                ctx.__dict__.pop("enqueue", None)
+            self._local.rerun = None
+            self._record(rerun, ctx.session_id if ctx is not None else None, wall, cpu)
+            if profiler is not None and wall * 1000 >= self.slow_ms:
+                self._report_profile(page, wall, profiler)
+            self._maybe_log()
+
+    @contextmanager
+    def _section(self, name):
+        rerun = getattr(self._local, "rerun", None)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            key = (rerun.page if rerun is not None else "", name)
+            with self._lock:
+                histogram = self._sections.get(key)
+                if histogram is None:
+                    histogram = self._sections[key] = Histogram(SECONDS_BUCKETS)
+                histogram.observe(elapsed)
+
+    def _count_messages(self, ctx, rerun):
+        """Shadow ctx.enqueue for this rerun to count outgoing elements"""
+        enqueue = ctx.enqueue
+
+        def counting_enqueue(msg):
+            if msg.HasField("delta") and msg.delta.HasField("new_element"):
+                rerun.elements += 1
+                element = msg.delta.new_element
+                if element.HasField("markdown"):
+                    rerun.html_bytes += len(element.markdown.body.encode("utf-8"))
+            enqueue(msg)
+
+        ctx.enqueue = counting_enqueue
+
+    def _start_profiler(self):
+        if not self.profile_sample or random.random() >= self.profile_sample:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another session's rerun is already being profiled
+            return None
+        return profiler
+
+    def _record(self, rerun, session_id, wall, cpu):
+        with self._lock:
+            histograms = self._pages.get(rerun.page)
+            if histograms is None:
+                histograms = self._pages[rerun.page] = {
+                    "wall_seconds": Histogram(SECONDS_BUCKETS),
+                    "cpu_seconds": Histogram(SECONDS_BUCKETS),
+                    "elements": Histogram(ELEMENT_BUCKETS),
+                    "html_bytes": Histogram(BYTE_BUCKETS),
+                }
+            histograms["wall_seconds"].observe(wall)
+            histograms["cpu_seconds"].observe(cpu)
+            histograms["elements"].observe(rerun.elements)
+            histograms["html_bytes"].observe(rerun.html_bytes)
+            if wall * 1000 >= self.slow_ms:
+                self._slow_reruns[rerun.page] = self._slow_reruns.get(rerun.page, 0) + 1
+
+            if session_id is not None:
+                session = self._sessions.pop(session_id, None) or [0, 0.0, 0.0]
+                session[0] += 1
+                session[1] += wall
+                session[2] += cpu
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+
+    def _report_profile(self, page, wall, profiler):
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(20)
+        logger.warning("Slow rerun of %s (%.0f ms):\n%s", page, wall * 1000, stream.getvalue())
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            name = f"{page.lower()}-{time.strftime('%Y%m%d-%H%M%S')}-{int(wall * 1000)}ms.prof"
+            profiler.dump_stats(os.path.join(self.profile_dir, name))
+
+    def _maybe_log(self):
+        if not self.log_interval:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_log < self.log_interval:
+                return
+            self._last_log = now
+        logger.info("%s", self.summary_line())
+
+    def summary_line(self):
+        """One line per process: reruns, mean wall/CPU ms and mean elements per page"""
+        parts = []
+        with self._lock:
+            for page, histograms in sorted(self._pages.items()):
+                wall = histograms["wall_seconds"]
+                if not wall.count:
+                    continue
+                parts.append(
+                    f"{page}: n={wall.count} wall={wall.sum / wall.count * 1000:.1f}ms "
+                    f"cpu={histograms['cpu_seconds'].sum / wall.count * 1000:.1f}ms "
+                    f"elements={histograms['elements'].sum / wall.count:.0f} "
+                    f"html={histograms['html_bytes'].sum / wall.count / 1024:.1f}KiB"
+                )
+        return "reruns " + ("; ".join(parts) if parts else "none")
+
+    def render_prometheus(self):
+        """Current metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for metric, help_text in (
+                ("wall_seconds", "Wall time of one script rerun"),
+                ("cpu_seconds", "CPU time of the script thread during one rerun"),
+                ("elements", "Elements sent to the browser per rerun"),
+                ("html_bytes", "Bytes of markdown/HTML sent per rerun"),
+            ):
+                name = f"signaura_rerun_{metric}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for page, histograms in sorted(self._pages.items()):
+                    lines.extend(histograms[metric].lines(name, f'page="{_escape(page)}"'))
+
+            lines.append("# HELP signaura_slow_reruns_total Reruns slower than the profiling threshold")
+            lines.append("# TYPE signaura_slow_reruns_total counter")
+            for page, count in sorted(self._slow_reruns.items()):
+                lines.append(f'signaura_slow_reruns_total{{page="{_escape(page)}"}} {count}')
+
+            lines.append("# HELP signaura_section_wall_seconds Wall time of an instrumented page section")
+            lines.append("# TYPE signaura_section_wall_seconds histogram")
+            for (page, section), histogram in sorted(self._sections.items()):
+                labels = f'page="{_escape(page)}",section="{_escape(section)}"'
+                lines.extend(histogram.lines("signaura_section_wall_seconds", labels))
+
+            for index, (metric, help_text) in enumerate((
+                ("reruns_total", "Reruns per session (most recent sessions only)"),
+                ("wall_seconds_total", "Rerun wall time per session"),
+                ("cpu_seconds_total", "Rerun CPU time per session"),
+            )):
+                name = f"signaura_session_{metric}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for session_id, values in self._sessions.items():
+                    lines.append(f'{name}{{session="{_escape(session_id)}"}} {values[index]}')
+            gauges = list(self._gauges)
+
+        # Collected outside our lock: the callbacks take their own
+        for prefix, help_text, collect in gauges:
+            for key, value in collect().items():
+                name = f"signaura_{prefix}_{key}"
+                lines.append(f"# HELP {name} {help_text}: {key.replace('_', ' ')}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    instrumentation = None  # set by start_metrics_server
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.instrumentation.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(instrumentation, host="127.0.0.1", port=9108):
+    """Serve ``/metrics`` on a daemon thread"""
+    handler = type("BoundMetricsRequestHandler", (MetricsRequestHandler,), {"instrumentation": instrumentation})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="signaura-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,138 @@
+"""Background loading, warm-up and CPU thread settings for the recognition model.
+
+``ModelRuntime(load, input_size).start()`` returns at once and loads the
+model on a background thread, so the first page of a fresh process does
+not wait for it. After loading it runs the model a few times on synthetic
+images (single images and a full batch), which pays one-off costs such as
+page faults on the weights, BLAS thread start-up and building the
+reference index before a user's first request. ``state`` goes
+``loading`` -> ``warming`` -> ``ready`` (or ``failed``) and is what the UI
+shows; ``predict_batch`` waits for ``ready``.
+
+CPU threads, for nodes where inference shares cores with the Streamlit
+server:
+
+* intra-op: threads a single matrix product may use. ``start()`` sets the
+  OMP_NUM_THREADS family of variables when numpy has not been imported
+  yet (the BLAS library reads them once, when it loads); after that only
+  threadpoolctl, when installed, can resize the running pools. To cap a
+  process started some other way, launch it with ``thread_environment``.
+* inter-op: batches run at the same time, i.e. the ``workers`` of the
+  ``InferenceService`` wrapping the runtime.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LOADING = "loading"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+THREAD_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+class ModelNotReady(RuntimeError):
+    """Raised when the model is still loading or failed to load"""
+
+
+def thread_environment(threads):
+    """Environment variables that cap BLAS threads of a process started with them"""
+    return {name: str(threads) for name in THREAD_VARIABLES} if threads else {}
+
+
+def limit_intra_op_threads(threads):
+    """Cap BLAS threads for this process; returns False when numpy is loaded and threadpoolctl is missing"""
+    if not threads:
+        return True
+    if "numpy" not in sys.modules:
+        os.environ.update(thread_environment(threads))
+        return True
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return False
+    threadpool_limits(limits=threads)
+    return True
+
+
+class ModelRuntime:
+    """Model loaded and warmed up in the background, served through ``predict_batch``"""
+
+    def __init__(self, load, input_size, warmup_runs=3, warmup_batch=8, intra_op_threads=0, wait_timeout=60.0):
+        self.input_size = input_size
+        self.warmup_runs = warmup_runs
+        self.warmup_batch = warmup_batch
+        self.intra_op_threads = intra_op_threads
+        self.wait_timeout = wait_timeout
+        self.state = LOADING
+        self.error = None
+        self.model = None
+        self.timings = {}  # seconds: load, warmup, cold_start
+        self._load = load
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._start, name="signaura-model-load", daemon=True)
+
+    def start(self):
+        # Before the load thread can import numpy
+        if not limit_intra_op_threads(self.intra_op_threads):
+            logger.warning("numpy is already loaded and threadpoolctl is not installed; intra-op threads follow %s",
+                           THREAD_VARIABLES[0])
+        self._thread.start()
+        return self
+
+    @property
+    def ready(self):
+        return self.state == READY
+
+    @property
+    def version(self):
+        """Version of the loaded model (None while loading or without one)"""
+        return getattr(self.model, "version", None)
+
+    def wait(self, timeout=None):
+        """Block until loading finished; True if the model is ready"""
+        self._ready.wait(timeout)
+        return self.ready
+
+    def predict_batch(self, inputs):
+        if not self._ready.wait(self.wait_timeout):
+            raise ModelNotReady("the recognition model is still loading")
+        if self.state == FAILED:
+            raise ModelNotReady(f"the recognition model failed to load: {self.error}")
+        return self.model.predict_batch(inputs)
+
+    def _start(self):
+        started = time.perf_counter()
+        try:
+            model = self._load()
+            self.timings["load"] = time.perf_counter() - started
+            self.state = WARMING
+            self._warm_up(model)
+            self.timings["warmup"] = time.perf_counter() - started - self.timings["load"]
+            self.model = model
+            self.state = READY
+        except Exception as exc:
+            logger.exception("Loading the recognition model failed")
+            self.error = exc
+            self.state = FAILED
+        finally:
+            self.timings["cold_start"] = time.perf_counter() - started
+            self._ready.set()
+        logger.info("Recognition model %s in %.2fs (load %.2fs)", self.state, self.timings["cold_start"],
+                    self.timings.get("load", 0.0))
+
+    def _warm_up(self, model):
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        height, width = self.input_size
+        images = list(rng.integers(0, 256, (self.warmup_batch, height, width, 3), dtype=np.uint8))
+        for _ in range(self.warmup_runs):
+            model.predict_batch(images[:1])
+            model.predict_batch(images)
@@ -0,0 +1,148 @@
+"""Multi-word phrase matcher for Text-to-Sign translation.
+
+The word dictionary is compiled once into a token trie. Translation is a
+single left-to-right pass that takes the longest dictionary phrase starting
+at each token ("thank you" beats "thank"), and falls back to fingerspelling
+for words with no sign. Results are memoised on the normalised token
+sequence, so repeated inputs (quick phrases, reruns) are free.
+
+Batch use, for lesson scripts or subtitle files:
+
+    python phrase_matcher.py lesson.txt > signs.jsonl
+    python phrase_matcher.py lesson.srt --dictionary other/dictionary.jsonl
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+from dictionary_store import DEFAULT_PATH, SignDictionary
+
+SIGN = "sign"
+SPELL = "spell"
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+# kind: SIGN or SPELL; text: the words covered; signs: dictionary keys to show
+Segment = namedtuple("Segment", ["kind", "text", "signs"])
+
+_END = object()
+
+
+def tokenize(text):
+    return tuple(TOKEN_RE.findall(text.lower()))
+
+
+class PhraseMatcher:
+    """Longest-match translator compiled from the sign dictionary"""
+
+    def __init__(self, dictionary, cache_size=4096):
+        self._trie = {}
+        self.max_phrase_length = 0
+        for phrase in dictionary.get("words", {}):
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_END] = phrase
+            self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+
+        # Fingerspelling alphabet: characters with their own sign
+        self._spelling = {}
+        for category in ("alphabets", "numbers"):
+            for key in dictionary.get(category, {}):
+                if len(key) == 1:
+                    self._spelling[key.lower()] = key
+
+        self._translate_tokens = lru_cache(maxsize=cache_size)(self._match)
+
+    def translate(self, text):
+        """Translate text into a tuple of SIGN and SPELL segments"""
+        return self._translate_tokens(tokenize(text))
+
+    def translate_many(self, texts):
+        """Translate an iterable of texts, sharing the memo across them"""
+        return [self.translate(text) for text in texts]
+
+    def cache_info(self):
+        return self._translate_tokens.cache_info()
+
+    def _match(self, tokens):
+        segments = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = self._trie
+            match, match_end = None, i
+            j = i
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match, match_end = node[_END], j
+            if match is not None:
+                segments.append(Segment(SIGN, " ".join(tokens[i:match_end]), (match,)))
+                i = match_end
+            else:
+                word = tokens[i]
+                letters = tuple(self._spelling[c] for c in word if c in self._spelling)
+                segments.append(Segment(SPELL, word, letters))
+                i += 1
+        return tuple(segments)
+
+
+# Batch translation
+_SRT_TIMING = re.compile(r"^\d{2}:\d{2}:\d{2}[,.]\d{3}\s+-->\s+")
+
+
+def translate_lines(matcher, lines, subtitles=False):
+    """Yield one record per text line; subtitle numbering and timing lines are passed through"""
+    cue_timing = None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\n")
+        if subtitles:
+            if _SRT_TIMING.match(line):
+                cue_timing = line.strip()
+                continue
+            if not line.strip() or line.strip().isdigit():
+                continue
+        if not line.strip():
+            continue
+        record = {
+            "line": number,
+            "text": line,
+            "segments": [segment._asdict() for segment in matcher.translate(line)],
+        }
+        if subtitles:
+            record["timing"] = cue_timing
+        yield record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translate a text or subtitle file into sign segments (JSON Lines)")
+    parser.add_argument("path", help="text file, .srt subtitles, or - for stdin")
+    parser.add_argument("--dictionary", default=DEFAULT_PATH, help="sign dictionary data file (default: the bundled one)")
+    parser.add_argument("--subtitles", action="store_true", help="treat input as SRT (default for .srt files)")
+    args = parser.parse_args(argv)
+
+    matcher = PhraseMatcher(SignDictionary(args.dictionary))
+
+    subtitles = args.subtitles or args.path.lower().endswith(".srt")
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    try:
+        for record in translate_lines(matcher, source, subtitles=subtitles):
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == "__main__":
+    main()
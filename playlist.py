@@ -0,0 +1,138 @@
+"""Compiled sign-sequence playlists for Text-to-Sign.
+
+A sentence is compiled once into a ``Playlist``: the clips of its signs and
+fingerspelled letters in order, each with a start offset and duration, so
+the browser plays the whole sentence back to back in one video element
+instead of loading one player per word. Compiled playlists are memoised on
+the normalised token sequence, and ``prebuild`` compiles a list of texts
+(the quick phrases) up front.
+
+Segment durations come from a record's ``duration`` field when the
+dictionary has one, and default to ``WORD_SECONDS``/``LETTER_SECONDS``.
+Segments whose clip is not published are shown as a caption card for their
+duration, so the timing of the sentence is the same either way.
+"""
+
+import json
+from collections import namedtuple
+from functools import lru_cache
+
+from phrase_matcher import SIGN, tokenize
+
+WORD_SECONDS = 1.6
+LETTER_SECONDS = 0.8
+
+# clip: dictionary video_url, or None when the word has no sign and no spellable letters
+PlaylistSegment = namedtuple("PlaylistSegment", ["label", "clip", "start", "duration"])
+Playlist = namedtuple("Playlist", ["text", "segments", "duration"])
+
+
+class PlaylistCompiler:
+    """Turns text into playlists using the phrase matcher's segmentation"""
+
+    def __init__(self, dictionary, matcher, cache_size=1024):
+        self.dictionary = dictionary
+        self.matcher = matcher
+        self._compile_tokens = lru_cache(maxsize=cache_size)(self._compile)
+
+    def compile(self, text):
+        return self._compile_tokens(tokenize(text))
+
+    def prebuild(self, texts):
+        """Compile texts ahead of their first use"""
+        for text in texts:
+            self.compile(text)
+
+    def cache_info(self):
+        return self._compile_tokens.cache_info()
+
+    def _compile(self, tokens):
+        items = []
+        for segment in self.matcher.translate(" ".join(tokens)):
+            if segment.kind == SIGN:
+                data = self.dictionary.entry("words", segment.signs[0]) or {}
+                items.append((segment.text, data.get("video_url"), data.get("duration", WORD_SECONDS)))
+            elif segment.signs:
+                for letter in segment.signs:
+                    data = self.dictionary.entry("alphabets", letter) or self.dictionary.entry("numbers", letter) or {}
+                    items.append((letter, data.get("video_url"), data.get("duration", LETTER_SECONDS)))
+            else:
+                items.append((segment.text, None, WORD_SECONDS))
+
+        segments = []
+        start = 0.0
+        for label, clip, duration in items:
+            segments.append(PlaylistSegment(label, clip, round(start, 3), duration))
+            start += duration
+        return Playlist(" ".join(tokens), tuple(segments), round(start, 3))
+
+
+def manifest(playlist, clip_url):
+    """JSON-ready clip index; ``clip_url`` maps a clip to its URL, or None if unpublished"""
+    return {
+        "text": playlist.text,
+        "duration": playlist.duration,
+        "segments": [
+            {"label": segment.label, "url": clip_url(segment.clip) if segment.clip else None,
+             "start": segment.start, "duration": segment.duration}
+            for segment in playlist.segments
+        ],
+    }
+
+
+PLAYER = """
+<div style="font-family: sans-serif;">
+  <div style="position: relative; background: #f0f2f6; border: 2px dashed #ccc; border-radius: 10px; aspect-ratio: 16 / 9;">
+    <video id="clip" muted playsinline style="width: 100%; height: 100%; display: none; border-radius: 10px;"></video>
+    <video id="next" muted preload="auto" style="display: none;"></video>
+    <div id="card" style="position: absolute; inset: 0; display: flex; align-items: center; justify-content: center;
+                          font-size: 1.4rem; color: #555;"></div>
+  </div>
+  <div style="display: flex; justify-content: space-between; align-items: center; margin-top: 6px; color: #333;">
+    <span id="caption"></span>
+    <button id="replay" style="border: 1px solid #ccc; border-radius: 6px; background: white; padding: 2px 10px;">
+      &#8635; Replay</button>
+  </div>
+</div>
+<script>
+const manifest = __MANIFEST__;
+const clip = document.getElementById("clip"), next = document.getElementById("next");
+const card = document.getElementById("card"), caption = document.getElementById("caption");
+let index = -1, timer = null;
+
+function advance() {
+  clearTimeout(timer);
+  index += 1;
+  if (index >= manifest.segments.length) {
+    caption.textContent = manifest.text;
+    return;
+  }
+  const segment = manifest.segments[index];
+  caption.textContent = `${index + 1}/${manifest.segments.length}: ${segment.label}`;
+  const upcoming = manifest.segments.slice(index + 1).find(s => s.url);
+  if (upcoming && next.getAttribute("src") !== upcoming.url) next.src = upcoming.url;
+  if (segment.url) {
+    card.style.display = "none";
+    clip.style.display = "block";
+    clip.src = segment.url;
+    clip.play().catch(() => { timer = setTimeout(advance, segment.duration * 1000); });
+  } else {
+    clip.style.display = "none";
+    card.style.display = "flex";
+    card.textContent = "\\u{1F4F9} " + segment.label;
+    timer = setTimeout(advance, segment.duration * 1000);
+  }
+}
+
+clip.addEventListener("ended", advance);
+clip.addEventListener("error", () => { timer = setTimeout(advance, manifest.segments[index].duration * 1000); });
+document.getElementById("replay").addEventListener("click", () => { index = -1; advance(); });
+advance();
+</script>
+"""
+
+
+def player_html(playlist_manifest):
+    """Self-contained HTML player for a manifest"""
+    data = json.dumps(playlist_manifest).replace("</", "<\\/")
+    return PLAYER.replace("__MANIFEST__", data)
@@ -0,0 +1,156 @@
+"""Background prefetching into a size-aware LRU cache.
+
+``Prefetcher.prefetch(key, load)`` loads an item on a small worker pool
+while the user is still on the current one; ``get(key, load)`` returns it
+from the cache, waits for a prefetch of it that is still running, or
+loads it inline on a miss. ``load`` returns
+``(value, size in bytes)``, and entries are evicted least recently used
+first to keep the total under a per-process byte budget. An item larger
+than the whole budget is returned but never cached.
+
+``stats()`` reports hits, misses, the hit rate, how many hits were
+served by a prefetch and how many misses waited for one, for the
+metrics endpoint.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class SizedLRU:
+    """LRU mapping bounded by the summed size of its values"""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.size = 0
+        self.evictions = 0
+        self._items = OrderedDict()  # key -> (value, size)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def keys(self):
+        return self._items.keys()
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        self._items.move_to_end(key)
+        return item
+
+    def put(self, key, value, size):
+        if size > self.budget:
+            return False
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self._items[key] = (value, size)
+        self.size += size
+        while self.size > self.budget:
+            _, (_, evicted) = self._items.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+        return True
+
+
+class Prefetcher:
+    """Warms a SizedLRU ahead of use on background threads"""
+
+    def __init__(self, budget=64 * 1024 * 1024, workers=2, max_pending=64):
+        self.max_pending = max_pending
+        self._cache = SizedLRU(budget)
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> future of a prefetch still running
+        self._prefetched = set()  # keys loaded by a prefetch and not used yet
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="signaura-prefetch")
+        self.hits = 0
+        self.misses = 0
+        self.prefetch_hits = 0
+        self.prefetch_waits = 0
+        self.prefetches = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def get(self, key, load):
+        with self._lock:
+            item = self._cache.get(key)
+            if item is not None:
+                self.hits += 1
+                if key in self._prefetched:
+                    self._prefetched.discard(key)
+                    self.prefetch_hits += 1
+                return item[0]
+            self.misses += 1
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.prefetch_waits += 1
+        if pending is not None:
+            # Already being loaded: wait for it rather than loading (and warming) it twice
+            try:
+                value = pending.result()
+            except Exception:
+                pass  # logged by the prefetch; load it here instead
+            else:
+                with self._lock:
+                    self._prefetched.discard(key)
+                return value
+        value, size = load()
+        with self._lock:
+            self._cache.put(key, value, size)
+        return value
+
+    def prefetch(self, key, load):
+        """Load ``key`` in the background unless it is cached or already on its way"""
+        with self._lock:
+            if key in self._cache or key in self._pending:
+                return
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self.prefetches += 1
+            # Registered under the lock, before _load can finish and remove it
+            self._pending[key] = self._executor.submit(self._load, key, load)
+
+    def _load(self, key, load):
+        try:
+            value, size = load()
+        except Exception:
+            logger.exception("Prefetch of %r failed", key)
+            with self._lock:
+                self.errors += 1
+                self._pending.pop(key, None)
+            raise
+        with self._lock:
+            self._pending.pop(key, None)
+            if self._cache.put(key, value, size):
+                self._prefetched.add(key)
+            # Forget prefetched keys that were evicted before use
+            if len(self._prefetched) > 2 * len(self._cache):
+                self._prefetched.intersection_update(self._cache.keys())
+        return value
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "prefetch_hits": self.prefetch_hits,
+                "prefetch_waits": self.prefetch_waits,
+                "prefetches": self.prefetches,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "evictions": self._cache.evictions,
+                "entries": len(self._cache),
+                "bytes": self._cache.size,
+                "budget_bytes": self._cache.budget,
+            }
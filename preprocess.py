@@ -0,0 +1,139 @@
+"""Upload decoding and preprocessing with content-hash caching.
+
+Phone photos are large JPEGs, but the recognizer only needs a small centre
+crop. ``decode_upload`` asks the JPEG decoder for a reduced-resolution draft
+(DCT scaling, so most of the pixels are never decoded), crops and resizes in
+one pass, and hands back a NumPy array for the model plus a small preview
+for the page. Camera photos are turned upright from their EXIF orientation
+first, so the crop and the preview match what the user took.
+
+Everything is keyed by a hash of the uploaded bytes, so a rerun or a
+re-submitted image reuses the decoded arrays and the earlier prediction.
+Predictions are also keyed by the recognizer version they came from, so a
+new model or a reloaded dictionary never serves an old answer.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+PreparedUpload = namedtuple("PreparedUpload", ["digest", "model_input", "preview", "original_size"])
+
+# EXIF tag of the camera's orientation; 1 is already upright
+ORIENTATION = 0x0112
+
+
+class InvalidUpload(ValueError):
+    """Raised when uploaded bytes are not an image we can decode"""
+
+
+def content_hash(data):
+    """Stable key for uploaded bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def centre_square(width, height):
+    """Box of the largest centred square inside a ``width x height`` image"""
+    side = min(width, height)
+    left = (width - side) // 2
+    top = (height - side) // 2
+    return (left, top, left + side, top + side)
+
+
+def decode_upload(data, model_size=(64, 64), preview_size=512, digest=None):
+    """Decode image bytes once into a model-ready array and a display preview"""
+    try:
+        return _decode_upload(data, model_size, preview_size, digest)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise InvalidUpload(f"not a readable image: {exc}") from exc
+
+
+def _decode_upload(data, model_size, preview_size, digest):
+    image = Image.open(io.BytesIO(data))
+    original_size = image.size
+
+    # JPEG only: let the decoder scale by 1/2, 1/4 or 1/8 while decoding.
+    # draft() never goes below the requested size, so both outputs stay sharp.
+    target = max(preview_size, *model_size)
+    scale = target / min(original_size)
+    if scale < 1:
+        image.draft("RGB", (int(original_size[0] * scale), int(original_size[1] * scale)))
+    # Transposes the reduced draft, not the full-size photo
+    if image.getexif().get(ORIENTATION, 1) != 1:
+        image = ImageOps.exif_transpose(image)
+    image = image.convert("RGB")
+
+    box = centre_square(*image.size)
+    model_image = image.resize(model_size, Image.BILINEAR, box=box)
+    # asarray goes through the array interface: one buffer copy, no float temporaries
+    model_input = np.asarray(model_image)
+
+    preview = image.copy()
+    preview.thumbnail((preview_size, preview_size), Image.BILINEAR)
+
+    return PreparedUpload(digest or content_hash(data), model_input, preview, original_size)
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping shared across sessions"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class UploadCache:
+    """Decoded uploads keyed by content hash; predictions by content hash and recognizer version"""
+
+    def __init__(self, model_size=(64, 64), preview_size=512, max_uploads=32, max_predictions=4096):
+        self.model_size = model_size
+        self.preview_size = preview_size
+        self.uploads = LRUCache(max_uploads)
+        self.predictions = LRUCache(max_predictions)
+
+    def prepare(self, data, digest=None):
+        """Return the PreparedUpload for these bytes, decoding only on a miss"""
+        digest = digest or content_hash(data)
+        prepared = self.uploads.get(digest)
+        if prepared is None:
+            prepared = decode_upload(data, self.model_size, self.preview_size, digest=digest)
+            self.uploads.put(digest, prepared)
+        return prepared
+
+    def prediction(self, digest, version=None):
+        return self.predictions.get((digest, version))
+
+    def store_prediction(self, digest, prediction, version=None):
+        self.predictions.put((digest, version), prediction)
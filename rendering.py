@@ -0,0 +1,92 @@
+"""HTML card templates for list-heavy pages.
+
+Each template is parsed once into literal and field parts. Every field is
+HTML-escaped unless it is listed as ``raw``, so user text can't inject
+markup. ``render_list`` joins a whole list of cards into one HTML string,
+which the page sends as a single markdown delta instead of one per item.
+Rendered cards are memoized by their field values.
+"""
+
+from functools import lru_cache
+from html import escape
+from string import Formatter
+
+
+class Template:
+    """A ``str.format``-style template, parsed once, with escaped fields"""
+
+    def __init__(self, source, raw=(), cache_size=4096):
+        self.parts = []
+        self.fields = []
+        for literal, field, spec, _ in Formatter().parse(source):
+            if field is None:
+                self.parts.append((literal, None, None, False))
+                continue
+            if field not in self.fields:
+                self.fields.append(field)
+            self.parts.append((literal, self.fields.index(field), spec, field in raw))
+        self._render = lru_cache(maxsize=cache_size)(self._render_uncached)
+
+    def render(self, **values):
+        return self._render(tuple(values[name] for name in self.fields))
+
+    def cache_info(self):
+        return self._render.cache_info()
+
+    def _render_uncached(self, values):
+        out = []
+        for literal, index, spec, raw in self.parts:
+            out.append(literal)
+            if index is not None:
+                text = format(values[index], spec)
+                out.append(text if raw else escape(text))
+        return "".join(out)
+
+
+# Templates are single lines: indented HTML would be read as a markdown code block
+DICTIONARY_CARD = Template(
+    '<div style="background-color: #f0f2f6; padding: 10px; margin: 5px 0; border-radius: 5px; text-align: center;">'
+    '<h5>{sign}</h5><p><small>{description}</small></p></div>'
+)
+
+SEARCH_RESULT_CARD = Template(
+    '<div style="background-color: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 8px; '
+    'border-left: 4px solid #007bff;"><h4>{sign} ({category})</h4><p>{description}</p></div>'
+)
+
+HISTORY_ITEM = Template(
+    '<div style="background-color: #f0f2f6; padding: 10px; margin: 5px 0; border-radius: 5px;">'
+    '<strong>{sign}</strong> - {confidence}<br><small>{time}</small></div>'
+)
+
+CHAT_MESSAGE = Template(
+    '<div class="chat-message {css_class}"><strong>{speaker}:</strong> {content}</div>'
+)
+
+PROGRESS_CARD = Template(
+    '<div style="background: {background}; padding: 20px; border-radius: 10px; text-align: center; color: white;">'
+    '<h3>{title}</h3><h2>{completed}/{total}</h2><p>{percent:.1f}% Complete</p></div>'
+)
+
+GRID = '<div style="display: grid; grid-template-columns: repeat({columns}, minmax(0, 1fr)); gap: {gap};">{items}</div>'
+
+
+def render_list(template, items):
+    """One HTML string for a list of field dicts"""
+    return "".join(template.render(**item) for item in items)
+
+
+def render_grid(template, items, columns=3, gap="0 1rem"):
+    """Cards laid out in a CSS grid, as one HTML string"""
+    return GRID.format(columns=columns, gap=gap, items=render_list(template, items))
+
+
+def render_chat(history):
+    return render_list(CHAT_MESSAGE, (
+        {
+            "css_class": "user-message" if message["role"] == "user" else "bot-message",
+            "speaker": "You" if message["role"] == "user" else "AI Tutor",
+            "content": message["content"],
+        }
+        for message in history
+    ))
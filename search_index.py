@@ -0,0 +1,190 @@
+"""Search index for the sign dictionary.
+
+The index is built once per dictionary version and answers the Dictionary
+page queries without walking every entry:
+
+* an exact-name map,
+* sorted name lists (global and per category) for prefix lookups,
+* a token index over sign names and descriptions, with a sorted token list
+  so the last, partially typed word of a query can be prefix-expanded.
+
+Entry ids are assigned category by category, so every category is a
+contiguous id range and a category filter is a bisect on a posting list.
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+# Ranking tiers, lower is better
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_TOKEN = 2
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+SearchHit = namedtuple("SearchHit", ["category", "sign", "data", "rank"])
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric tokens"""
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Immutable prefix/token index over a ``{category: {sign: data}}`` dictionary"""
+
+    def __init__(self, dictionary, version=None):
+        self.version = version
+        self.categories = []
+        self._entries = []          # id -> (category, sign, data)
+        self._ranges = {}           # category -> (start, end) id range
+        self._exact = {}            # lowercased sign -> [ids]
+        self._names = {}            # category (None = all) -> sorted [(name, id)]
+        self._entry_tokens = []     # id -> tuple of tokens
+        self._tokens = {}           # category (None = all) -> sorted tokens
+        postings = {}
+
+        for category, signs in dictionary.items():
+            start = len(self._entries)
+            category_tokens = set()
+            for sign, data in signs.items():
+                entry_id = len(self._entries)
+                name = sign.lower()
+                self._entries.append((category, sign, data))
+                self._exact.setdefault(name, []).append(entry_id)
+
+                tokens = tuple(dict.fromkeys(tokenize(sign) + tokenize(data.get("description", ""))))
+                self._entry_tokens.append(tokens)
+                category_tokens.update(tokens)
+                for token in tokens:
+                    posting = postings.get(token)
+                    if posting is None:
+                        posting = postings[token] = array("I")
+                    posting.append(entry_id)
+            self.categories.append(category)
+            self._ranges[category] = (start, len(self._entries))
+            self._tokens[category] = sorted(category_tokens)
+
+        all_names = sorted((sign.lower(), entry_id) for entry_id, (_, sign, _) in enumerate(self._entries))
+        self._names[None] = all_names
+        for category in self.categories:
+            self._names[category] = []
+        for item in all_names:
+            self._names[self._entries[item[1]][0]].append(item)
+
+        self._postings = postings
+        self._tokens[None] = sorted(postings)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def count(self, category=None):
+        """Number of signs in a category, or in the whole dictionary"""
+        if category is None:
+            return len(self._entries)
+        start, end = self._ranges.get(category, (0, 0))
+        return end - start
+
+    def entries(self, category=None, start=0, stop=None):
+        """Slice of a category (or the whole dictionary) in dictionary order.
+
+        Returns ``(category, sign, data)`` triples; only the slice is touched.
+        """
+        if category is None:
+            first, last = 0, len(self._entries)
+        else:
+            first, last = self._ranges.get(category, (0, 0))
+        stop = last - first if stop is None else min(stop, last - first)
+        return self._entries[first + start:first + max(stop, start)]
+
+    def search(self, query, category=None, limit=50):
+        """Return up to ``limit`` hits ranked exact name, name prefix, then token hit"""
+        q = " ".join(query.lower().split())
+        if not q or limit <= 0:
+            return []
+
+        lo, hi = self._ranges.get(category, (0, 0)) if category is not None else (0, len(self._entries))
+        hits = []
+        seen = set()
+
+        def add(entry_id, rank):
+            if entry_id not in seen and lo <= entry_id < hi:
+                seen.add(entry_id)
+                category_, sign, data = self._entries[entry_id]
+                hits.append(SearchHit(category_, sign, data, rank))
+
+        for entry_id in self._exact.get(q, ()):
+            add(entry_id, RANK_EXACT)
+
+        names = self._names.get(category, ())
+        pos = bisect_left(names, (q, -1))
+        while pos < len(names) and len(hits) < limit:
+            name, entry_id = names[pos]
+            if not name.startswith(q):
+                break
+            add(entry_id, RANK_PREFIX)
+            pos += 1
+
+        if len(hits) < limit:
+            for entry_id in self._token_matches(tokenize(q), category, lo, hi):
+                add(entry_id, RANK_TOKEN)
+                if len(hits) >= limit:
+                    break
+
+        return hits[:limit]
+
+    def _token_matches(self, tokens, category, lo, hi):
+        """Yield ids in [lo, hi) containing all complete tokens and the last token as a prefix"""
+        if not tokens:
+            return
+        *complete, partial = tokens
+
+        lists = []
+        for token in complete:
+            posting = self._postings.get(token)
+            if posting is None:
+                return
+            lists.append(posting)
+        lists.sort(key=len)
+
+        # Drive from whichever side is most selective: the rarest complete
+        # token, or the postings of every token the partial word expands to.
+        vocabulary = self._tokens.get(category, ())
+        first = bisect_left(vocabulary, partial)
+        budget = len(lists[0]) if lists else None
+        expanded = 0
+        pos = first
+        while pos < len(vocabulary) and vocabulary[pos].startswith(partial):
+            expanded += len(self._postings[vocabulary[pos]])
+            if budget is not None and expanded > budget:
+                break
+            pos += 1
+        else:
+            pos = first
+            while pos < len(vocabulary) and vocabulary[pos].startswith(partial):
+                posting = self._postings[vocabulary[pos]]
+                for i in range(bisect_left(posting, lo), len(posting)):
+                    entry_id = posting[i]
+                    if entry_id >= hi:
+                        break
+                    if all(_contains(other, entry_id) for other in lists):
+                        yield entry_id
+                pos += 1
+            return
+
+        driver, others = lists[0], lists[1:]
+        for i in range(bisect_left(driver, lo), len(driver)):
+            entry_id = driver[i]
+            if entry_id >= hi:
+                return
+            if all(_contains(other, entry_id) for other in others) and any(
+                t.startswith(partial) for t in self._entry_tokens[entry_id]
+            ):
+                yield entry_id
+
+
+def _contains(posting, entry_id):
+    i = bisect_left(posting, entry_id)
+    return i < len(posting) and posting[i] == entry_id
@@ -0,0 +1,276 @@
+"""Session state kept outside the Streamlit process.
+
+A browser session is identified by a random id carried in the page URL, and
+its persisted fields live in a shared backend, so any app process can pick
+the session up: after a restart, behind a load balancer without sticky
+sessions, or in a second tab.
+
+* Backends: ``MemoryBackend`` (one process, for development and tests),
+  ``SQLiteBackend`` (processes sharing one host) and ``RedisBackend``
+  (any number of hosts, needs the ``redis`` package).
+* Each session has a version that every write bumps. ``SessionStore.load``
+  keeps the fields it last saw in a process-local LRU and only fetches
+  them again when the backend's version differs.
+* ``SessionStore.save`` writes just the fields whose encoded value changed
+  since the last load or save of that session.
+* Values are compact JSON (sets included), zlib-compressed above
+  ``COMPRESS_OVER`` bytes.
+
+Usage, from an app's rerun:
+
+    fields, snapshot = store.load(sid)        # once per browser session
+    ...
+    snapshot = store.save(sid, values, snapshot)
+"""
+
+import json
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+COMPRESS_OVER = 512
+DEFAULT_TTL = 7 * 24 * 3600
+
+_RAW = b"j"
+_ZLIB = b"z"
+
+
+def new_session_id():
+    return secrets.token_urlsafe(18)
+
+
+def _default(value):
+    if isinstance(value, (set, frozenset)):
+        return {"$set": sorted(value, key=str)}
+    raise TypeError(f"{type(value).__name__} is not serializable")
+
+
+def _object_hook(obj):
+    if len(obj) == 1 and "$set" in obj:
+        return set(obj["$set"])
+    return obj
+
+
+def encode(value):
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+    if len(data) > COMPRESS_OVER:
+        return _ZLIB + zlib.compress(data, 6)
+    return _RAW + data
+
+
+def decode(blob):
+    blob = bytes(blob)
+    data = zlib.decompress(blob[1:]) if blob[:1] == _ZLIB else blob[1:]
+    return json.loads(data, object_hook=_object_hook)
+
+
+# Backends: get_version, load and save work on encoded field values
+class MemoryBackend:
+    """Sessions in this process only"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}  # sid -> (version, expires_at, {field: blob})
+
+    def get_version(self, sid):
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None or entry[1] < time.time():
+                return None
+            return entry[0]
+
+    def load(self, sid):
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None or entry[1] < time.time():
+                return None, {}
+            return entry[0], dict(entry[2])
+
+    def save(self, sid, changed, ttl):
+        with self._lock:
+            version, _, fields = self._sessions.get(sid, (0, 0, {}))
+            fields = {**fields, **changed}
+            self._sessions[sid] = (version + 1, time.time() + ttl, fields)
+            return version + 1
+
+    def delete(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+
+class SQLiteBackend:
+    """Sessions in a SQLite file shared by the processes of one host"""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS session_versions ("
+        "sid TEXT PRIMARY KEY, version INTEGER NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS session_fields ("
+        "sid TEXT NOT NULL, field TEXT NOT NULL, value BLOB NOT NULL, PRIMARY KEY (sid, field)) WITHOUT ROWID",
+    )
+    SQL_VERSION = "SELECT version FROM session_versions WHERE sid = ? AND expires_at >= ?"
+    SQL_FIELDS = "SELECT field, value FROM session_fields WHERE sid = ?"
+    SQL_BUMP = (
+        "INSERT INTO session_versions (sid, version, expires_at) VALUES (?, 1, ?) "
+        "ON CONFLICT (sid) DO UPDATE SET version = version + 1, expires_at = excluded.expires_at RETURNING version"
+    )
+    SQL_SET_FIELD = "INSERT OR REPLACE INTO session_fields (sid, field, value) VALUES (?, ?, ?)"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        for statement in self.SCHEMA:
+            conn.execute(statement)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_version(self, sid):
+        row = self._connection().execute(self.SQL_VERSION, (sid, time.time())).fetchone()
+        return row[0] if row else None
+
+    def load(self, sid):
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute(self.SQL_VERSION, (sid, time.time())).fetchone()
+            fields = dict(conn.execute(self.SQL_FIELDS, (sid,)).fetchall()) if row else {}
+        finally:
+            conn.execute("COMMIT")
+        return (row[0] if row else None), fields
+
+    def save(self, sid, changed, ttl):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(self.SQL_SET_FIELD, [(sid, field, blob) for field, blob in changed.items()])
+            version = conn.execute(self.SQL_BUMP, (sid, time.time() + ttl)).fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return version
+
+    def delete(self, sid):
+        conn = self._connection()
+        conn.execute("DELETE FROM session_fields WHERE sid = ?", (sid,))
+        conn.execute("DELETE FROM session_versions WHERE sid = ?", (sid,))
+
+
+class RedisBackend:
+    """Sessions in Redis: one hash per session, with the version in field ``_v``"""
+
+    VERSION_FIELD = "_v"
+
+    def __init__(self, url, prefix="signaura:session:"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImportError("The Redis session backend requires the redis package") from exc
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+
+    def get_version(self, sid):
+        version = self._redis.hget(self.prefix + sid, self.VERSION_FIELD)
+        return int(version) if version is not None else None
+
+    def load(self, sid):
+        fields = self._redis.hgetall(self.prefix + sid)
+        version = fields.pop(self.VERSION_FIELD.encode(), None)
+        if version is None:
+            return None, {}
+        return int(version), {field.decode(): value for field, value in fields.items()}
+
+    def save(self, sid, changed, ttl):
+        key = self.prefix + sid
+        pipe = self._redis.pipeline(transaction=True)
+        if changed:
+            pipe.hset(key, mapping=changed)
+        pipe.hincrby(key, self.VERSION_FIELD, 1)
+        pipe.expire(key, int(ttl))
+        # Results: [hset,] hincrby, expire
+        return int(pipe.execute()[-2])
+
+    def delete(self, sid):
+        self._redis.delete(self.prefix + sid)
+
+
+def backend_from_url(url):
+    """``memory``, ``sqlite:///path/to/file.db`` or ``redis://host:port/db``"""
+    if url in ("", "memory"):
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unknown session backend {url!r}")
+
+
+class SessionStore:
+    """Read-through cache and dirty tracking in front of a backend"""
+
+    def __init__(self, backend, ttl=DEFAULT_TTL, cache_size=10000):
+        self.backend = backend
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # sid -> (version, {field: blob})
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, sid):
+        """(values, snapshot) of a session; empty if the backend has never seen it"""
+        version = self.backend.get_version(sid)
+        if version is None:
+            return {}, {}
+        with self._lock:
+            cached = self._cache.get(sid)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(sid)
+                self.hits += 1
+                blobs = cached[1]
+            else:
+                blobs = None
+                self.misses += 1
+        if blobs is None:
+            version, blobs = self.backend.load(sid)
+            self._remember(sid, version, blobs)
+        return {field: decode(blob) for field, blob in blobs.items()}, dict(blobs)
+
+    def save(self, sid, values, snapshot):
+        """Write the fields that changed since ``snapshot``; returns the new snapshot"""
+        changed = {}
+        for field, value in values.items():
+            blob = encode(value)
+            if snapshot.get(field) != blob:
+                changed[field] = blob
+        if not changed:
+            return snapshot
+        snapshot = {**snapshot, **changed}
+        version = self.backend.save(sid, changed, self.ttl)
+        with self._lock:
+            cached = self._cache.get(sid)
+            # Another process wrote in between: the snapshot is not the whole session
+            if version != (cached[0] if cached is not None else 0) + 1:
+                self._cache.pop(sid, None)
+                return snapshot
+        self._remember(sid, version, snapshot)
+        return snapshot
+
+    def _remember(self, sid, version, blobs):
+        if version is None:
+            return
+        with self._lock:
+            self._cache[sid] = (version, blobs)
+            self._cache.move_to_end(sid)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
@@ -0,0 +1,299 @@
+"""Spaced-repetition scheduling (SM-2) for the lessons.
+
+Review state for every (user, category, sign) lives in one set of compact
+NumPy arrays, one row per reviewed sign:
+
+    ease (float32), interval in days (float32), repetitions (int16),
+    due day (int32), user id (int32), category id (int16)
+
+Grading applies SM-2 to any number of rows at once, and ``due_today``
+answers "what should everyone review today" with a few array operations
+over all users instead of a loop. For the lesson cards every (user,
+category) also has a heap of (due, row), so picking the next card is
+O(log n) whatever the size of the catalogue.
+
+Days are proleptic Gregorian ordinals (``date.toordinal()``).
+
+A user's rows can be loaded again (``load_user(..., replace=True)``) to
+pick up reviews saved by other app processes; the reload updates the
+user's rows in place and rebuilds their heaps.
+
+Batch use:
+
+    python srs.py due --db signaura.db
+"""
+
+import argparse
+import heapq
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# SM-2 quality grades offered on the lesson card
+AGAIN = 1
+GOOD = 4
+
+_DEAD = -1
+_NEVER = np.iinfo(np.int32).max
+
+
+def today():
+    return date.today().toordinal()
+
+
+def sm2(ease, interval, repetitions, quality):
+    """One SM-2 step for arrays of items; returns new (ease, interval, repetitions)"""
+    ease = np.asarray(ease, dtype=np.float32)
+    interval = np.asarray(interval, dtype=np.float32)
+    repetitions = np.asarray(repetitions, dtype=np.int16)
+    quality = np.asarray(quality, dtype=np.float32)
+
+    passed = quality >= 3
+    repetitions = np.where(passed, repetitions + 1, 0).astype(np.int16)
+    interval = np.where(
+        ~passed | (repetitions == 1), 1.0,
+        np.where(repetitions == 2, 6.0, np.rint(interval * ease)),
+    ).astype(np.float32)
+    # A failed item restarts its repetitions but keeps its ease
+    miss = 5.0 - quality
+    ease = np.where(passed, np.maximum(MIN_EASE, ease + 0.1 - miss * (0.08 + miss * 0.02)), ease)
+    return ease.astype(np.float32), interval, repetitions
+
+
+class ReviewScheduler:
+    """Review state of every user in shared arrays, plus per-user due heaps"""
+
+    def __init__(self, capacity=1024):
+        self._lock = threading.RLock()
+        self._size = 0
+        self.ease = np.empty(capacity, np.float32)
+        self.interval = np.empty(capacity, np.float32)
+        self.repetitions = np.empty(capacity, np.int16)
+        self.due = np.empty(capacity, np.int32)
+        self.user = np.empty(capacity, np.int32)
+        self.category = np.empty(capacity, np.int16)
+
+        self._rows = {}          # (username, category, sign) -> row
+        self._keys = []          # row -> (username, category, sign)
+        self._user_ids = {}
+        self._usernames = []
+        self._category_ids = {}
+        self._heaps = {}         # (user id, category id) -> [(due, row), ...]
+        self._loaded = {}        # username -> time.monotonic() of its last load
+
+    def __len__(self):
+        return len(self._rows)
+
+    # Loading
+    def is_loaded(self, username, max_age=None):
+        """Whether the user's reviews are loaded, and less than ``max_age`` seconds ago if given"""
+        loaded_at = self._loaded.get(username)
+        return loaded_at is not None and (max_age is None or time.monotonic() - loaded_at < max_age)
+
+    def load_user(self, username, rows, replace=False):
+        """Add a user's saved (username, category, sign, ease, interval, repetitions, due) rows.
+
+        With ``replace``, the rows become the user's whole review state:
+        cards missing from them are dropped.
+        """
+        rows = list(rows)
+        with self._lock:
+            if username in self._loaded and not replace:
+                return
+            if replace:
+                self._clear_user(username, {(name, category, sign) for name, category, sign, *_ in rows})
+            self.load(rows)
+            self._loaded[username] = time.monotonic()
+
+    def load(self, rows):
+        """Bulk-add saved rows (for one user or everyone)"""
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock:
+            index = np.fromiter((self._row_for(name, category, sign) for name, category, sign, *_ in rows),
+                                dtype=np.int64, count=len(rows))
+            values = np.array([row[3:7] for row in rows], dtype=np.float64)
+            self.ease[index] = values[:, 0]
+            self.interval[index] = values[:, 1]
+            self.repetitions[index] = values[:, 2]
+            self.due[index] = values[:, 3]
+            touched = set()
+            for row in index.tolist():
+                heap_key = (int(self.user[row]), int(self.category[row]))
+                self._heaps.setdefault(heap_key, []).append((int(self.due[row]), row))
+                touched.add(heap_key)
+            for heap_key in touched:
+                heapq.heapify(self._heaps[heap_key])
+
+    # Grading
+    def review(self, username, category, sign, quality, day=None):
+        """Grade one card; returns its new (ease, interval, repetitions, due)"""
+        with self._lock:
+            row = self._rows.get((username, category, sign))
+            if row is None:
+                row = self._row_for(username, category, sign)
+                self.ease[row] = DEFAULT_EASE
+                self.interval[row] = 0
+                self.repetitions[row] = 0
+            self.review_rows(np.array([row]), np.array([quality]), day)
+            return (float(self.ease[row]), float(self.interval[row]), int(self.repetitions[row]), int(self.due[row]))
+
+    def review_rows(self, rows, qualities, day=None):
+        """Grade many existing rows at once"""
+        day = today() if day is None else day
+        with self._lock:
+            ease, interval, repetitions = sm2(self.ease[rows], self.interval[rows], self.repetitions[rows], qualities)
+            self.ease[rows] = ease
+            self.interval[rows] = interval
+            self.repetitions[rows] = repetitions
+            self.due[rows] = day + interval.astype(np.int32)
+            for row in np.asarray(rows).tolist():
+                heap = self._heaps[(int(self.user[row]), int(self.category[row]))]
+                heapq.heappush(heap, (int(self.due[row]), row))
+
+    # Per-user queue for the lesson cards
+    def next_due(self, username, category, day=None):
+        """Sign of this user's most overdue card in a category, or None"""
+        heap = self._heap(username, category)
+        if heap is None:
+            return None
+        day = today() if day is None else day
+        with self._lock:
+            self._drop_stale(heap)
+            if heap and heap[0][0] <= day:
+                return self._keys[heap[0][1]][2]
+        return None
+
+    def due_count(self, username, category, day=None):
+        """Cards of this user due in a category; each card once, however often it was queued"""
+        heap = self._heap(username, category)
+        if heap is None:
+            return 0
+        day = today() if day is None else day
+        with self._lock:
+            # A card graded again with the same due day has several live entries
+            return len({row for due, row in heap if due <= day and self.due[row] == due})
+
+    def forget_user(self, username):
+        """Drop a user's review state (e.g. after a progress reset)"""
+        with self._lock:
+            self._clear_user(username, set())
+            self._loaded.pop(username, None)
+
+    # Batch queries over every user
+    def due_today(self, day=None):
+        """{username: rows due, most overdue first} for every user"""
+        day = today() if day is None else day
+        with self._lock:
+            n = self._size
+            rows = np.flatnonzero((self.due[:n] <= day) & (self.user[:n] != _DEAD))
+            rows = rows[np.lexsort((self.due[rows], self.user[rows]))]
+            users = self.user[rows]
+            bounds = np.flatnonzero(np.diff(users)) + 1
+            return {self._usernames[group_users[0]]: group
+                    for group, group_users in zip(np.split(rows, bounds), np.split(users, bounds)) if len(group)}
+
+    def due_counts(self, day=None):
+        """{username: number of cards due} for every user"""
+        day = today() if day is None else day
+        with self._lock:
+            n = self._size
+            live = self.user[:n] != _DEAD
+            counts = np.bincount(self.user[:n][live & (self.due[:n] <= day)], minlength=len(self._usernames))
+            return {name: int(count) for name, count in zip(self._usernames, counts) if count}
+
+    def card(self, row):
+        """(username, category, sign) of a row"""
+        return self._keys[row]
+
+    # Internals
+    def _heap(self, username, category):
+        user_id = self._user_ids.get(username)
+        category_id = self._category_ids.get(category)
+        if user_id is None or category_id is None:
+            return None
+        return self._heaps.get((user_id, category_id))
+
+    def _clear_user(self, username, keep):
+        """Drop a user's cards except those in ``keep``, and empty their heaps for a reload"""
+        user_id = self._user_ids.get(username)
+        if user_id is None:
+            return
+        rows = [row for row in np.flatnonzero(self.user[:self._size] == user_id).tolist()
+                if self._keys[row] not in keep]
+        self.user[rows] = _DEAD
+        self.due[rows] = _NEVER
+        for row in rows:
+            del self._rows[self._keys[row]]
+        for heap_key in [key for key in self._heaps if key[0] == user_id]:
+            self._heaps[heap_key] = []
+
+    def _drop_stale(self, heap):
+        while heap:
+            due, row = heap[0]
+            if self.due[row] == due and self.user[row] != _DEAD:
+                return
+            heapq.heappop(heap)
+
+    def _row_for(self, username, category, sign):
+        key = (username, category, sign)
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+        if self._size == len(self.due):
+            self._grow()
+        row = self._size
+        self._size += 1
+        self._rows[key] = row
+        self._keys.append(key)
+        user_id = self._user_ids.get(username)
+        if user_id is None:
+            user_id = self._user_ids[username] = len(self._usernames)
+            self._usernames.append(username)
+        category_id = self._category_ids.setdefault(category, len(self._category_ids))
+        self.user[row] = user_id
+        self.category[row] = category_id
+        self._heaps.setdefault((user_id, category_id), [])
+        return row
+
+    def _grow(self):
+        capacity = max(1024, len(self.due) * 2)
+        for name in ("ease", "interval", "repetitions", "due", "user", "category"):
+            old = getattr(self, name)
+            new = np.empty(capacity, old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+
+def main(argv=None):
+    from storage import Store
+
+    parser = argparse.ArgumentParser(description="Spaced-repetition batch jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    due = commands.add_parser("due", help="count the cards every user should review on a day")
+    due.add_argument("--db", default="signaura.db")
+    due.add_argument("--day", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args(argv)
+
+    store = Store(args.db)
+    scheduler = ReviewScheduler()
+    scheduler.load(store.load_reviews())
+    store.close()
+
+    start = time.perf_counter()
+    counts = scheduler.due_counts(args.day.toordinal())
+    elapsed = time.perf_counter() - start
+    for username, count in sorted(counts.items()):
+        print(f"{username}\t{count}")
+    print(f"{sum(counts.values())} cards due for {len(counts)} users on {args.day} "
+          f"({len(scheduler)} reviewed cards, {elapsed * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
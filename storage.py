@@ -0,0 +1,470 @@
+"""SQLite-backed persistent store for users, learning progress, chat, translation history and learning events.
+
+* WAL journal, so readers never block on the writer and several app
+  processes can share one database file.
+* A small pool of long-lived connections. Every query uses one of the
+  module-level SQL strings, so each connection's statement cache keeps them
+  compiled (prepared) after first use.
+* Progress, cursor, chat, translation and event writes are write-behind: button handlers only
+  enqueue them, and a background writer commits them in batches, one
+  transaction per batch. ``flush()`` waits until everything queued so far
+  is on disk. A batch that fails is retried, then applied one statement
+  at a time, so a bad statement only loses itself.
+"""
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("alphabets", "numbers", "words")
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = [
+    """
+    CREATE TABLE users (
+        username   TEXT PRIMARY KEY,
+        email      TEXT NOT NULL DEFAULT '',
+        password   TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE TABLE progress (
+        username     TEXT NOT NULL,
+        category     TEXT NOT NULL,
+        sign         TEXT NOT NULL,
+        completed_at REAL NOT NULL,
+        PRIMARY KEY (username, category, sign)
+    ) WITHOUT ROWID;
+    CREATE TABLE progress_cursor (
+        username TEXT NOT NULL,
+        category TEXT NOT NULL,
+        current  INTEGER NOT NULL,
+        PRIMARY KEY (username, category)
+    ) WITHOUT ROWID;
+    CREATE TABLE chat_messages (
+        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+        username   TEXT NOT NULL,
+        role       TEXT NOT NULL,
+        content    TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX chat_messages_user ON chat_messages (username, id);
+    """,
+    # Hashed passwords; the plaintext column is cleared as each user logs in
+    """
+    ALTER TABLE users ADD COLUMN password_hash TEXT NOT NULL DEFAULT '';
+    """,
+    # Spaced-repetition review state (due is a proleptic Gregorian day ordinal)
+    """
+    CREATE TABLE reviews (
+        username    TEXT NOT NULL,
+        category    TEXT NOT NULL,
+        sign        TEXT NOT NULL,
+        ease        REAL NOT NULL,
+        interval    REAL NOT NULL,
+        repetitions INTEGER NOT NULL,
+        due         INTEGER NOT NULL,
+        PRIMARY KEY (username, category, sign)
+    ) WITHOUT ROWID;
+    """,
+    # Translation history, keyed by user and time (created_at in microseconds)
+    """
+    CREATE TABLE translations (
+        username   TEXT NOT NULL,
+        created_at INTEGER NOT NULL,
+        direction  TEXT NOT NULL,
+        source     TEXT NOT NULL,
+        result     TEXT NOT NULL,
+        confidence REAL,
+        latency_ms REAL,
+        PRIMARY KEY (username, created_at)
+    ) WITHOUT ROWID;
+    """,
+    # Learning-event log and its rollups (day is a local-date ordinal)
+    """
+    CREATE TABLE events (
+        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+        username   TEXT NOT NULL,
+        session    TEXT NOT NULL,
+        kind       TEXT NOT NULL,
+        category   TEXT,
+        sign       TEXT,
+        created_at REAL NOT NULL,
+        day        INTEGER NOT NULL
+    );
+    CREATE TABLE daily_stats (
+        username        TEXT NOT NULL,
+        day             INTEGER NOT NULL,
+        lessons_viewed  INTEGER NOT NULL,
+        signs_completed INTEGER NOT NULL,
+        translations    INTEGER NOT NULL,
+        sessions        INTEGER NOT NULL,
+        study_seconds   REAL NOT NULL,
+        PRIMARY KEY (username, day)
+    ) WITHOUT ROWID;
+    CREATE TABLE user_stats (
+        username       TEXT PRIMARY KEY,
+        last_day       INTEGER,
+        current_streak INTEGER NOT NULL,
+        best_streak    INTEGER NOT NULL,
+        sessions       INTEGER NOT NULL,
+        study_seconds  REAL NOT NULL
+    ) WITHOUT ROWID;
+    """,
+]
+
+SQL_GET_USER = "SELECT username, email, password, password_hash, created_at FROM users WHERE username = ?"
+SQL_INSERT_USER = "INSERT INTO users (username, email, password, password_hash, created_at) VALUES (?, ?, '', ?, ?)"
+SQL_SET_PASSWORD_HASH = "UPDATE users SET password_hash = ?, password = '' WHERE username = ?"
+SQL_COMPLETED = "SELECT category, sign FROM progress WHERE username = ?"
+SQL_IS_COMPLETED = "SELECT 1 FROM progress WHERE username = ? AND category = ? AND sign = ?"
+SQL_CURSORS = "SELECT category, current FROM progress_cursor WHERE username = ?"
+SQL_MARK_COMPLETED = "INSERT OR IGNORE INTO progress (username, category, sign, completed_at) VALUES (?, ?, ?, ?)"
+SQL_SET_CURSOR = (
+    "INSERT INTO progress_cursor (username, category, current) VALUES (?, ?, ?) "
+    "ON CONFLICT (username, category) DO UPDATE SET current = excluded.current"
+)
+SQL_RESET_PROGRESS = "DELETE FROM progress WHERE username = ?"
+SQL_RESET_CURSORS = "DELETE FROM progress_cursor WHERE username = ?"
+SQL_REVIEWS = "SELECT username, category, sign, ease, interval, repetitions, due FROM reviews WHERE username = ?"
+SQL_ALL_REVIEWS = "SELECT username, category, sign, ease, interval, repetitions, due FROM reviews"
+SQL_SAVE_REVIEW = (
+    "INSERT INTO reviews (username, category, sign, ease, interval, repetitions, due) VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (username, category, sign) DO UPDATE SET "
+    "ease = excluded.ease, interval = excluded.interval, repetitions = excluded.repetitions, due = excluded.due"
+)
+SQL_RESET_REVIEWS = "DELETE FROM reviews WHERE username = ?"
+SQL_APPEND_TRANSLATION = (
+    "INSERT OR IGNORE INTO translations (username, created_at, direction, source, result, confidence, latency_ms) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_RECENT_TRANSLATIONS = (
+    "SELECT created_at, direction, source, result, confidence, latency_ms FROM translations "
+    "WHERE username = ? ORDER BY created_at DESC LIMIT ?"
+)
+SQL_TRANSLATIONS_BEFORE = (
+    "SELECT created_at, direction, source, result, confidence, latency_ms FROM translations "
+    "WHERE username = ? AND created_at < ? ORDER BY created_at DESC LIMIT ?"
+)
+SQL_APPEND_EVENT = (
+    "INSERT INTO events (username, session, kind, category, sign, created_at, day) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_ALL_EVENTS = "SELECT username, session, kind, created_at, day FROM events"
+SQL_ADD_DAILY_STATS = (
+    "INSERT INTO daily_stats (username, day, lessons_viewed, signs_completed, translations, sessions, study_seconds) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (username, day) DO UPDATE SET "
+    "lessons_viewed = lessons_viewed + excluded.lessons_viewed, "
+    "signs_completed = signs_completed + excluded.signs_completed, "
+    "translations = translations + excluded.translations, "
+    "sessions = sessions + excluded.sessions, "
+    "study_seconds = study_seconds + excluded.study_seconds"
+)
+SQL_INSERT_DAILY_STATS = (
+    "INSERT INTO daily_stats (username, day, lessons_viewed, signs_completed, translations, sessions, study_seconds) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_USER_STATS = (
+    "SELECT last_day, current_streak, best_streak, sessions, study_seconds FROM user_stats WHERE username = ?"
+)
+SQL_SAVE_USER_STATS = (
+    "INSERT OR REPLACE INTO user_stats (username, last_day, current_streak, best_streak, sessions, study_seconds) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+# Streak after an event on day excluded.last_day, from the stored row; SET expressions see the old row
+_NEXT_STREAK = (
+    "CASE WHEN last_day IS NULL OR excluded.last_day > last_day + 1 THEN 1 "
+    "WHEN excluded.last_day = last_day + 1 THEN current_streak + 1 ELSE current_streak END"
+)
+SQL_ADD_USER_STATS = (
+    "INSERT INTO user_stats (username, last_day, current_streak, best_streak, sessions, study_seconds) "
+    "VALUES (?, ?, 1, 1, ?, ?) ON CONFLICT (username) DO UPDATE SET "
+    f"current_streak = {_NEXT_STREAK}, "
+    f"best_streak = MAX(best_streak, {_NEXT_STREAK}), "
+    "last_day = MAX(COALESCE(last_day, excluded.last_day), excluded.last_day), "
+    "sessions = sessions + excluded.sessions, "
+    "study_seconds = study_seconds + excluded.study_seconds"
+)
+SQL_APPEND_CHAT = "INSERT INTO chat_messages (username, role, content, created_at) VALUES (?, ?, ?, ?)"
+SQL_RECENT_CHAT = "SELECT role, content FROM chat_messages WHERE username = ? ORDER BY id DESC LIMIT ?"
+SQL_CLEAR_CHAT = "DELETE FROM chat_messages WHERE username = ?"
+
+
+def empty_progress():
+    """Per-category lesson cursor plus the set of completed signs"""
+    return {category: {'current': 0, 'completed': set()} for category in CATEGORIES}
+
+
+class Store:
+    """Connection pool, prepared queries and a write-behind queue over one SQLite file"""
+
+    def __init__(self, path, pool_size=4, flush_interval=0.2, max_batch=500, retry_delay=0.5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.retry_delay = retry_delay
+        self._pool = queue.LifoQueue()
+        self._pending = queue.Queue()
+        self._closed = False
+
+        conn = self._new_connection()
+        try:
+            self._migrate(conn)
+        finally:
+            conn.close()
+        for _ in range(pool_size):
+            self._pool.put(self._new_connection())
+
+        self._writer = threading.Thread(target=self._write_loop, name="signaura-store-writer", daemon=True)
+        self._writer.start()
+        # Don't lose queued writes when the server shuts down
+        atexit.register(self.close)
+
+    # Connections
+    def _new_connection(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None,
+                               check_same_thread=False, cached_statements=128)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=10000")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection"""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _migrate(self, conn):
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, script in enumerate(MIGRATIONS[version:], version + 1):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have migrated while we waited for the lock
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= number:
+                    conn.execute("COMMIT")
+                    continue
+                for statement in script.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    # Users
+    def get_user(self, username):
+        with self.connection() as conn:
+            row = conn.execute(SQL_GET_USER, (username,)).fetchone()
+        if row is None:
+            return None
+        return {"username": row[0], "email": row[1], "password": row[2], "password_hash": row[3], "created_at": row[4]}
+
+    def create_user(self, username, email, password_hash):
+        """Insert a user; returns False if the username is taken"""
+        with self.connection() as conn:
+            try:
+                conn.execute(SQL_INSERT_USER, (username, email, password_hash, time.time()))
+            except sqlite3.IntegrityError:
+                return False
+        return True
+
+    def set_password_hash(self, username, password_hash):
+        with self.connection() as conn:
+            conn.execute(SQL_SET_PASSWORD_HASH, (password_hash, username))
+
+    # Progress
+    def load_progress(self, username):
+        progress = empty_progress()
+        with self.connection() as conn:
+            for category, sign in conn.execute(SQL_COMPLETED, (username,)):
+                progress.setdefault(category, {'current': 0, 'completed': set()})['completed'].add(sign)
+            for category, current in conn.execute(SQL_CURSORS, (username,)):
+                progress.setdefault(category, {'current': 0, 'completed': set()})['current'] = current
+        return progress
+
+    def is_completed(self, username, category, sign):
+        with self.connection() as conn:
+            return conn.execute(SQL_IS_COMPLETED, (username, category, sign)).fetchone() is not None
+
+    def mark_completed(self, username, category, sign):
+        self._enqueue(SQL_MARK_COMPLETED, (username, category, sign, time.time()))
+
+    def set_cursor(self, username, category, current):
+        self._enqueue(SQL_SET_CURSOR, (username, category, current))
+
+    def reset_progress(self, username):
+        self._enqueue(SQL_RESET_PROGRESS, (username,))
+        self._enqueue(SQL_RESET_CURSORS, (username,))
+        self._enqueue(SQL_RESET_REVIEWS, (username,))
+
+    # Spaced repetition
+    def load_reviews(self, username=None):
+        """(username, category, sign, ease, interval, repetitions, due) rows for one user, or everyone"""
+        with self.connection() as conn:
+            if username is None:
+                return conn.execute(SQL_ALL_REVIEWS).fetchall()
+            return conn.execute(SQL_REVIEWS, (username,)).fetchall()
+
+    def save_review(self, username, category, sign, ease, interval, repetitions, due):
+        self._enqueue(SQL_SAVE_REVIEW, (username, category, sign, ease, interval, repetitions, due))
+
+    # Translation history
+    def append_translation(self, username, created_at, direction, source, result, confidence, latency_ms):
+        self._enqueue(SQL_APPEND_TRANSLATION, (username, created_at, direction, source, result, confidence, latency_ms))
+
+    def translations(self, username, before=None, limit=20):
+        """Newest first: (created_at, direction, source, result, confidence, latency_ms) rows before a timestamp"""
+        with self.connection() as conn:
+            if before is None:
+                return conn.execute(SQL_RECENT_TRANSLATIONS, (username, limit)).fetchall()
+            return conn.execute(SQL_TRANSLATIONS_BEFORE, (username, before, limit)).fetchall()
+
+    # Learning events and their rollups
+    def append_event(self, username, session, kind, category, sign, created_at, day):
+        self._enqueue(SQL_APPEND_EVENT, (username, session, kind, category, sign, created_at, day))
+
+    def add_daily_stats(self, username, day, lessons_viewed=0, signs_completed=0, translations=0, sessions=0,
+                        study_seconds=0.0):
+        """Add to a user's counters for one day"""
+        self._enqueue(SQL_ADD_DAILY_STATS,
+                      (username, day, lessons_viewed, signs_completed, translations, sessions, study_seconds))
+
+    def load_user_stats(self, username):
+        with self.connection() as conn:
+            row = conn.execute(SQL_USER_STATS, (username,)).fetchone()
+        if row is None:
+            return None
+        return {"last_day": row[0], "current_streak": row[1], "best_streak": row[2], "sessions": row[3],
+                "study_seconds": row[4]}
+
+    def add_user_stats(self, username, day, sessions=0, study_seconds=0.0):
+        """Fold one event into a user's totals and streaks in SQL, so app processes never overwrite each other"""
+        self._enqueue(SQL_ADD_USER_STATS, (username, day, sessions, study_seconds))
+
+    def replace_rollups(self, daily_rows, user_rows):
+        """Swap in rebuilt daily_stats and user_stats rows in one transaction"""
+        self.flush()
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM daily_stats")
+                conn.execute("DELETE FROM user_stats")
+                conn.executemany(SQL_INSERT_DAILY_STATS, daily_rows)
+                conn.executemany(SQL_SAVE_USER_STATS, user_rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    # Chat history
+    def append_chat(self, username, role, content):
+        self._enqueue(SQL_APPEND_CHAT, (username, role, content, time.time()))
+
+    def recent_chat(self, username, limit=100):
+        """Newest ``limit`` messages, oldest first"""
+        with self.connection() as conn:
+            rows = conn.execute(SQL_RECENT_CHAT, (username, limit)).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def clear_chat(self, username):
+        self._enqueue(SQL_CLEAR_CHAT, (username,))
+
+    # Write-behind
+    def _enqueue(self, sql, params):
+        if self._closed:
+            raise RuntimeError("store is closed")
+        self._pending.put((sql, params))
+
+    def flush(self, timeout=None):
+        """Block until every write queued before this call has been committed"""
+        done = threading.Event()
+        self._pending.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._pending.put(None)
+        self._writer.join()
+        while not self._pool.empty():
+            self._pool.get().close()
+
+    def _write_loop(self):
+        conn = self._new_connection()
+        try:
+            while True:
+                item = self._pending.get()
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                while item is not None and not isinstance(item, threading.Event) and len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._pending.get(timeout=remaining) if remaining > 0 else self._pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+
+                writes = [entry for entry in batch if isinstance(entry, tuple)]
+                if writes:
+                    self._apply(conn, writes)
+                for entry in batch:
+                    if isinstance(entry, threading.Event):
+                        entry.set()
+                if batch[-1] is None:
+                    return
+        finally:
+            conn.close()
+
+    def _apply(self, conn, writes):
+        """Commit a batch; retry it once, then fall back to one transaction per statement"""
+        try:
+            self._commit(conn, writes)
+            return
+        except sqlite3.Error:
+            logger.warning("Write-behind batch of %d statements failed; retrying", len(writes), exc_info=True)
+        time.sleep(self.retry_delay)
+        try:
+            self._commit(conn, writes)
+            return
+        except sqlite3.Error:
+            logger.warning("Retry failed; applying %d statements one at a time", len(writes))
+        dropped = 0
+        for sql, params in writes:
+            try:
+                self._commit(conn, [(sql, params)])
+            except sqlite3.Error:
+                dropped += 1
+                logger.exception("Dropped write-behind statement %r with %r", sql, params)
+        if dropped:
+            logger.error("Dropped %d of %d write-behind statements", dropped, len(writes))
+
+    @staticmethod
+    def _commit(conn, writes):
+        """Apply writes in order, grouping consecutive runs of one statement into executemany"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            start = 0
+            while start < len(writes):
+                sql = writes[start][0]
+                end = start
+                while end < len(writes) and writes[end][0] == sql:
+                    end += 1
+                conn.executemany(sql, [params for _, params in writes[start:end]])
+                start = end
+            conn.execute("COMMIT")
+        except Exception:
+            # Some errors (e.g. a full disk) already rolled the transaction back
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
@@ -0,0 +1,25 @@
+"""Page registry: every route of the app is a module, imported on its first visit.
+
+``render(page)`` imports the page's module the first time any session in
+the process opens it, so a cold process only loads the code and the
+dependencies of the pages people actually visit. Unknown routes fall back
+to the dashboard.
+"""
+
+import importlib
+
+# Route -> (module, function drawing the page)
+PAGES = {
+    "Login": ("views.login", "login_page"),
+    "Dashboard": ("views.dashboard", "dashboard_page"),
+    "Learning": ("views.learning", "learning_page"),
+    "Translator": ("views.translator", "translator_page"),
+    "Chatbot": ("views.chatbot", "chatbot_page"),
+    "Dictionary": ("views.dictionary", "dictionary_page"),
+    "Profile": ("views.profile", "profile_page"),
+}
+DEFAULT_PAGE = "Dashboard"
+
+def render(page):
+    module, function = PAGES.get(page, PAGES[DEFAULT_PAGE])
+    getattr(importlib.import_module(module), function)()
@@ -0,0 +1,102 @@
+"""AI learning assistant chat"""
+
+import streamlit as st
+
+from assistant import IntentEngine
+from core import CHAT_VISIBLE, CHAT_WINDOW, fragment, get_store, sign_dictionary
+from rendering import render_chat
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_intent_engine(version, _dictionary):
+    """Compile the assistant's intent patterns once per dictionary version"""
+    return IntentEngine(_dictionary)
+
+# Chatbot
+def chatbot_page():
+    st.markdown('<h1 class="main-header">🤖 AI Learning Assistant</h1>', unsafe_allow_html=True)
+    
+    chat_panel()
+
+@fragment
+def chat_panel():
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.subheader("Chat with your AI tutor")
+        
+        # Display chat history: only the latest messages, as a single element
+        history = visible_chat_history()
+        if len(history) >= st.session_state.chat_visible:
+            st.button("Show earlier messages", key="chat_earlier", on_click=show_earlier_messages)
+        
+        chat_container = st.container()
+        
+        with chat_container:
+            if history:
+                st.markdown(render_chat(history), unsafe_allow_html=True)
+        
+        # Chat input
+        st.text_input("Ask me anything about sign language:", placeholder="How do I sign 'hello'?", key="chat_input")
+        
+        col_a, col_b = st.columns([1, 4])
+        with col_a:
+            st.button("Send", use_container_width=True, on_click=send_chat_message)
+        
+        with col_b:
+            st.button("Clear Chat", use_container_width=True, on_click=clear_chat)
+    
+    with col2:
+        st.write("**Quick Help**")
+        
+        quick_questions = [
+            "How do I sign 'hello'?",
+            "Show me the alphabet",
+            "What's my progress?",
+            "Practice numbers",
+            "Common phrases"
+        ]
+        
+        for question in quick_questions:
+            st.button(question, key=f"quick_{question}", use_container_width=True, on_click=ask_assistant, args=(question,))
+
+def ask_assistant(question):
+    add_chat_message("user", question)
+    
+    # Generate AI response (placeholder - in production use actual AI)
+    ai_response = generate_ai_response(question)
+    add_chat_message("assistant", ai_response)
+
+def send_chat_message():
+    if st.session_state.chat_input:
+        ask_assistant(st.session_state.chat_input)
+
+def clear_chat():
+    st.session_state.chat_history = []
+    st.session_state.chat_visible = CHAT_VISIBLE
+    get_store().clear_chat(st.session_state.username)
+
+def show_earlier_messages():
+    st.session_state.chat_visible += CHAT_VISIBLE
+
+def add_chat_message(role, content):
+    history = st.session_state.chat_history
+    history.append({"role": role, "content": content})
+    # Older messages stay in the store; the session only keeps a bounded window
+    del history[:-CHAT_WINDOW]
+    get_store().append_chat(st.session_state.username, role, content)
+
+def visible_chat_history():
+    """Latest messages to show, reading from the store only past the session window"""
+    visible = st.session_state.chat_visible
+    if visible <= CHAT_WINDOW:
+        return st.session_state.chat_history[-visible:]
+    # The latest messages may still be waiting in the write-behind queue
+    store = get_store()
+    store.flush()
+    return store.recent_chat(st.session_state.username, limit=visible)
+
+def generate_ai_response(user_input):
+    """Answer from the compiled intent engine"""
+    progress = {category: len(state['completed']) for category, state in st.session_state.learning_progress.items()}
+    dictionary = sign_dictionary()
+    return get_intent_engine(dictionary.version, dictionary).respond(user_input, progress)
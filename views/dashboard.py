@@ -0,0 +1,57 @@
+"""Dashboard: learning stats and shortcuts to the main features"""
+
+import streamlit as st
+
+from core import streak_label, user_stats
+
+# Dashboard
+def dashboard_page():
+    st.markdown('<h1 class="main-header">🤟 Signaura Dashboard</h1>', unsafe_allow_html=True)
+    st.markdown(f"### Welcome back, {st.session_state.username}! 👋")
+    
+    # Quick stats
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Letters Learned", len(st.session_state.learning_progress['alphabets']['completed']), "2")
+    with col2:
+        st.metric("Numbers Learned", len(st.session_state.learning_progress['numbers']['completed']), "1")
+    with col3:
+        st.metric("Words Learned", len(st.session_state.learning_progress['words']['completed']), "3")
+    with col4:
+        st.metric("Study Streak", streak_label(user_stats()["current_streak"]))
+    
+    st.markdown("---")
+    
+    # Feature cards
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("""
+        <div class="feature-card">
+            <h3>📚 Learn Sign Language</h3>
+            <p>Start with alphabets, numbers, and basic words</p>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button("Start Learning", key="learn_btn", use_container_width=True):
+            st.session_state.current_page = "Learning"
+    
+    with col2:
+        st.markdown("""
+        <div class="feature-card">
+            <h3>🔄 Translator</h3>
+            <p>Convert signs to text and speech</p>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button("Open Translator", key="translate_btn", use_container_width=True):
+            st.session_state.current_page = "Translator"
+    
+    with col3:
+        st.markdown("""
+        <div class="feature-card">
+            <h3>🤖 AI Assistant</h3>
+            <p>Get help with your learning journey</p>
+        </div>
+        """, unsafe_allow_html=True)
+        if st.button("Chat with AI", key="chat_btn", use_container_width=True):
+            st.session_state.current_page = "Chatbot"
@@ -0,0 +1,154 @@
+"""Sign dictionary: search and paged browsing"""
+
+import streamlit as st
+
+from core import get_instrumentation, sign_clip_url, sign_dictionary
+from rendering import DICTIONARY_CARD, SEARCH_RESULT_CARD, render_grid, render_list
+from search_index import SearchIndex
+
+SEARCH_RESULT_LIMIT = 50
+
+DICTIONARY_PAGE_SIZES = [12, 24, 48, 96]
+
+# Keyed on the dictionary version; the dictionary itself is passed unhashed
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_search_index(version, _dictionary):
+    """Build the dictionary search index once per dictionary version"""
+    return SearchIndex(_dictionary, version=version)
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def get_dictionary_page(version, category, page, page_size, _dictionary):
+    """One page of the dictionary grid, cached per category filter and page"""
+    start = page * page_size
+    return get_search_index(version, _dictionary).entries(category, start, start + page_size)
+
+def search_index():
+    dictionary = sign_dictionary()
+    return get_search_index(dictionary.version, dictionary)
+
+# Dictionary
+def dictionary_page():
+    st.markdown('<h1 class="main-header">📖 Sign Language Dictionary</h1>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Search functionality
+        search_term = st.text_input("🔍 Search for a sign:", placeholder="Enter a letter, number, or word...")
+        
+        index = search_index()
+        category_filter = st.selectbox(
+            "Filter by category:",
+            ["All"] + [category.title() for category in index.categories],
+            key="dict_filter",
+        )
+        
+        # Display results
+        if search_term:
+            st.subheader(f"Search results for: '{search_term}'")
+            show_search_results(search_term, category_filter)
+        else:
+            st.subheader("Browse Dictionary")
+            show_all_signs(category_filter)
+    
+    with col2:
+        st.write("**Quick Navigation**")
+        
+        st.button("📝 All Alphabets", use_container_width=True, on_click=jump_to_category, args=("Alphabets",))
+        st.button("🔢 All Numbers", use_container_width=True, on_click=jump_to_category, args=("Numbers",))
+        st.button("💬 Common Words", use_container_width=True, on_click=jump_to_category, args=("Words",))
+        
+        st.markdown("---")
+        st.write("**Statistics**")
+        st.metric("Total Signs", len(index))
+        st.metric("Categories", len(index.categories))
+
+def show_search_results(search_term, category_filter):
+    index = search_index()
+    category = None if category_filter == "All" else category_filter.lower()
+    with get_instrumentation().section("search"):
+        results = index.search(search_term, category=category, limit=SEARCH_RESULT_LIMIT)
+    
+    if results:
+        if len(results) == SEARCH_RESULT_LIMIT:
+            st.caption(f"Showing the top {SEARCH_RESULT_LIMIT} matches. Refine your search to narrow them down.")
+        
+        # All result cards go out as one element
+        st.markdown(render_list(SEARCH_RESULT_CARD, (
+            {"sign": result.sign.upper(), "category": result.category.title(), "description": result.data['description']}
+            for result in results
+        )), unsafe_allow_html=True)
+        
+        by_key = {(result.category, result.sign): result for result in results}
+        choice = st.selectbox("Choose a sign:", list(by_key), key="search_choice",
+                              format_func=lambda key: f"{key[1]} ({key[0].title()})")
+        chosen = by_key[choice]
+        
+        col_a, col_b = st.columns([1, 1])
+        with col_a:
+            if st.button(f"▶️ Play Video", key="search_play"):
+                play_sign(chosen.sign, chosen.data)
+        with col_b:
+            if st.button(f"📚 Learn More", key="search_learn"):
+                st.info(f"More info about: {chosen.sign}")
+    else:
+        st.warning("No results found. Try a different search term.")
+
+def play_sign(sign, data):
+    video = sign_clip_url(data.get("video_url"))
+    if video:
+        st.video(video, autoplay=True)
+    else:
+        st.info(f"Playing video for: {sign}")
+
+def jump_to_category(category_filter):
+    """Quick Navigation: switch the filter and open its first page before the rerun renders"""
+    st.session_state.dict_filter = category_filter
+    st.session_state.setdefault('dict_pages', {})[category_filter] = 0
+
+def change_dictionary_page(category_filter, page):
+    st.session_state.setdefault('dict_pages', {})[category_filter] = page
+
+def show_all_signs(category_filter):
+    dictionary = sign_dictionary()
+    index = get_search_index(dictionary.version, dictionary)
+    category = None if category_filter == "All" else category_filter.lower()
+    
+    page_size = st.selectbox("Signs per page", DICTIONARY_PAGE_SIZES, index=1, key="dict_page_size")
+    total = index.count(category)
+    page_count = max(1, -(-total // page_size))
+    pages = st.session_state.setdefault('dict_pages', {})
+    page = min(pages.get(category_filter, 0), page_count - 1)
+    
+    entries = get_dictionary_page(dictionary.version, category, page, page_size, dictionary)
+    
+    # Only the visible slice is rendered: one grid element per category on the page
+    sections = []
+    for entry_category, sign, data in entries:
+        if not sections or sections[-1][0] != entry_category:
+            sections.append((entry_category, []))
+        sections[-1][1].append({"sign": sign.upper(), "description": data['description']})
+    
+    for entry_category, cards in sections:
+        st.subheader(f"{entry_category.title()}")
+        st.markdown(render_grid(DICTIONARY_CARD, cards, columns=3), unsafe_allow_html=True)
+    
+    if entries:
+        by_key = {(entry_category, sign): data for entry_category, sign, data in entries}
+        col_pick, col_play = st.columns([3, 1])
+        with col_pick:
+            choice = st.selectbox("Play a sign from this page:", list(by_key), key="dict_play_choice",
+                                  format_func=lambda key: f"{key[1]} ({key[0].title()})")
+        with col_play:
+            if st.button("▶️ Play", key="dict_play", use_container_width=True):
+                play_sign(choice[1], by_key[choice])
+    
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("◀ Previous", key="dict_prev", disabled=page == 0, use_container_width=True,
+                  on_click=change_dictionary_page, args=(category_filter, page - 1))
+    with col_info:
+        st.caption(f"Page {page + 1} of {page_count} · {total} signs")
+    with col_next:
+        st.button("Next ▶", key="dict_next", disabled=page >= page_count - 1, use_container_width=True,
+                  on_click=change_dictionary_page, args=(category_filter, page + 1))
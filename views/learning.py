@@ -0,0 +1,198 @@
+"""Lessons: new signs in dictionary order, interleaved with spaced-repetition reviews"""
+
+import json
+import os
+from functools import partial
+
+import streamlit as st
+
+from analytics import LESSON_VIEWED, SIGN_COMPLETED
+from core import (fragment, get_instrumentation, get_media_library, get_scheduler, get_store, log_event,
+                  review_scheduler, sign_clip_url, sign_dictionary)
+from media_server import RENDITIONS, select_rendition
+from prefetch import Prefetcher
+from srs import AGAIN, GOOD
+
+# Learning modules
+def learning_page():
+    st.markdown('<h1 class="main-header">📚 Learn Sign Language</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["🔤 Alphabets", "🔢 Numbers", "💬 Words"])
+    
+    with tab1:
+        lesson_card('alphabets')
+    
+    with tab2:
+        lesson_card('numbers')
+    
+    with tab3:
+        lesson_card('words')
+
+# Per-category text of the lesson cards; {sign} and {title} are filled in per card
+LESSONS = {
+    'alphabets': {
+        "subheader": "ASL Alphabet Learning",
+        "key": "alphabet",
+        "name": "Letter {sign}",
+        "demo": "letter {sign}",
+        "done": "🎉 Congratulations! You've completed all alphabets!",
+    },
+    'numbers': {
+        "subheader": "ASL Numbers Learning",
+        "key": "number",
+        "name": "Number {sign}",
+        "demo": "number {sign}",
+        "done": "🎉 Great job! You've learned all numbers!",
+    },
+    'words': {
+        "subheader": "Basic Words & Phrases",
+        "key": "word",
+        "name": "{title}",
+        "demo": '"{sign}"',
+        "done": "🎉 Excellent! You've learned all basic words!",
+    },
+}
+
+def next_card(category, dictionary):
+    """(sign, data, is_new): the most overdue review first, then the next new sign, or None"""
+    due = review_scheduler(st.session_state.username).next_due(st.session_state.username, category)
+    if due is not None:
+        data = dictionary.entry(category, due)
+        if data is not None:
+            return due, data, False
+    current_idx = st.session_state.learning_progress[category]['current']
+    if current_idx < dictionary.count(category):
+        media = lesson_media(dictionary, category, current_idx)
+        return media["sign"], media["data"], True
+    return None
+
+def rate_card(category, sign, quality, is_new):
+    """Grade a card, mark it learned if passed and move past it if it was new; writes happen in the background"""
+    username = st.session_state.username
+    progress = st.session_state.learning_progress[category]
+    store = get_store()
+    ease, interval, repetitions, due = review_scheduler(username).review(username, category, sign, quality)
+    store.save_review(username, category, sign, ease, interval, repetitions, due)
+    if quality >= 3 and sign not in progress['completed']:
+        progress['completed'].add(sign)
+        store.mark_completed(username, category, sign)
+        log_event(SIGN_COMPLETED, category, sign)
+    if is_new:
+        progress['current'] += 1
+        store.set_cursor(username, category, progress['current'])
+
+def restart_lesson(category):
+    st.session_state.learning_progress[category]['current'] = 0
+    get_store().set_cursor(st.session_state.username, category, 0)
+
+@fragment
+def lesson_card(category):
+    lesson = LESSONS[category]
+    key = lesson["key"]
+    st.subheader(lesson["subheader"])
+    
+    dictionary = sign_dictionary()
+    total = dictionary.count(category)
+    current_idx = st.session_state.learning_progress[category]['current']
+    card = next_card(category, dictionary)
+    
+    if card is not None:
+        sign, sign_data, is_new = card
+        # Upcoming new cards load while this one is on screen
+        prefetch_lessons(dictionary, category, current_idx + 1 if is_new else current_idx)
+        viewed = st.session_state.setdefault('viewed_cards', {})
+        if viewed.get(category) != sign:
+            viewed[category] = sign
+            log_event(LESSON_VIEWED, category, sign)
+        name = lesson["name"].format(sign=sign, title=sign.title())
+        demo = lesson["demo"].format(sign=sign)
+        
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            st.markdown(f"### {'Learning' if is_new else 'Review'}: {name}")
+            
+            video = sign_clip_url(sign_data["video_url"])
+            if video:
+                st.video(video)
+            else:
+                st.markdown(f"""
+                <div class="video-placeholder">
+                    <h2>📹 Video: {name}</h2>
+                    <p>Sign language demonstration for {demo}</p>
+                    <p><em>Video would play here in production</em></p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            st.write(sign_data["description"])
+        
+        with col2:
+            st.write("**Progress**")
+            progress = min(current_idx, total) / total if total else 0
+            st.progress(progress)
+            st.write(f"{min(current_idx, total)}/{total} completed")
+            due = get_scheduler().due_count(st.session_state.username, category)
+            if due:
+                st.caption(f"{due} review{'s' if due != 1 else ''} due")
+            
+            st.write("**Actions**")
+            col_a, col_b, col_c = st.columns(3)
+            
+            with col_a:
+                st.button("✓ Got it!", key=f"{key}_next", on_click=rate_card,
+                          args=(category, sign, GOOD, is_new))
+            
+            with col_b:
+                st.button("↺ Again", key=f"{key}_again", on_click=rate_card,
+                          args=(category, sign, AGAIN, is_new))
+            
+            with col_c:
+                if st.button("🔄 Replay", key=f"{key}_replay"):
+                    st.info("Video replayed!")
+    else:
+        st.success(lesson["done"])
+        st.button("Start Over", key=f"{key}_restart", on_click=restart_lesson, args=(category,))
+
+# Lesson prefetch: the next cards' data, with the head of each clip in the page cache
+PREFETCH_AHEAD = int(os.environ.get("SIGNAURA_PREFETCH_AHEAD", "3"))
+PREFETCH_BUDGET_MB = float(os.environ.get("SIGNAURA_PREFETCH_BUDGET_MB", "64"))
+PREFETCH_CLIP_KB = int(os.environ.get("SIGNAURA_PREFETCH_CLIP_KB", "512"))
+
+@st.cache_resource(show_spinner=False)
+def get_prefetcher():
+    prefetcher = Prefetcher(budget=int(PREFETCH_BUDGET_MB * 1024 * 1024))
+    get_instrumentation().add_gauges("lesson_prefetch", "Lesson prefetch cache", prefetcher.stats)
+    return prefetcher
+
+def clip_rendition():
+    """The rendition this session's player will fetch: its quality setting, or what the client hints pick"""
+    quality = st.session_state.video_quality
+    return quality if quality in RENDITIONS else select_rendition(st.context.headers)
+
+def load_lesson_media(dictionary, library, category, position, rendition):
+    """(media, size) of one lesson card; runs on the prefetch workers, so no session state here"""
+    sign, data = dictionary.entry_at(category, position)
+    mapped, warmed = None, 0
+    if data.get("video_url"):
+        try:
+            mapped, warmed = library.warm(data["video_url"], rendition, nbytes=PREFETCH_CLIP_KB * 1024)
+        except OSError:
+            pass  # the clip changed or vanished; it is opened again when played
+    # Holding the mapped clip keeps its warmed pages referenced while the entry is cached
+    media = {"sign": sign, "data": data, "clip": mapped}
+    return media, warmed + len(json.dumps(data)) + 256
+
+def lesson_media(dictionary, category, position):
+    """A lesson card from the prefetch cache, loaded inline on a miss"""
+    rendition = clip_rendition()
+    load = partial(load_lesson_media, dictionary, get_media_library(), category, position, rendition)
+    return get_prefetcher().get((dictionary.version, category, position, rendition), load)
+
+def prefetch_lessons(dictionary, category, start):
+    """Warm the cards at ``start`` and after in the background"""
+    prefetcher = get_prefetcher()
+    library = get_media_library()
+    rendition = clip_rendition()
+    for position in range(start, min(start + PREFETCH_AHEAD, dictionary.count(category))):
+        load = partial(load_lesson_media, dictionary, library, category, position, rendition)
+        prefetcher.prefetch((dictionary.version, category, position, rendition), load)
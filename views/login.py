@@ -0,0 +1,67 @@
+"""Login and sign-up page"""
+
+import streamlit as st
+
+from auth import LoginBusy
+from core import get_authenticator, start_session
+
+# Authentication functions
+def login_page():
+    st.markdown('<h1 class="main-header">🤟 Welcome to Signaura</h1>', unsafe_allow_html=True)
+    st.markdown("### Your Gateway to Sign Language Learning")
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        tab1, tab2 = st.tabs(["Login", "Sign Up"])
+        
+        with tab1:
+            st.subheader("Login to Your Account")
+            username = st.text_input("Username", key="login_username")
+            password = st.text_input("Password", type="password", key="login_password")
+            
+            col_a, col_b = st.columns(2)
+            with col_a:
+                if st.button("Login", use_container_width=True):
+                    try:
+                        token = authenticate_user(username, password)
+                    except LoginBusy:
+                        st.warning("Lots of people are logging in right now. Please try again in a few seconds.")
+                    else:
+                        if token:
+                            start_session(username, token)
+                            st.rerun()
+                        else:
+                            st.error("Invalid username or password")
+            
+            with col_b:
+                if st.button("Demo Login", use_container_width=True):
+                    start_session("demo", get_authenticator().issue_token("demo"))
+                    st.rerun()
+        
+        with tab2:
+            st.subheader("Create New Account")
+            new_username = st.text_input("Choose Username", key="signup_username")
+            new_email = st.text_input("Email Address", key="signup_email")
+            new_password = st.text_input("Create Password", type="password", key="signup_password")
+            confirm_password = st.text_input("Confirm Password", type="password", key="confirm_password")
+            
+            if st.button("Sign Up", use_container_width=True):
+                if not new_username.strip():
+                    st.error("Please choose a username")
+                elif new_password != confirm_password or len(new_password) < 6:
+                    st.error("Passwords don't match or are too short (min 6 characters)")
+                else:
+                    try:
+                        created = get_authenticator().register(new_username.strip(), new_email.strip(), new_password)
+                    except LoginBusy:
+                        st.warning("We're busy right now. Please try again in a few seconds.")
+                    else:
+                        if created:
+                            st.success("Account created successfully! Please login.")
+                        else:
+                            st.error("That username is already taken")
+
+def authenticate_user(username, password):
+    """Verify credentials off the script thread; returns a session token or None"""
+    return get_authenticator().login(username, password)
@@ -0,0 +1,173 @@
+"""Profile, learning progress and settings"""
+
+import streamlit as st
+
+from analytics import format_duration
+from core import VIDEO_QUALITIES, get_scheduler, get_store, sign_dictionary, streak_label, user_stats
+from rendering import PROGRESS_CARD, render_grid
+from storage import empty_progress
+
+# Profile/Settings
+def profile_page():
+    st.markdown('<h1 class="main-header">👤 Profile & Settings</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["Profile", "Progress", "Settings"])
+    
+    with tab1:
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            st.markdown("### Profile Picture")
+            st.image("https://via.placeholder.com/150/007bff/ffffff?text=👤", width=150)
+            
+            if st.button("Upload New Photo"):
+                st.info("Photo upload would be implemented here")
+        
+        with col2:
+            st.markdown("### Account Information")
+            
+            user_info = get_store().get_user(st.session_state.username) or {}
+            
+            name = st.text_input("Full Name", value="Demo User")
+            email = st.text_input("Email", value=user_info.get("email", ""))
+            bio = st.text_area("Bio", value="Learning sign language with Signaura!")
+            
+            join_date = st.text_input("Member Since", value="January 2025", disabled=True)
+            
+            col_a, col_b = st.columns(2)
+            with col_a:
+                if st.button("Save Changes", use_container_width=True):
+                    st.success("Profile updated successfully!")
+            with col_b:
+                if st.button("Reset Password", use_container_width=True):
+                    st.info("Password reset email sent!")
+    
+    with tab2:
+        st.markdown("### Learning Progress")
+        
+        # Overall progress
+        dictionary = sign_dictionary()
+        total_alphabets = dictionary.count("alphabets")
+        total_numbers = dictionary.count("numbers")
+        total_words = dictionary.count("words")
+        
+        completed_alphabets = len(st.session_state.learning_progress['alphabets']['completed'])
+        completed_numbers = len(st.session_state.learning_progress['numbers']['completed'])
+        completed_words = len(st.session_state.learning_progress['words']['completed'])
+        
+        # Progress cards, sent as one element
+        st.markdown(render_grid(PROGRESS_CARD, [
+            {"background": "linear-gradient(135deg, #667eea 0%, #764ba2 100%)", "title": "🔤 Alphabets",
+             "completed": completed_alphabets, "total": total_alphabets,
+             "percent": (completed_alphabets / total_alphabets) * 100 if total_alphabets else 0},
+            {"background": "linear-gradient(135deg, #f093fb 0%, #f5576c 100%)", "title": "🔢 Numbers",
+             "completed": completed_numbers, "total": total_numbers,
+             "percent": (completed_numbers / total_numbers) * 100 if total_numbers else 0},
+            {"background": "linear-gradient(135deg, #4facfe 0%, #00f2fe 100%)", "title": "💬 Words",
+             "completed": completed_words, "total": total_words,
+             "percent": (completed_words / total_words) * 100 if total_words else 0},
+        ], columns=3, gap="1rem"), unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # Detailed progress
+        st.markdown("### Detailed Progress")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Completed Items:**")
+            
+            if st.session_state.learning_progress['alphabets']['completed']:
+                st.write("📝 **Alphabets:**", ", ".join(sorted(st.session_state.learning_progress['alphabets']['completed'])))
+            
+            if st.session_state.learning_progress['numbers']['completed']:
+                st.write("🔢 **Numbers:**", ", ".join(sorted(st.session_state.learning_progress['numbers']['completed'])))
+            
+            if st.session_state.learning_progress['words']['completed']:
+                st.write("💬 **Words:**", ", ".join(sorted(st.session_state.learning_progress['words']['completed'])))
+        
+        with col2:
+            st.write("**Study Statistics:**")
+            stats = user_stats()
+            st.metric("Total Study Time", format_duration(stats["study_seconds"]))
+            st.metric("Sessions Completed", stats["sessions"])
+            st.metric("Current Streak", streak_label(stats["current_streak"]))
+            st.metric("Best Streak", streak_label(stats["best_streak"]))
+        
+        # Reset progress button
+        st.markdown("---")
+        if st.button("🔄 Reset All Progress", type="secondary"):
+            if st.checkbox("I understand this will reset all my progress"):
+                st.session_state.learning_progress = empty_progress()
+                get_store().reset_progress(st.session_state.username)
+                get_scheduler().forget_user(st.session_state.username)
+                st.success("Progress reset successfully!")
+                st.rerun()
+    
+    with tab3:
+        st.markdown("### App Settings")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Display Settings**")
+            
+            theme = st.selectbox("Theme", ["Light", "Dark"], index=0 if st.session_state.theme == "light" else 1)
+            if theme != st.session_state.theme:
+                st.session_state.theme = theme.lower()
+                st.info("Theme updated! (Full implementation would require CSS changes)")
+            
+            font_size = st.selectbox("Font Size", ["Small", "Medium", "Large"], index=1)
+            
+            show_progress = st.checkbox("Show progress indicators", value=True)
+            
+            st.write("**Learning Settings**")
+            
+            auto_play = st.checkbox("Auto-play videos", value=True)
+            video_quality = st.selectbox(
+                "Video quality", VIDEO_QUALITIES,
+                index=VIDEO_QUALITIES.index(st.session_state.video_quality),
+                format_func=lambda quality: "Auto (match my connection)" if quality == "auto" else quality,
+            )
+            st.session_state.video_quality = video_quality
+            repeat_mode = st.checkbox("Repeat videos automatically", value=False)
+            
+            difficulty = st.selectbox("Learning Pace", ["Beginner", "Intermediate", "Advanced"], index=0)
+        
+        with col2:
+            st.write("**Notification Settings**")
+            
+            daily_reminder = st.checkbox("Daily learning reminder", value=True)
+            
+            if daily_reminder:
+                reminder_time = st.time_input("Reminder time", value=None)
+            
+            achievement_notifications = st.checkbox("Achievement notifications", value=True)
+            
+            progress_emails = st.checkbox("Weekly progress emails", value=False)
+            
+            st.write("**Audio Settings**")
+            
+            enable_sound = st.checkbox("Enable sound effects", value=True)
+            
+            voice_feedback = st.checkbox("Voice feedback for translations", value=True)
+            
+            if voice_feedback:
+                voice_speed = st.slider("Voice speed", 0.5, 2.0, 1.0, 0.1)
+        
+        st.markdown("---")
+        
+        col_a, col_b, col_c = st.columns(3)
+        
+        with col_a:
+            if st.button("Save Settings", use_container_width=True):
+                st.success("Settings saved successfully!")
+        
+        with col_b:
+            if st.button("Export Data", use_container_width=True):
+                st.info("Your data export is being prepared...")
+        
+        with col_c:
+            if st.button("Delete Account", use_container_width=True, type="secondary"):
+                st.error("Account deletion would be implemented here with proper confirmation.")
@@ -0,0 +1,409 @@
+"""Translator: Sign to Text recognition and Text to Sign playback.
+
+Image decoding (PIL) and the camera pipeline are imported when an upload
+or the live camera is first used, not when the page is. Live recognition
+runs on frames streamed from the visitor's browser over WebRTC (the
+optional streamlit-webrtc package); without it the camera tab offers
+snapshots only.
+"""
+
+import logging
+import math
+import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+from functools import partial
+
+import streamlit as st
+
+from admission import AdmissionController, RateLimited, Rejected
+from analytics import TRANSLATION
+from core import (INFERENCE_BATCH_SIZE, INFERENCE_TIMEOUT, INFERENCE_WORKERS, USER_CACHE_TTL, fragment,
+                  get_inference_service, get_instrumentation, get_store, log_event, sign_clip_url, sign_dictionary,
+                  stop_live_recognition)
+from history import SIGN_TO_TEXT, TEXT_TO_SIGN, TranslationHistory
+from model_runtime import FAILED, ModelNotReady
+from phrase_matcher import PhraseMatcher
+from playlist import PlaylistCompiler, manifest, player_html
+from rendering import HISTORY_ITEM, render_list
+
+logger = logging.getLogger(__name__)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_phrase_matcher(version, _dictionary):
+    """Compile the Text-to-Sign phrase matcher once per dictionary version"""
+    return PhraseMatcher(_dictionary)
+
+QUICK_PHRASES = ["Hello", "Thank you", "Please", "Good morning", "How are you?", "Nice to meet you"]
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_playlist_compiler(version, _dictionary):
+    """Text-to-Sign playlist compiler, with the quick phrases compiled up front"""
+    compiler = PlaylistCompiler(_dictionary, get_phrase_matcher(version, _dictionary))
+    compiler.prebuild(QUICK_PHRASES)
+    return compiler
+
+# Admission control for upload and snapshot recognition: per-user requests per second and burst,
+# requests running at once, and how many may wait and for how long before being shed.
+# Live camera frames have their own per-user frames per second and burst, and are never queued.
+RECOGNIZE_RATE = float(os.environ.get("SIGNAURA_RECOGNIZE_RATE", "0.5"))
+RECOGNIZE_BURST = int(os.environ.get("SIGNAURA_RECOGNIZE_BURST", "5"))
+RECOGNIZE_CONCURRENCY = int(os.environ.get("SIGNAURA_RECOGNIZE_CONCURRENCY", str(INFERENCE_WORKERS * INFERENCE_BATCH_SIZE)))
+RECOGNIZE_QUEUE = int(os.environ.get("SIGNAURA_RECOGNIZE_QUEUE", "32"))
+RECOGNIZE_MAX_WAIT = float(os.environ.get("SIGNAURA_RECOGNIZE_MAX_WAIT", "5"))
+LIVE_RATE = float(os.environ.get("SIGNAURA_LIVE_RATE", "4"))
+LIVE_BURST = int(os.environ.get("SIGNAURA_LIVE_BURST", "4"))
+
+@st.cache_resource(show_spinner=False)
+def get_admission_controller():
+    controller = AdmissionController(
+        rate=RECOGNIZE_RATE,
+        burst=RECOGNIZE_BURST,
+        max_concurrent=RECOGNIZE_CONCURRENCY,
+        max_queue=RECOGNIZE_QUEUE,
+        max_wait=RECOGNIZE_MAX_WAIT,
+        budgets={"live": (LIVE_RATE, LIVE_BURST)},
+    )
+    get_instrumentation().add_gauges("recognize_admission", "Recognition admission control", controller.stats)
+    return controller
+
+# Live camera: seconds without a frame from the browser before the pipeline stops by itself
+LIVE_IDLE_TIMEOUT = float(os.environ.get("SIGNAURA_LIVE_IDLE_TIMEOUT", "10"))
+
+def live_pipeline():
+    """This session's pipeline fed from the browser camera, started again after it wound down"""
+    from camera_pipeline import BrowserFrameSource, StreamingRecognizer
+
+    pipeline = st.session_state.get("live_pipeline")
+    if pipeline is None or not pipeline.running:
+        pipeline = st.session_state.live_pipeline = StreamingRecognizer(
+            BrowserFrameSource(idle_timeout=LIVE_IDLE_TIMEOUT),
+            partial(recognize_live_frame, get_admission_controller(), get_inference_service(),
+                    st.session_state.username),
+        ).start()
+    return pipeline
+
+def recognize_live_frame(controller, service, username, frame):
+    """One live frame through admission control; a turned-away frame makes the pipeline skip ahead"""
+    with controller.admit(username, budget="live", wait=False):
+        return service.predict(frame, timeout=INFERENCE_TIMEOUT)
+
+def frame_callback(source):
+    """WebRTC video callback: hand each frame to the pipeline and show the stream unchanged"""
+    def on_frame(frame):
+        source.push(frame.to_ndarray(format="rgb24"))
+        return frame
+    return on_frame
+
+def live_recognition():
+    try:
+        from streamlit_webrtc import WebRtcMode, webrtc_streamer
+    except ImportError:
+        stop_live_recognition()
+        st.info("Live recognition needs the streamlit-webrtc package. Take a snapshot below instead.")
+        return
+    
+    pipeline = live_pipeline()
+    stream = webrtc_streamer(
+        key="live_camera",
+        mode=WebRtcMode.SENDRECV,
+        video_frame_callback=frame_callback(pipeline.source),
+        media_stream_constraints={"video": True, "audio": False},
+    )
+    if stream.state.playing:
+        live_recognition_panel()
+    else:
+        st.caption("Start the camera to recognize signs as you make them.")
+
+@fragment(run_every=1.0)
+def live_recognition_panel():
+    """Refresh the live prediction and pipeline stats once a second"""
+    pipeline = st.session_state.get("live_pipeline")
+    if pipeline is None:
+        return
+    
+    if not pipeline.running and pipeline.error is None:
+        # Wound down while the stream was idle; a full rerun starts a new one for the frame callback
+        st.rerun()
+    
+    if pipeline.error is not None:
+        st.error(f"Camera pipeline stopped: {pipeline.error}")
+        return
+    
+    latest = pipeline.latest()
+    report = pipeline.report()
+    if latest is not None:
+        st.success(f"**Detected Sign:** {latest.label}")
+        st.info(f"**Confidence:** {latest.confidence}% ({latest.votes} agreeing frames)")
+        # One history entry per newly detected sign, not one per refresh
+        if st.session_state.get('live_last_sign') != latest.label:
+            st.session_state.live_last_sign = latest.label
+            latency = report["latency_ms"].get("inference", {}).get("p50")
+            record_translation(SIGN_TO_TEXT, "Live camera", latest.label, latest.confidence, latency)
+    else:
+        st.write("Waiting for a sign...")
+    
+    if pipeline.last_recognize_error is not None and report["counters"].get("recognize_errors"):
+        st.caption(f"Some frames could not be recognized: {pipeline.last_recognize_error}")
+    
+    with st.expander("Pipeline stats"):
+        st.json(report)
+
+@st.cache_resource(show_spinner=False)
+def get_upload_cache():
+    """Decoded uploads and predictions keyed by content hash, shared by all sessions"""
+    from preprocess import UploadCache
+
+    return UploadCache(model_size=get_inference_service().model.input_size)
+
+def upload_digest(uploaded_file):
+    """Content hash of an upload, hashed once per uploaded file in this session"""
+    from preprocess import content_hash
+
+    digests = st.session_state.setdefault('upload_digests', {})
+    file_id = getattr(uploaded_file, "file_id", None) or uploaded_file.name
+    if file_id not in digests:
+        digests[file_id] = content_hash(uploaded_file.getvalue())
+    return digests[file_id]
+
+def prepare_upload(uploaded_file):
+    """Decoded preview and model input, decoding only the first time these bytes are seen; None if unreadable"""
+    from preprocess import InvalidUpload
+
+    try:
+        return get_upload_cache().prepare(uploaded_file.getvalue(), upload_digest(uploaded_file))
+    except InvalidUpload:
+        st.error("That file couldn't be read as an image. Please upload a PNG or JPEG photo.")
+        return None
+
+def recognizer_version():
+    """What a cached prediction depends on: the loaded model and the dictionary its index is built from"""
+    return get_inference_service().model.version, sign_dictionary().version
+
+def analyze_upload(prepared, button_label, spinner_text, source):
+    """Cached prediction for an upload, running the recognizer only on a click and a miss"""
+    upload_cache = get_upload_cache()
+    version = recognizer_version()
+    prediction = upload_cache.prediction(prepared.digest, version)
+    if st.button(button_label, disabled=not get_inference_service().model.ready) and prediction is None:
+        with st.spinner(spinner_text):
+            with get_instrumentation().section("recognize_upload"):
+                start = time.perf_counter()
+                prediction = recognize_sign(prepared.model_input)
+                latency_ms = (time.perf_counter() - start) * 1000
+        if prediction is not None:
+            upload_cache.store_prediction(prepared.digest, prediction, version)
+            record_translation(SIGN_TO_TEXT, source, prediction.label, prediction.confidence, latency_ms)
+    return prediction
+
+def recognize_sign(image):
+    """Run one image through the shared service, or return None with an error shown"""
+    from inference import InferenceQueueFull
+
+    try:
+        with get_admission_controller().admit(st.session_state.username):
+            return get_inference_service().predict(image, timeout=INFERENCE_TIMEOUT)
+    except RateLimited as exc:
+        st.warning(f"You're analyzing signs faster than we can keep up. Please retry in {math.ceil(exc.retry_after)} s.")
+    except Rejected as exc:
+        st.warning(f"The recognizer is busy right now. Please retry in {math.ceil(exc.retry_after)} s.")
+    except InferenceQueueFull:
+        st.error("The recognizer is busy right now. Please try again in a moment.")
+    except FutureTimeoutError:
+        st.error("Recognition timed out. Please try again.")
+    except ModelNotReady as exc:
+        st.error(f"The recognizer isn't available yet: {exc}. Please try again in a moment.")
+    except Exception:
+        # The model or its reference index failed on this batch; the page stays usable
+        logger.exception("Recognizing an upload failed")
+        st.error("Recognition failed. Please try again, or try another image.")
+    return None
+
+# Translation history: recent entries in memory, older pages from the database
+HISTORY_PAGE_SIZE = 10
+
+@st.cache_resource(show_spinner=False)
+def get_translation_history():
+    return TranslationHistory(get_store(), max_age=USER_CACHE_TTL)
+
+def record_translation(direction, source, result, confidence=None, latency_ms=None):
+    get_translation_history().record(st.session_state.username, direction, source, result, confidence, latency_ms)
+    log_event(TRANSLATION)
+
+def time_ago(created_at):
+    seconds = max(0, time.time() - created_at / 1e6)
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h ago"
+    return datetime.fromtimestamp(created_at / 1e6).strftime("%b %d, %H:%M")
+
+def history_item(entry):
+    """Fields of HISTORY_ITEM for one history entry"""
+    when = time_ago(entry["created_at"])
+    if entry["latency_ms"] is not None:
+        when += f" · {entry['latency_ms']:.0f} ms"
+    if entry["direction"] == TEXT_TO_SIGN:
+        return {"sign": entry["source"], "confidence": "Text → Sign", "time": when}
+    return {"sign": entry["result"], "confidence": f"{entry['confidence']}%", "time": when}
+
+def older_history(before):
+    st.session_state.history_cursors.append(before)
+
+def newer_history():
+    st.session_state.history_cursors.pop()
+
+def translation_history_panel():
+    history = get_translation_history()
+    cursors = st.session_state.setdefault('history_cursors', [])
+    if cursors:
+        entries = history.page(st.session_state.username, before=cursors[-1], limit=HISTORY_PAGE_SIZE)
+    else:
+        entries = history.recent(st.session_state.username, limit=HISTORY_PAGE_SIZE)
+    
+    if entries:
+        st.markdown(render_list(HISTORY_ITEM, map(history_item, entries)), unsafe_allow_html=True)
+    else:
+        st.caption("Your translations will appear here.")
+    
+    col_newer, col_older = st.columns(2)
+    with col_newer:
+        if cursors:
+            st.button("◀ Newer", key="history_newer", on_click=newer_history)
+    with col_older:
+        if len(entries) == HISTORY_PAGE_SIZE:
+            st.button("Older ▶", key="history_older", on_click=older_history, args=(entries[-1]["created_at"],))
+
+# Translator
+def translator_page():
+    st.markdown('<h1 class="main-header">🔄 Sign Language Translator</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2 = st.tabs(["📸 Sign to Text", "📝 Text to Sign"])
+    
+    with tab1:
+        sign_to_text()
+    
+    with tab2:
+        text_to_sign()
+
+@fragment
+def sign_to_text():
+    st.subheader("Convert Sign Language to Text")
+    
+    runtime = get_inference_service().model
+    if runtime.state == FAILED:
+        st.error("The recognition model failed to load, so sign analysis is unavailable.")
+    elif not runtime.ready:
+        model_status()
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.write("**Upload Image or Use Camera**")
+        
+        upload_option = st.radio("Choose input method:", ["Upload Image", "Use Camera"])
+        
+        if upload_option == "Upload Image":
+            stop_live_recognition()
+            uploaded_file = st.file_uploader("Choose an image", type=['png', 'jpg', 'jpeg'])
+            
+            prepared = prepare_upload(uploaded_file) if uploaded_file is not None else None
+            if prepared is not None:
+                st.image(prepared.preview, caption="Uploaded Image", use_column_width=True)
+                
+                prediction = analyze_upload(prepared, "🔍 Analyze Sign", "Analyzing sign...", uploaded_file.name)
+                
+                if prediction is not None:
+                    show_prediction(prediction)
+                    
+                    # Audio output option
+                    if st.button("🔊 Play Audio"):
+                        st.audio("data:audio/wav;base64,UklGRnABAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YUwBAABBhAr//39/f39/f39/f39/f39/f3...") # Placeholder
+        
+        else:
+            st.write("📹 **Live Camera Feed**")
+            
+            if st.toggle("🎥 Live recognition", key="live_recognition"):
+                live_recognition()
+            else:
+                stop_live_recognition()
+            
+            snapshot = st.camera_input("Show your sign to the camera")
+            
+            prepared = prepare_upload(snapshot) if snapshot is not None else None
+            if prepared is not None:
+                prediction = analyze_upload(prepared, "📷 Capture & Analyze", "Capturing and analyzing...",
+                                            "Camera snapshot")
+                
+                if prediction is not None:
+                    show_prediction(prediction)
+    
+    with col2:
+        st.write("**Translation History**")
+        
+        translation_history_panel()
+
+@fragment(run_every=1.0)
+def model_status():
+    """Shown while the model loads; reruns the page once it is ready to enable the analyze buttons"""
+    runtime = get_inference_service().model
+    if runtime.ready or runtime.state == FAILED:
+        st.rerun()
+    st.info(f"⏳ The recognition model is {runtime.state}. Sign analysis will be available in a moment.")
+
+def show_prediction(prediction):
+    st.success(f"**Detected Sign:** {prediction.label}")
+    st.info(f"**Confidence:** {prediction.confidence}%")
+    if len(prediction.candidates) > 1:
+        st.caption("Other candidates: " + ", ".join(f"{label} ({score}%)" for label, score in prediction.candidates[1:]))
+
+@fragment
+def text_to_sign():
+    st.subheader("Convert Text to Sign Language")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.write("**Enter Text or Speak**")
+        
+        input_method = st.radio("Input method:", ["Type Text", "Voice Input"])
+        
+        if input_method == "Type Text":
+            user_text = st.text_area("Enter text to convert:", placeholder="Type your message here...")
+            
+            if st.button("🔄 Convert to Signs") and user_text:
+                dictionary = sign_dictionary()
+                with get_instrumentation().section("translate"):
+                    start = time.perf_counter()
+                    playlist = get_playlist_compiler(dictionary.version, dictionary).compile(user_text)
+                    latency_ms = (time.perf_counter() - start) * 1000
+                record_translation(TEXT_TO_SIGN, user_text, " ".join(segment.label for segment in playlist.segments),
+                                   latency_ms=latency_ms)
+                
+                st.write("**Sign Language Translation:**")
+                sign_player(playlist)
+        
+        else:
+            st.info("🎤 Voice input would be integrated here using speech recognition")
+            if st.button("🎤 Start Recording"):
+                st.success("Recording... (This would use speech-to-text API)")
+    
+    with col2:
+        st.write("**Quick Phrases**")
+        
+        for phrase in QUICK_PHRASES:
+            if st.button(phrase, key=f"phrase_{phrase}"):
+                st.write(f"Showing signs for: **{phrase}**")
+                dictionary = sign_dictionary()
+                sign_player(get_playlist_compiler(dictionary.version, dictionary).compile(phrase))
+
+def sign_player(playlist):
+    """Play a compiled sentence back to back in a single embedded player"""
+    if not playlist.segments:
+        st.info("Nothing to sign in that text.")
+        return
+    # The player only ever sees dictionary labels and [a-z0-9'] tokens, JSON-encoded and set as text
+    st.iframe(player_html(manifest(playlist, sign_clip_url)), height=320)